@@ -0,0 +1,250 @@
+"""Throughput and memory benchmarks for the simulacrum type functions, null masking and create.
+
+Every case is run in a fresh Python process, so that peak RSS is measured per case rather than
+for the whole run.  Results are saved as JSON, which can be compared against a previous run:
+
+    $ python benchmarks/bench.py --output before.json
+    $ git checkout my-branch
+    $ python benchmarks/bench.py --output after.json --compare before.json
+
+Run with --help for the other options.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import time
+
+# Benchmark the working tree rather than an installed simulacrum
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LENGTHS = (10**3, 10**4, 10**5, 10**6, 10**7)
+NULL_RATES = (0.01, 0.1, 0.5)
+# Faker-backed types run at tens of thousands of rows a second, so only run them up to here
+# unless --max-faker-length says otherwise
+MAX_FAKER_LENGTH = 10**5
+FAKER_TYPES = ('txt', 'name', 'addr', 'faker')
+TYPE_PARAMS = {
+    'faker': {'provider': 'user_name'},
+    'categorical': {'elements': ['sku{}'.format(i) for i in range(100000)],
+                    'weights': [1 / (i + 1) for i in range(100000)]},
+    'empirical': {'values': [0, 1, 2, 5, 10, 100]}}
+MIXED_COLTYPES = {
+    'id': {'type': 'uuid', 'output': 'str'},
+    'amount': {'type': 'exp', 'lam': 0.01},
+    'quantity': {'type': 'pois', 'lam': 3, 'null_rate': 0.05},
+    'score': {'type': 'norm', 'mean': 50, 'sd': 10},
+    'segment': {'type': 'categorical', 'elements': ['a', 'b', 'c', 'd']},
+    'customer': {'type': 'name', 'pool_size': 1000},
+    'created': {'type': 'date', 'begin': '2020-01-01', 'end': '2020-12-31'}}
+ORDER_TABLES = {
+    'customers': {'length': 0, 'coltypes': {'segment': {'type': 'categorical',
+                                                        'elements': ['a', 'b', 'c']}}},
+    'orders': {'coltypes': {
+        'customer_id': {'type': 'foreign_key', 'references': 'customers',
+                        'count_dist': 'poisson', 'lam': 10},
+        'amount': {'type': 'exp', 'lam': 0.01}}}}
+DERIVED_COLTYPES = {
+    'price': {'type': 'num', 'min': 1, 'max': 100},
+    'qty': {'type': 'pois', 'lam': 3, 'null_rate': 0.05},
+    'noise': {'type': 'norm', 'sd': 0.5},
+    'total': {'type': 'expr', 'expr': 'price * qty + noise'},
+    'large': {'type': 'expr', 'expr': '(total > 200) | (qty > 6)'}}
+NUMERIC_COLTYPES = {
+    'age': {'type': 'int', 'min': 18, 'max': 99},
+    'visits': {'type': 'pois', 'lam': 3},
+    'clicks': {'type': 'bin', 'n': 1000, 'p': 0.05},
+    'spend': {'type': 'exp', 'lam': 0.01},
+    'score': {'type': 'norm', 'mean': 50, 'sd': 10},
+    'share': {'type': 'num'}}
+PLUGIN_COLTYPES = {'claims': {'type': 'zip', 'lam': 3, 'zero_rate': 0.8}}
+
+
+def zero_inflated(out, rng, lam=1.0, zero_rate=0.5):
+    """A registered type for the plugin case: Poisson counts with extra zeros"""
+    out[:] = rng.poisson(lam, len(out))
+    out[rng.random(len(out)) < zero_rate] = 0
+
+
+def case_names():
+    """All benchmark case names, in the order they are run"""
+    from simulacrum.dataset import TYPE_FUNCTIONS
+    names = ['type:{}'.format(name) for name in TYPE_FUNCTIONS if name != 'expr']
+    names += ['text:numpy', 'unique:int']
+    names += ['null_mask:{}:{}'.format(name, rate)
+              for name in ('num', 'int') for rate in NULL_RATES]
+    names += ['create:mixed', 'create:mixed:workers2', 'create:derived', 'create:plugin',
+              'create:numeric', 'create:numeric:compact', 'tables:orders', 'fit:mixed']
+    return names
+
+
+def build_case(name, lengths=()):
+    """Returns a function of length which runs the named case.  Any input data the case needs is
+    built here for each of lengths, so that it isn't timed."""
+    import simulacrum
+    from simulacrum import types as sim_types
+    from simulacrum.dataset import TYPE_FUNCTIONS
+    kind, _, rest = name.partition(':')
+    if kind == 'type':
+        function = TYPE_FUNCTIONS[rest]
+        params = TYPE_PARAMS.get(rest, {})
+        return lambda length: function(length, **params)
+    if kind == 'text':
+        return lambda length: sim_types.text_data(length, engine=rest)
+    if name == 'unique:int':
+        return lambda length: sim_types.num_int(length, 0, 2**40, unique=True)
+    if kind == 'null_mask':
+        type_name, rate = rest.split(':')
+        function = TYPE_FUNCTIONS[type_name]
+        return lambda length: sim_types.null_mask(length, function, float(rate))
+    if name == 'tables:orders':
+        # length is the number of customers, with about 10 times as many orders
+        return lambda length: simulacrum.create_tables(dict(ORDER_TABLES, customers=dict(
+            ORDER_TABLES['customers'], length=length)), seed=0)
+    if name == 'fit:mixed':
+        mixed = {length: simulacrum.create(length, coltypes=MIXED_COLTYPES, seed=0)
+                 for length in lengths}
+        return lambda length: simulacrum.fit(mixed[length])
+    if name == 'create:derived':
+        return lambda length: simulacrum.create(length, coltypes=DERIVED_COLTYPES, seed=0)
+    if name == 'create:plugin':
+        simulacrum.register_type('zip', zero_inflated, dtype='int64')
+        return lambda length: simulacrum.create(length, coltypes=PLUGIN_COLTYPES, seed=0)
+    if rest.startswith('numeric'):
+        compact = rest.endswith(':compact')
+        return lambda length: simulacrum.create(
+            length, coltypes=NUMERIC_COLTYPES, seed=0, compact=compact)
+    if kind == 'create':
+        workers = 2 if rest.endswith(':workers2') else 1
+        return lambda length: simulacrum.create(
+            length, coltypes=MIXED_COLTYPES, seed=0, workers=workers)
+    raise ValueError('Unknown case {}'.format(name))
+
+
+def run_single(name, length, repeat):
+    """Runs one case in this process, returning its timing and memory"""
+    function = build_case(name, lengths=(10, length))
+    function(10)  # warm up imports and caches before measuring
+    rss_before = _max_rss_bytes()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(length)
+        times.append(time.perf_counter() - started)
+    seconds = min(times)
+    return {
+        'case': name,
+        'length': length,
+        'seconds': seconds,
+        'rows_per_sec': length / seconds if seconds else None,
+        'peak_rss_bytes': max(_max_rss_bytes() - rss_before, 0)}
+
+
+def _max_rss_bytes():
+    """Peak resident set size of this process so far"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def run_all(cases, lengths, repeat, max_faker_length):
+    """Runs each case at each length in its own process"""
+    results = []
+    for name in cases:
+        for length in lengths:
+            if name.split(':')[1] in FAKER_TYPES and length > max_faker_length:
+                continue
+            output = subprocess.run(
+                [sys.executable, __file__, '--single', name, str(length),
+                 '--repeat', str(repeat)],
+                check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+            result = json.loads(output)
+            results.append(result)
+            print('{case:<28} {length:>10} {rows_per_sec:>14,.0f} rows/s '
+                  '{peak_rss_bytes:>14,} bytes'.format(**result), file=sys.stderr)
+    return results
+
+
+def metadata():
+    """Versions and commit the results were measured with"""
+    import faker
+    import numpy
+    import pandas
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'faker': faker.VERSION,
+        'machine': platform.machine()}
+
+
+def compare(results, baseline, threshold):
+    """Prints the change in rows/s and memory for each case in both runs, and returns the cases
+    which got slower by more than threshold"""
+    previous = {(result['case'], result['length']): result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get((result['case'], result['length']))
+        if old is None or not old['rows_per_sec'] or not result['rows_per_sec']:
+            continue
+        speed = result['rows_per_sec'] / old['rows_per_sec']
+        memory = (result['peak_rss_bytes'] + 1) / (old['peak_rss_bytes'] + 1)
+        flag = ''
+        if speed < 1 - threshold:
+            flag = '  SLOWER'
+            regressions.append(result)
+        print('{:<28} {:>10} speed x{:.2f} memory x{:.2f}{}'.format(
+            result['case'], result['length'], speed, memory, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--output', help='file to save the JSON results to')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='fractional slowdown reported as a regression (default 0.1)')
+    parser.add_argument('--filter', default='', help='regex of case names to run')
+    parser.add_argument('--lengths', type=lambda text: [int(float(x)) for x in text.split(',')],
+                        default=LENGTHS, help='comma separated lengths, e.g. 1e3,1e5')
+    parser.add_argument('--max-faker-length', type=int, default=MAX_FAKER_LENGTH)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--list', action='store_true', help='list the case names and exit')
+    parser.add_argument('--single', nargs=2, metavar=('CASE', 'LENGTH'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        print(json.dumps(run_single(args.single[0], int(args.single[1]), args.repeat)))
+        return 0
+    cases = [name for name in case_names() if re.search(args.filter, name)]
+    if args.list:
+        print('\n'.join(cases))
+        return 0
+    report = {
+        'meta': metadata(),
+        'results': run_all(cases, args.lengths, args.repeat, args.max_faker_length)}
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(report['results'], json.load(baseline_file), args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
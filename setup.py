@@ -11,6 +11,7 @@ setup(name = 'simulacrum',
       packages = ['simulacrum'],
       keywords = ['simulation', 'data', 'data science'],
       install_requires = ['pandas', 'faker'],
+      extras_require = {'parquet': ['pyarrow']},
       setup_requires=['pytest-runner'],
       tests_require=['pytest'],
       test_suite = 'tests',
@@ -1,2 +1,38 @@
-from .dataset import create, validate_type_dict, default_coltypes, TYPE_FUNCTIONS, help_type
-from .coltypes import ColTypes
+import importlib
+
+# Public names, by the module that defines them.  Each module is only imported the first time
+# one of its names is used, so importing simulacrum doesn't import pandas, Faker or asyncio.
+_EXPORTS = {
+    'create': 'dataset',
+    'create_iter': 'dataset',
+    'plan': 'dataset',
+    'Plan': 'dataset',
+    'validate_type_dict': 'dataset',
+    'default_coltypes': 'dataset',
+    'TYPE_FUNCTIONS': 'dataset',
+    'help_type': 'dataset',
+    'register_type': 'dataset',
+    'unregister_type': 'dataset',
+    'ColTypes': 'coltypes',
+    'write': 'writer',
+    'ColumnStats': 'profiling',
+    'create_tables': 'relational',
+    'create_tables_iter': 'relational',
+    'stream': 'streaming',
+    'Stream': 'streaming',
+    'fit': 'fitting',
+    'Sketch': 'fitting'}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module('.' + _EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
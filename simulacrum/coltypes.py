@@ -1,3 +1,6 @@
+from simulacrum.dataset import plan
+
+
 class ColTypes:
     def __init__(self):
         self.coltypes = {}
@@ -8,3 +11,15 @@ class ColTypes:
 
     def get_coltypes(self):
         return self.coltypes
+
+    def compile(self, null_rate=0, null_method='exact', seed=None, string_backend='python',
+                compact=False):
+        """Validate and resolve the column types once - see simulacrum.plan.
+
+        Returns
+        -------
+        simulacrum.Plan
+            Generates datasets with plan.generate(length, seed=...).
+        """
+        return plan(coltypes=self.coltypes, null_rate=null_rate, null_method=null_method,
+                    seed=seed, string_backend=string_backend, compact=compact)
@@ -1,6 +1,13 @@
 """Functions for creating a dataframe based on setup dictionaries"""
 
+from collections import namedtuple
+import ast
+import hashlib
+import inspect
 import logging
+import os
+import time
+import numpy as np
 import pandas as pd
 
 from simulacrum import types as sim_types
@@ -16,10 +23,120 @@ TYPE_FUNCTIONS = {
     'name': sim_types.name_data,
     'addr': sim_types.address_data,
     'date': sim_types.date_data,
+    'timeseries': sim_types.timeseries_data,
     'coords': sim_types.coords_data,
     'uuid': sim_types.uuid_data,
     'categorical': sim_types.categorical_data,
-    'faker': sim_types.faker_data}
+    'empirical': sim_types.empirical_data,
+    'faker': sim_types.faker_data,
+    'expr': sim_types.expr_data}
+
+# Types which can't be generated without parameters, so aren't in default_coltypes
+REQUIRED_PARAM_TYPES = ('faker', 'expr', 'empirical')
+
+POOL_KEYS = ('pool_size', 'pool_dist', 'pool_skew')
+
+ColumnSpec = namedtuple('ColumnSpec', ['name', 'type_name', 'type_function', 'null_rate',
+                                       'null_method', 'kwargs'])
+
+MEMMAP_FUNCTIONS = {
+    sim_types.num_data: np.float64,
+    sim_types.norm_data: np.float64,
+    sim_types.exp_data: np.float64,
+    sim_types.num_int: np.int64,
+    sim_types.binom_data: np.int64,
+    sim_types.poisson_data: np.int64}
+
+# Type functions that generate strings, which take a string_backend
+STRING_FUNCTIONS = (sim_types.name_data, sim_types.address_data, sim_types.text_data,
+                    sim_types.faker_data, sim_types.uuid_data)
+
+# Type functions of float columns, which compact columns draw as float32
+FLOAT_FUNCTIONS = (sim_types.num_data, sim_types.norm_data, sim_types.exp_data)
+
+# Kinds of numpy dtype that registered types can be memory-mapped for
+MEMMAP_KINDS = 'biufcmM'
+
+# Type functions that take the row number of the first row they generate, as row_offset
+ROW_OFFSET_FUNCTIONS = (sim_types.timeseries_data, sim_types.num_int)
+
+# Rows of each block of a row-addressable dataset, which is generated one whole block at a time.
+# Columns made one row at a time (Faker columns that aren't pooled, and registered types that
+# aren't vectorized) have blocks of PER_ROW_BLOCK_SIZE rows instead.
+ROW_BLOCK_SIZE = 2**16
+PER_ROW_BLOCK_SIZE = 2**8
+
+# Type functions whose unique option takes the set of values generated by earlier chunks
+UNIQUE_SEEN_FUNCTIONS = (sim_types.name_data, sim_types.address_data, sim_types.faker_data)
+
+def register_type(name, function, dtype='float64', vectorized=True, supports_chunks=True):
+    """Add a column type, which can then be used in type dictionaries like the built-in types.
+
+    >>> def zero_inflated(out, rng, lam=1.0, zero_rate=0.5):
+    ...     out[:] = rng.poisson(lam, len(out))
+    ...     out[rng.random(len(out)) < zero_rate] = 0
+    >>> register_type('zip', zero_inflated, dtype='int64')
+    >>> df = create(10**6, coltypes={'claims': {'type': 'zip', 'lam': 3, 'zero_rate': 0.8}})
+
+    Parameters
+    ----------
+    name : str
+        Name of the type, which mustn't already be a type
+    function : function
+        If vectorized, called as function(out, rng, **params) to fill out, a numpy array of
+        dtype, in place, with values drawn from rng, a numpy.random.Generator.  The array is
+        preallocated (or a memory-mapped file, with memmap_dir) and becomes the column without
+        being copied.  Otherwise called as function(rng, **params) for each row, returning the
+        row's value.  params are the other keys of the type dictionary.  It needs to be defined
+        at the top level of a module to be used with workers.
+    dtype : str or numpy.dtype, optional
+        The numpy dtype of the values, defaults to 'float64'.  'object' for any values.
+    vectorized : bool, optional
+        Whether function fills all the values at once (the default) or returns one at a time
+    supports_chunks : bool, optional
+        If False, the column is only generated in one call for the whole dataset, e.g. because
+        its values depend on each other, so it can't be used with more than one worker, a
+        row_offset or create_iter chunks smaller than the dataset.
+    """
+    if name in TYPE_FUNCTIONS:
+        raise ValueError('"{}" is already a type'.format(name))
+    type_function = _RegisteredType(function, dtype, vectorized, supports_chunks)
+    TYPE_FUNCTIONS[name] = type_function
+    if vectorized and type_function.dtype.kind in MEMMAP_KINDS:
+        MEMMAP_FUNCTIONS[type_function] = type_function.dtype
+
+
+def unregister_type(name):
+    """Remove a type added with register_type"""
+    if not isinstance(TYPE_FUNCTIONS.get(name), _RegisteredType):
+        raise ValueError('"{}" is not a registered type'.format(name))
+    MEMMAP_FUNCTIONS.pop(TYPE_FUNCTIONS.pop(name), None)
+
+
+class _RegisteredType(object):
+    """The type function of a type added with register_type"""
+
+    def __init__(self, function, dtype, vectorized, supports_chunks):
+        self.function = function
+        self.dtype = np.dtype(dtype)
+        self.vectorized = vectorized
+        self.supports_chunks = supports_chunks
+        self.__name__ = getattr(function, '__name__', type(function).__name__)
+        self.__qualname__ = getattr(function, '__qualname__', self.__name__)
+        self.__module__ = getattr(function, '__module__', type(function).__module__)
+        self.__doc__ = function.__doc__ or ''
+
+    def __call__(self, length, rng=None, out=None, **kwargs):
+        rng = sim_types.get_rng(rng)
+        if out is None:
+            out = np.empty(length, dtype=self.dtype)
+        if self.vectorized:
+            self.function(out, rng, **kwargs)
+        else:
+            for row in range(len(out)):
+                out[row] = self.function(rng, **kwargs)
+        return pd.Series(out, copy=False)
+
 
 def help_type(function_name=None):
     to_print = TYPE_FUNCTIONS.items()
@@ -27,10 +144,13 @@ def help_type(function_name=None):
         to_print = [(function_name, TYPE_FUNCTIONS[function_name])]
     for function_name, function in to_print:
         print(
-            'Name: {}, Function: simulacrum.types.{}'.format(function_name, function.__name__))
+            'Name: {}, Function: {}.{}'.format(
+                function_name, function.__module__, function.__qualname__))
         print(function.__doc__ + '\n')
 
-def create(length=100, cols=None, types=None, coltypes=None, null_rate=0):
+def create(length=100, cols=None, types=None, coltypes=None, null_rate=0, seed=None,
+           workers=1, memmap_dir=None, null_method='exact', on_column=None,
+           string_backend='python', row_offset=None, compact=False):
     """Create a dataset based on passed in information.
 
     A user must either pass in cols and types lists, OR coltypes, OR the
@@ -52,12 +172,640 @@ def create(length=100, cols=None, types=None, coltypes=None, null_rate=0):
         An optional null rate between 0 and 1 to apply to the entire dataframe.  You can also pass
         a null_rate as a parameter on any type dictionary to override (or only set that column to
         null).
+    seed : int or numpy.random.SeedSequence, optional
+        Seed for the random number generators.  The same seed and number of workers always give
+        the same dataframe.  If not provided, fresh entropy from the operating system is used.
+    workers : int, optional default 1
+        Number of processes to generate the data with.  The rows are split into one block per
+        worker, and each block gets its own random number streams spawned from the seed.
+    memmap_dir : str, optional
+        If given, the numeric columns (num, int, norm, exp, bin and pois) are generated straight
+        into memory-mapped "<column name>.npy" files in this directory, which the returned
+        dataframe wraps without copying.  Other processes can open the same files read-only with
+        numpy.load(path, mmap_mode='r').  Nulls of float columns are NaN in the files, and
+        integer columns with nulls get a "<column name>.mask.npy" file too, which is True where
+        the value is null.  Can't be combined with more than one worker.
+    null_method : str, optional default 'exact'
+        'exact' nulls int(null_rate * length) values of each column, 'bernoulli' nulls each
+        value independently with probability null_rate.  Can also be set on any type dictionary.
+    on_column : function, optional
+        Called with a dict of timings and memory use for each column once it is generated -
+        see simulacrum.profiling.ColumnStats, which collects them and reports the slowest.
+    string_backend : str, optional default 'python'
+        How the string columns (txt, name, addr, faker and uuid with output 'str') are stored:
+        'python' as object columns of Python strings, or 'pyarrow' as "string[pyarrow]" columns,
+        which take much less memory and are built straight from buffers where the type allows
+        (uuid, and txt with the numpy engine).  Can also be set on any type dictionary.  Pooled
+        columns stay categorical.
+    row_offset : int, optional
+        If given, generate rows row_offset to row_offset + length of a row-addressable dataset,
+        e.g. one shard of a dataset generated across several machines.  Rows are generated in
+        blocks of ROW_BLOCK_SIZE (PER_ROW_BLOCK_SIZE for columns made one row at a time, such
+        as Faker columns that aren't pooled), each column of each block drawing from a counter-based
+        (Philox) generator keyed by the seed, the column and the block number, so every row is
+        the same however the rows are split between calls, chunks and workers.  Needs a seed,
+        and the dataframe is indexed by row number.  The rows differ from those generated
+        without a row_offset, and a call generates the whole blocks its rows are in.
+    compact : bool, optional default False
+        If True, the numeric columns that don't set a dtype get the smallest one that holds
+        their values: int and bin columns the smallest integer dtype holding min to max (or 0 to
+        n), pois columns one holding values up to sim_types.poisson_max(lam), and num, norm and
+        exp columns are drawn as float32.  The values differ from those drawn without compact.
 
     Returns
     -------
     pandas.DataFrame
         The generated dataframe.
     """
+    if workers < 1:
+        raise ValueError('workers must be at least 1')
+    if seed is None:
+        return plan(cols, types, coltypes, null_rate, null_method,
+                    string_backend=string_backend, compact=compact).generate(
+            length, workers=workers, memmap_dir=memmap_dir, on_column=on_column,
+            row_offset=row_offset)
+    pool_seq, data_seq = _seed_sequence(seed).spawn(2)
+    return plan(cols, types, coltypes, null_rate, null_method, seed=pool_seq,
+                string_backend=string_backend, compact=compact).generate(
+        length, seed=data_seq, workers=workers, memmap_dir=memmap_dir, on_column=on_column,
+        row_offset=row_offset)
+
+
+def create_iter(length=100, cols=None, types=None, coltypes=None, null_rate=0,
+                chunk_size=100000, seed=None, null_method='exact', on_column=None,
+                string_backend='python', row_offset=None, compact=False):
+    """Create a dataset in chunks, yielding one dataframe of at most chunk_size rows at a time,
+    so that datasets larger than memory can be streamed to disk.
+
+    Takes the same column definitions as create.  Null counts are spread over the chunks so the
+    overall null count is the same as create would give, and categorical columns (including
+    pooled Faker columns) have the same categories in every chunk, so the chunks can be
+    concatenated.
+
+    Parameters
+    ----------
+    length : int, optional
+        How many records (rows) to generate in total
+    cols : list, optional
+        A list of column names
+    types : list of dict, optional
+        A list of "type dictionaries", as for create
+    coltypes : dict, optional
+        A combined version of cols and types, as for create
+    null_rate : float, optional default 0
+        An optional null rate between 0 and 1 to apply to the entire dataframe, which can be
+        overridden on any type dictionary.
+    chunk_size : int, optional
+        Maximum number of rows in each yielded dataframe, defaults to 100000
+    seed : int or numpy.random.SeedSequence, optional
+        Seed for the random number generators, as for create.  Each chunk gets its own
+        streams spawned from the seed, so the output depends on chunk_size.
+    null_method : str, optional default 'exact'
+        How nulls are drawn, as for create
+    on_column : function, optional
+        Called with a dict of timings and memory use for each column of each chunk, as for
+        create
+    string_backend : str, optional default 'python'
+        How string columns are stored, 'python' or 'pyarrow', as for create
+    row_offset : int, optional
+        If given, generate rows row_offset to row_offset + length of a row-addressable dataset,
+        as for create.  The rows don't depend on chunk_size.
+    compact : bool, optional default False
+        If True, numeric columns get the smallest dtype that holds their values, as for create
+
+    Returns
+    -------
+    generator of pandas.DataFrame
+        The generated chunks, indexed by their row numbers in the full dataset.
+    """
+    if seed is None:
+        return plan(cols, types, coltypes, null_rate, null_method,
+                    string_backend=string_backend, compact=compact).generate_iter(
+            length, chunk_size, on_column=on_column, row_offset=row_offset)
+    pool_seq, data_seq = _seed_sequence(seed).spawn(2)
+    return plan(cols, types, coltypes, null_rate, null_method, seed=pool_seq,
+                string_backend=string_backend, compact=compact).generate_iter(
+        length, chunk_size, seed=data_seq, on_column=on_column, row_offset=row_offset)
+
+
+def plan(cols=None, types=None, coltypes=None, null_rate=0, null_method='exact', seed=None,
+         string_backend='python', compact=False):
+    """Validate and resolve column definitions once, for generating datasets from repeatedly.
+
+    Takes the same column definitions as create.  The type dictionaries are copied, so changing
+    them afterwards doesn't change the plan.
+
+    Parameters
+    ----------
+    cols : list, optional
+        A list of column names
+    types : list of dict, optional
+        A list of "type dictionaries", as for create
+    coltypes : dict, optional
+        A combined version of cols and types, as for create
+    null_rate : float, optional default 0
+        An optional null rate between 0 and 1 to apply to every column, as for create
+    null_method : str, optional default 'exact'
+        How nulls are drawn, as for create
+    seed : int or numpy.random.SeedSequence, optional
+        Seed for building the pools of pooled columns.  If not provided, fresh entropy from the
+        operating system is used.
+    string_backend : str, optional default 'python'
+        How string columns are stored, 'python' or 'pyarrow', as for create
+    compact : bool, optional default False
+        If True, numeric columns get the smallest dtype that holds their values, as for create
+
+    Returns
+    -------
+    Plan
+    """
+    if string_backend not in sim_types.STRING_BACKENDS:
+        raise ValueError('string_backend must be one of {}'.format(sim_types.STRING_BACKENDS))
+    columns = _resolve_columns(cols, types, coltypes, null_rate, null_method)
+    _generation_order(columns)
+    pool_seq = None if seed is None else _seed_sequence(seed)
+    return Plan(_freeze_columns([_prepare_column(column) for column in columns], pool_seq,
+                                string_backend, compact))
+
+
+class Plan(object):
+    """A validated, resolved set of columns, which generates datasets with generate and
+    generate_iter.  Created with plan or ColTypes.compile.
+
+    Pooled columns have their pools built once, when the plan is created, so every dataset from
+    a plan draws from the same pools.
+    """
+    __slots__ = ('_columns', '_dtypes')
+
+    def __init__(self, columns):
+        self._columns = tuple(columns)
+        self._dtypes = None
+
+    def __repr__(self):
+        return 'Plan({})'.format(', '.join(
+            '{}: {}'.format(column.name, column.type_name)
+            for column in self._columns))
+
+    @property
+    def columns(self):
+        """tuple of str: The names of the planned columns"""
+        return tuple(column.name for column in self._columns)
+
+    @property
+    def dtypes(self):
+        """pandas.Series: The dtype of each generated column (as for a dataframe), for columns
+        that have nulls.  Worked out from a one row sample the first time it is needed."""
+        if self._dtypes is None:
+            operands, generated = {}, {}
+            for column in _generation_order(self._columns):
+                results = _column_data(column, 0, 1, 0, operands)
+                if column.null_rate:
+                    results = sim_types.apply_null_mask(results, np.ones(1, dtype=bool))
+                _add_column(operands, column.name, results)
+                generated[column.name] = results
+            sample = {}
+            for column in self._columns:
+                _add_column(sample, column.name, generated[column.name])
+            self._dtypes = pd.DataFrame(sample).dtypes
+        return self._dtypes.copy()
+
+    def generate(self, length=100, seed=None, workers=1, memmap_dir=None, on_column=None,
+                 row_offset=None):
+        """Generate a dataset from the plan.
+
+        Parameters
+        ----------
+        length : int, optional
+            How many records (rows) in the returned dataframe
+        seed : int or numpy.random.SeedSequence, optional
+            Seed for the random number generators, as for create
+        workers : int, optional default 1
+            Number of processes to generate the data with, as for create
+        memmap_dir : str, optional
+            Directory to generate the numeric columns into memory-mapped files in, as for create
+        on_column : function, optional
+            Called with a dict of timings and memory use for each column, as for create
+        row_offset : int, optional
+            First row to generate of a row-addressable dataset, as for create
+
+        Returns
+        -------
+        pandas.DataFrame
+            The generated dataframe.
+        """
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        if row_offset is not None:
+            _check_row_offset(self._columns, seed, row_offset, memmap_dir)
+            return _generate_rows(self._columns, row_offset, row_offset + length, seed, workers,
+                                  on_column)
+        if workers > 1:
+            _check_chunks(self._columns, 'more than one worker')
+        columns = self._columns
+        if memmap_dir is not None:
+            if workers > 1:
+                raise ValueError('memmap_dir can only be used with one worker')
+            columns = _memmap_columns(columns, length, memmap_dir)
+        if workers > 1 and any(_has_seen_set(column) for column in columns):
+            raise ValueError('unique name, addr and faker columns can only be generated with one '
+                             'worker')
+        if seed is None and workers == 1:
+            return _save_null_masks(_generate_chunk(columns, 0, length, on_column=on_column),
+                                    columns, memmap_dir)
+
+        block_size = max(-(-length // workers), 1)
+        starts = list(range(0, max(length, 1), block_size))
+        stops = [min(start + block_size, length) for start in starts]
+        block_seqs = _seed_sequence(seed).spawn(len(starts))
+        if workers == 1:
+            return _save_null_masks(
+                _generate_chunk(columns, starts[0], stops[0], block_seqs[0], on_column), columns,
+                memmap_dir)
+        # Only imported when it's needed, as it's slow to import
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(
+                _generate_chunk_with_records, [columns] * len(starts), starts, stops, block_seqs,
+                [on_column is not None] * len(starts)))
+        for _, records in results:
+            for record in records:
+                on_column(record)
+        return pd.concat([chunk for chunk, _ in results])
+
+    def generate_iter(self, length=100, chunk_size=100000, seed=None, on_column=None,
+                      row_offset=None):
+        """Generate a dataset from the plan in chunks, as for create_iter.
+
+        Parameters
+        ----------
+        length : int, optional
+            How many records (rows) to generate in total
+        chunk_size : int, optional
+            Maximum number of rows in each yielded dataframe, defaults to 100000
+        seed : int or numpy.random.SeedSequence, optional
+            Seed for the random number generators, as for create_iter
+        on_column : function, optional
+            Called with a dict of timings and memory use for each column of each chunk, as for
+            create
+        row_offset : int, optional
+            First row to generate of a row-addressable dataset, as for create
+
+        Returns
+        -------
+        generator of pandas.DataFrame
+            The generated chunks, indexed by their row numbers in the full dataset.
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        if length > chunk_size:
+            _check_chunks(self._columns, 'chunks smaller than the dataset')
+        if row_offset is not None:
+            _check_row_offset(self._columns, seed, row_offset)
+            return _iter_row_chunks(self._columns, row_offset, row_offset + length, chunk_size,
+                                    seed, on_column)
+        return self._iter_chunks(length, chunk_size, seed, on_column)
+
+    def _iter_chunks(self, length, chunk_size, seed, on_column):
+        seed_seq = None if seed is None else _seed_sequence(seed)
+        # Unique columns keep the values of the earlier chunks, to not generate them again
+        columns = [column._replace(kwargs=dict(column.kwargs, seen=set()))
+                   if _has_seen_set(column) else column for column in self._columns]
+        for start in range(0, length, chunk_size):
+            stop = min(start + chunk_size, length)
+            chunk_seq = None if seed_seq is None else seed_seq.spawn(1)[0]
+            yield _generate_chunk(columns, start, stop, chunk_seq, on_column)
+
+
+def _generate_chunk(columns, start, stop, seed_seq=None, on_column=None, rngs=None):
+    """Generates rows start to stop of a dataset.  Null counts are taken as this chunk's share of
+    the null rate over the whole dataset.
+
+    Parameters
+    ----------
+    columns : list of ColumnSpec
+        Column definitions as returned by _resolve_columns
+    start : int
+        First row number of the chunk
+    stop : int
+        One past the last row number of the chunk
+    seed_seq : numpy.random.SeedSequence, optional
+        Spawns one random number stream per column.  If not provided, each column is seeded from
+        fresh operating system entropy.
+    on_column : function, optional
+        Called with a dict of timings and memory use for each column - see
+        simulacrum.profiling.ColumnStats
+    rngs : dict, optional
+        The random number generator of each column by name, instead of spawning them from
+        seed_seq
+
+    Returns
+    -------
+    pandas.DataFrame
+        The chunk, indexed by row number.
+    """
+    if rngs is None:
+        rngs = [None] * len(columns) if seed_seq is None else seed_seq.spawn(len(columns))
+        rngs = dict(zip((column.name for column in columns), rngs))
+    index = pd.RangeIndex(start, stop)
+    # Expressions can use the columns generated before them, including the sub-columns of
+    # columns that return a dataframe
+    operands, generated = {}, {}
+    for column in _generation_order(columns):
+        if on_column is not None:
+            started, cpu_started = time.perf_counter(), time.process_time()
+        rng = sim_types.get_rng(rngs[column.name])
+        results = _column_data(column, start, stop, rng, operands)
+        results.index = index
+        if on_column is not None:
+            type_done = time.perf_counter()
+        null_count = int(column.null_rate * stop) - int(column.null_rate * start)
+        mask = sim_types.draw_null_mask(
+            stop - start, column.null_rate, null_count, column.null_method, rng)
+        results = sim_types.apply_null_mask(results, mask)
+        if on_column is not None:
+            on_column(_column_record(column, start, stop, results, started, cpu_started,
+                                     type_done))
+        _add_column(operands, column.name, results)
+        generated[column.name] = results
+    return _chunk_frame(columns, generated, index)
+
+
+def _column_record(column, start, stop, results, started, cpu_started, type_done):
+    """The dict of timings and memory use passed to on_column for a generated column"""
+    done = time.perf_counter()
+    return {
+        'column': column.name,
+        'type': column.type_name,
+        'start': start,
+        'length': stop - start,
+        'wall_seconds': done - started,
+        'cpu_seconds': time.process_time() - cpu_started,
+        'type_seconds': type_done - started,
+        'null_seconds': done - type_done,
+        'bytes': int(np.sum(results.memory_usage(index=False, deep=True)))}
+
+
+def _chunk_frame(columns, generated, index):
+    """Builds a chunk from its generated columns, in the order they were defined"""
+    series_res = {}
+    for column in columns:
+        _add_column(series_res, column.name, generated[column.name])
+    return pd.DataFrame(series_res, index=index, copy=False)
+
+
+def _generate_chunk_with_records(columns, start, stop, seed_seq, profile):
+    """Runs _generate_chunk in a worker process, returning the chunk and a list of the records
+    it would have passed to on_column (empty unless profile is True)."""
+    records = []
+    chunk = _generate_chunk(columns, start, stop, seed_seq, records.append if profile else None)
+    return chunk, records
+
+
+def _check_row_offset(columns, seed, row_offset, memmap_dir=None):
+    """Raises a ValueError if a row-addressable dataset can't be generated"""
+    if seed is None:
+        raise ValueError('row_offset needs a seed')
+    if row_offset < 0:
+        raise ValueError('row_offset must not be negative')
+    if memmap_dir is not None:
+        raise ValueError('memmap_dir can\'t be used with row_offset')
+    if any(_has_seen_set(column) for column in columns):
+        raise ValueError('unique name, addr and faker columns can\'t be used with row_offset')
+    _check_chunks(columns, 'row_offset')
+
+
+def _check_chunks(columns, reason):
+    """Raises a ValueError if a column of a registered type that doesn't support chunks can't be
+    generated in one call, because of reason"""
+    for column in columns:
+        if not getattr(column.type_function, 'supports_chunks', True):
+            raise ValueError('Column {} of type {} doesn\'t support chunks, so can\'t be '
+                             'generated with {}'.format(column.name, column.type_name, reason))
+
+
+def _generate_rows(columns, start, stop, seed, workers=1, on_column=None):
+    """Generates rows start to stop of a row-addressable dataset, in workers processes that each
+    generate a run of whole blocks."""
+    if workers == 1 or start == stop:
+        blocks = list(_iter_row_blocks(columns, start, stop, seed, on_column))
+        return pd.concat(blocks) if len(blocks) > 1 else blocks[0]
+    first = start - start % ROW_BLOCK_SIZE
+    blocks_per_worker = max(-(-(stop - first) // (ROW_BLOCK_SIZE * workers)), 1)
+    bounds = range(first, stop, blocks_per_worker * ROW_BLOCK_SIZE)
+    starts = [max(bound, start) for bound in bounds]
+    stops = starts[1:] + [stop]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as executor:
+        results = list(executor.map(
+            _generate_rows_with_records, [columns] * len(starts), starts, stops,
+            [seed] * len(starts), [on_column is not None] * len(starts)))
+    for _, records in results:
+        for record in records:
+            on_column(record)
+    return pd.concat([chunk for chunk, _ in results])
+
+
+def _generate_rows_with_records(columns, start, stop, seed, profile):
+    """Runs _generate_rows in a worker process, as _generate_chunk_with_records does"""
+    records = []
+    chunk = _generate_rows(columns, start, stop, seed,
+                           on_column=records.append if profile else None)
+    return chunk, records
+
+
+def _iter_row_chunks(columns, start, stop, chunk_size, seed, on_column=None):
+    """Generates rows start to stop of a row-addressable dataset in chunks of chunk_size rows,
+    cut from its blocks, so each block is only generated once."""
+    pieces, rows = [], 0
+    for block in _iter_row_blocks(columns, start, stop, seed, on_column):
+        while len(block):
+            piece = block.iloc[:chunk_size - rows]
+            block = block.iloc[len(piece):]
+            pieces.append(piece)
+            rows += len(piece)
+            if rows == chunk_size:
+                yield pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+                pieces, rows = [], 0
+    if pieces:
+        yield pd.concat(pieces) if len(pieces) > 1 else pieces[0]
+
+
+def _iter_row_blocks(columns, start, stop, seed, on_column=None):
+    """Generates rows start to stop of a row-addressable dataset, and yields the rows of each
+    ROW_BLOCK_SIZE block in turn.  Yields one empty dataframe if the range is empty.
+
+    Each column is generated in blocks of _row_block_size rows, each drawing from a Philox
+    generator keyed by the seed and the column's name, with the block number as the counter, so
+    each block is the same whichever rows are asked for, and whatever other columns there are.
+    Only the blocks of each column that rows start to stop are in are generated.
+    """
+    seed_seq = _seed_sequence(seed)
+    keys = {column.name: _column_seed(seed_seq, column.name).generate_state(2, np.uint64)
+            for column in columns}
+    block_rng = lambda column, block: np.random.Generator(
+        np.random.Philox(key=keys[column.name], counter=[0, 0, block, 0]))
+    if start == stop:
+        yield _generate_chunk(columns, start, stop,
+                              rngs={column.name: block_rng(column, 0) for column in columns})
+        return
+    for piece_start in range(start - start % ROW_BLOCK_SIZE, stop, ROW_BLOCK_SIZE):
+        piece_start, piece_stop = max(piece_start, start), min(piece_start + ROW_BLOCK_SIZE, stop)
+        index = pd.RangeIndex(piece_start, piece_stop)
+        operands, generated = {}, {}
+        for column in _generation_order(columns):
+            if on_column is not None:
+                started, cpu_started = time.perf_counter(), time.process_time()
+            size = _row_block_size(column)
+            blocks = range(piece_start // size, -(-piece_stop // size))
+            rngs = [block_rng(column, block) for block in blocks]
+            cuts = [slice(max(piece_start - block * size, 0), piece_stop - block * size)
+                    for block in blocks]
+            if column.type_function is sim_types.expr_data or _has_row_values(column):
+                # These columns don't draw from their generator, so are generated for just the
+                # rows asked for.  Expressions can only be evaluated over the rows their
+                # operands have, and unique ints past the end of their range can't be drawn.
+                results = _column_data(column, piece_start, piece_stop, None, operands)
+            else:
+                results = [
+                    _column_data(column, block * size, (block + 1) * size, rng, operands).iloc[cut]
+                    for block, rng, cut in zip(blocks, rngs, cuts)]
+                results = pd.concat(results) if len(results) > 1 else results[0]
+            results.index = index
+            if on_column is not None:
+                type_done = time.perf_counter()
+            null_counts = [int(column.null_rate * (block + 1) * size)
+                           - int(column.null_rate * block * size) for block in blocks]
+            masks = [sim_types.draw_null_mask(size, column.null_rate, null_count,
+                                              column.null_method, rng)[cut]
+                     for null_count, rng, cut in zip(null_counts, rngs, cuts)]
+            results = sim_types.apply_null_mask(results, np.concatenate(masks))
+            if on_column is not None:
+                on_column(_column_record(column, piece_start, piece_stop, results, started,
+                                         cpu_started, type_done))
+            _add_column(operands, column.name, results)
+            generated[column.name] = results
+        yield _chunk_frame(columns, generated, index)
+
+
+def _has_row_values(column):
+    """Whether a column's values are a function of just their row numbers, given its kwargs"""
+    return column.type_function is sim_types.num_int and column.kwargs.get('unique')
+
+
+def _row_block_size(column):
+    """Rows in each block of a column of a row-addressable dataset"""
+    function = column.type_function
+    if function in UNIQUE_SEEN_FUNCTIONS and not column.kwargs.get('pool_size'):
+        return PER_ROW_BLOCK_SIZE
+    if function is sim_types.text_data and column.kwargs.get('engine', 'faker') == 'faker':
+        return PER_ROW_BLOCK_SIZE
+    if not getattr(function, 'vectorized', True):
+        return PER_ROW_BLOCK_SIZE
+    return ROW_BLOCK_SIZE
+
+
+def _column_data(column, start, stop, rng, operands):
+    """Calls a column's type function for rows start to stop.  Expression columns are also passed
+    the columns generated so far, and ROW_OFFSET_FUNCTIONS the row number of the first row."""
+    if column.type_function is sim_types.expr_data:
+        return column.type_function(stop - start, rng=rng, columns=operands, **column.kwargs)
+    if column.type_function in ROW_OFFSET_FUNCTIONS:
+        return column.type_function(stop - start, rng=rng, row_offset=start, **column.kwargs)
+    return column.type_function(stop - start, rng=rng, **column.kwargs)
+
+
+def _has_seen_set(column):
+    return column.type_function in UNIQUE_SEEN_FUNCTIONS and column.kwargs.get('unique')
+
+
+def _generation_order(columns):
+    """Orders columns so that every expression column comes after the columns it uses.  Columns
+    are otherwise kept in the order they were defined.
+
+    Raises
+    ------
+    ValueError
+        If an expression uses a column that isn't defined, or the expressions depend on each
+        other in a cycle.
+    """
+    names = {column.name: _sub_columns(column) for column in columns}
+    depends = {}
+    for column in columns:
+        if column.type_function is sim_types.expr_data:
+            depends[column.name] = _expr_columns(column.name, column.kwargs.get('expr'), names)
+    if not depends:
+        return list(columns)
+    ordered, done = [], set()
+    remaining = list(columns)
+    while remaining:
+        ready = [column for column in remaining if depends.get(column.name, set()) <= done]
+        if not ready:
+            raise ValueError('expr columns depend on each other in a cycle: {}'.format(
+                ', '.join(column.name for column in remaining)))
+        ordered.extend(ready)
+        done.update(column.name for column in ready)
+        remaining = [column for column in remaining if column.name not in done]
+    return ordered
+
+
+def _sub_columns(column):
+    """Returns the names of the sub-columns a column is added as (see _add_column), such as
+    ("lat", "lon") for coords with layout='columns', or an empty tuple for a single column."""
+    if column.type_function is sim_types.coords_data and column.kwargs.get('layout') == 'columns':
+        return ('lat', 'lon')
+    if (column.type_function is sim_types.timeseries_data
+            and column.kwargs.get('entities') is not None):
+        return ('time', 'entity')
+    return ()
+
+
+def _expr_columns(name, expr, names):
+    """Returns the set of columns (from names, a dict of each column's sub-columns) that the
+    expression of column name uses.  A sub-column such as "loc_lat" counts as a use of column
+    "loc"."""
+    if not isinstance(expr, str):
+        raise ValueError('expr column {} needs an "expr" string'.format(name))
+    try:
+        tree = ast.parse(expr.strip(), mode='eval')
+    except SyntaxError:
+        raise ValueError('Invalid expr for column {}: {}'.format(name, expr))
+    functions = {node.func.id for node in ast.walk(tree)
+                 if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)}
+    used = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Name) or node.id in functions:
+            continue
+        if node.id in names:
+            match = node.id
+        else:
+            match = next((col for col, subs in names.items()
+                          if node.id in ['{}_{}'.format(col, sub) for sub in subs]), None)
+        if match is None:
+            raise ValueError('expr for column {} uses undefined column {}'.format(name, node.id))
+        if match == name:
+            raise ValueError('expr for column {} uses itself'.format(name))
+        used.add(match)
+    return used
+
+
+def _add_column(series_res, col, results):
+    """Adds a generated column to series_res.  Type functions that return a dataframe (such as
+    coords with layout='columns') add each of its columns, named "<col>_<name>"."""
+    if isinstance(results, pd.DataFrame):
+        for name in results:
+            series_res['{}_{}'.format(col, name)] = results[name]
+    else:
+        series_res[col] = results
+
+
+def _resolve_columns(cols, types, coltypes, null_rate, null_method='exact'):
+    """Validates the column definitions passed to create.
+
+    Returns
+    -------
+    list of ColumnSpec
+        One for each column.  The passed in type dictionaries are not modified.
+    """
     if cols and types and coltypes:
         raise ValueError(
             'coltypes should not be defined when cols and types are defined')
@@ -74,14 +822,162 @@ def create(length=100, cols=None, types=None, coltypes=None, null_rate=0):
         column_iter = coltypes.keys()
         type_iter = coltypes.values()
 
-    series_res = {}
+    columns = []
     for col, type_dict in zip(column_iter, type_iter):
         validate_type_dict(type_dict)
-        series_null_rate = type_dict.pop('null_rate', null_rate)
-        data_builder = TYPE_FUNCTIONS[type_dict.pop('type')]
-        series_res[col] = sim_types.null_mask(length, data_builder, series_null_rate, **type_dict)
+        kwargs = dict(type_dict)
+        series_null_rate = kwargs.pop('null_rate', null_rate)
+        if not 0 <= series_null_rate <= 1:
+            raise ValueError('null_rate must be between 0 and 1')
+        series_null_method = kwargs.pop('null_method', null_method)
+        if series_null_method not in sim_types.NULL_METHODS:
+            raise ValueError('null_method must be one of {}'.format(sim_types.NULL_METHODS))
+        data_builder = TYPE_FUNCTIONS[kwargs.pop('type')]
+        columns.append(ColumnSpec(
+            col, type_dict['type'], data_builder, series_null_rate, series_null_method, kwargs))
+    return columns
+
+
+def _prepare_column(column):
+    """Converts the parameters of a column to the arrays its type function works with, so that
+    isn't repeated for every dataset or chunk."""
+    if column.type_function is sim_types.categorical_data:
+        kwargs = dict(column.kwargs)
+        if 'elements' in kwargs:
+            kwargs['elements'] = np.asarray(kwargs['elements'])
+        if kwargs.get('weights') is not None:
+            kwargs['weights'] = np.asarray(kwargs['weights'], dtype=float)
+        column = column._replace(kwargs=kwargs)
+    return column
+
+
+def _freeze_columns(columns, seed_seq=None, string_backend='python', compact=False):
+    """Replaces pooled columns with categorical columns over a fixed pool, so that every chunk
+    of the column is drawn from the same values, gives unique int columns the key of their
+    permutation, passes string_backend to the other string columns that don't set their own,
+    and with compact, gives numeric columns that don't set a dtype their compact dtype.
+
+    Parameters
+    ----------
+    columns : list of ColumnSpec
+        Column definitions as returned by _resolve_columns
+    seed_seq : numpy.random.SeedSequence, optional
+        Seeds one random number stream per column to build the pools with, by the column's name
+        (see _column_seed).  If not provided, each column is seeded from fresh operating system
+        entropy.
+    string_backend : str, optional
+        'python' (default) or 'pyarrow', see create
+    compact : bool, optional
+        Whether to choose the dtype of numeric columns, see create
+
+    Returns
+    -------
+    list of ColumnSpec
+        The column definitions, with pooled columns replaced.
+    """
+    rngs = [None if seed_seq is None else _column_seed(seed_seq, column.name)
+            for column in columns]
+    frozen = []
+    for column, rng in zip(columns, rngs):
+        if column.kwargs.get('pool_size'):
+            if column.kwargs.get('unique'):
+                raise ValueError('Unique column {} can\'t have a pool_size'.format(column.name))
+            kwargs = dict(column.kwargs)
+            pool_args = {key: kwargs.pop(key) for key in POOL_KEYS if key in kwargs}
+            kwargs.pop('string_backend', None)
+            column = column._replace(
+                type_function=sim_types.categorical_data,
+                kwargs=sim_types.pool_elements(
+                    column.type_function, rng=rng, **pool_args, **kwargs))
+        elif column.type_function is sim_types.num_int and column.kwargs.get('unique'):
+            # Every chunk and block of the column permutes its rows with the same key
+            column = column._replace(kwargs=dict(
+                {'key': int(sim_types.get_rng(rng).integers(2**63))}, **column.kwargs))
+        if column.type_function in STRING_FUNCTIONS and string_backend != 'python':
+            column = column._replace(
+                kwargs=dict(column.kwargs, string_backend=column.kwargs.get(
+                    'string_backend', string_backend)))
+        if compact and 'dtype' not in column.kwargs:
+            dtype = _compact_dtype(column)
+            if dtype is not None:
+                column = column._replace(kwargs=dict(column.kwargs, dtype=dtype))
+        frozen.append(column)
+    return frozen
+
+
+def _compact_dtype(column):
+    """The smallest dtype that holds the values of a numeric column, or None for other columns"""
+    if column.type_function in FLOAT_FUNCTIONS:
+        return np.dtype(np.float32)
+    params = {name: parameter.default for name, parameter
+              in inspect.signature(column.type_function).parameters.items()}
+    params.update(column.kwargs)
+    if column.type_function is sim_types.num_int:
+        return sim_types.int_dtype(params['min'], params['max'])
+    if column.type_function is sim_types.binom_data:
+        return sim_types.int_dtype(0, params['n'])
+    if column.type_function is sim_types.poisson_data:
+        return sim_types.int_dtype(0, sim_types.poisson_max(params['lam']))
+    return None
+
+
+def _memmap_columns(columns, length, memmap_dir):
+    """Creates a memory-mapped .npy file for each numeric column, and passes it to the column's
+    type function to fill.
+
+    Returns
+    -------
+    list of ColumnSpec
+        The column definitions, with an "out" array added to the numeric columns' kwargs.
+    """
+    mapped = []
+    for column in columns:
+        if column.type_function in MEMMAP_FUNCTIONS:
+            dtype = MEMMAP_FUNCTIONS[column.type_function]
+            if (column.kwargs.get('dtype') is not None and
+                    not isinstance(column.type_function, _RegisteredType)):
+                dtype = column.kwargs['dtype']
+            out = np.lib.format.open_memmap(
+                os.path.join(memmap_dir, '{}.npy'.format(column.name)), mode='w+',
+                dtype=dtype, shape=(length, ))
+            column = column._replace(kwargs=dict(column.kwargs, out=out))
+        mapped.append(column)
+    return mapped
+
+
+def _save_null_masks(data, columns, memmap_dir):
+    """Saves the null mask of each memory-mapped column that has one (integer columns with
+    nulls), as "<column name>.mask.npy" in memmap_dir, so that other processes reading the
+    column's file know which values are null.  Masks left by earlier datasets are removed."""
+    if memmap_dir is None:
+        return data
+    for column in columns:
+        if 'out' not in column.kwargs:
+            continue
+        path = os.path.join(memmap_dir, '{}.mask.npy'.format(column.name))
+        if isinstance(data[column.name].array, pd.arrays.IntegerArray):
+            np.save(path, data[column.name].isna().to_numpy())
+        elif os.path.exists(path):
+            os.remove(path)
+    return data
+
+
+def _column_seed(seed_seq, name):
+    """The SeedSequence of the named column, derived from seed_seq by a hash of the name rather
+    than the column's position, so that adding, removing or reordering other columns doesn't
+    change the column's values."""
+    digest = hashlib.blake2b(str(name).encode('utf-8'), digest_size=8).digest()
+    return np.random.SeedSequence(
+        seed_seq.entropy, spawn_key=seed_seq.spawn_key + (int.from_bytes(digest, 'little'), ),
+        pool_size=seed_seq.pool_size)
+
 
-    return pd.DataFrame(series_res)
+def _seed_sequence(seed):
+    """Returns a fresh numpy SeedSequence for seed, so that spawning from it doesn't change what a
+    SeedSequence passed in by the caller spawns next."""
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key)
+    return np.random.SeedSequence(seed)
 
 
 def validate_type_dict(type_dict):
@@ -111,10 +1007,10 @@ def default_coltypes():
     -------
     dict
         A dictionary that can be passed in to coltypes in create function,
-        which just creates one column of each type in TYPE_FUNCTIONS
+        which just creates one column of each built-in type in TYPE_FUNCTIONS
     """
     coltypes = {}
-    for key in TYPE_FUNCTIONS:
-        if key != 'faker':
+    for key, function in TYPE_FUNCTIONS.items():
+        if key not in REQUIRED_PARAM_TYPES and not isinstance(function, _RegisteredType):
             coltypes[key] = {'type': key}
     return coltypes
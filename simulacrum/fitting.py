@@ -0,0 +1,376 @@
+"""Inferring column types from existing data, to generate more data like it"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from simulacrum.coltypes import ColTypes
+
+# Numeric columns with at most this many distinct values (and at most half as many as values)
+# are fitted as categorical
+MAX_CATEGORIES = 100
+# Number of centroids kept by the quantile sketch of each numeric column
+COMPRESSION = 100
+# Smallest tolerances of the moment checks: below this many standard errors from the moments of
+# a distribution, a column is fitted as that distribution
+MOMENT_ERRORS = 3
+MIN_TOLERANCE = 0.1
+NS_PER_DAY = 86400 * 10**9
+
+
+def fit(data, max_categories=MAX_CATEGORIES, compression=COMPRESSION):
+    """Infer the column types of a dataframe, to generate more data like it.
+
+    Reads the data in one pass, keeping a bounded sketch of each column, so a large extract can
+    be fitted chunk by chunk:
+
+    >>> col_types = fit(pd.read_csv('extract.csv', chunksize=10**6))
+    >>> df = col_types.compile().generate(10**6)
+
+    Numeric columns are fitted as pois, norm, exp or num when their moments match, as
+    categorical when they have few distinct values, and otherwise as empirical, sampling from
+    their quantiles.  Dates are fitted as date, between the earliest and latest, and other
+    columns as categorical, over their most frequent values.  Every column's null rate is kept.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or iterable of pandas.DataFrame
+        The data, or chunks of it
+    max_categories : int, optional
+        Most distinct values a categorical column can have, defaults to MAX_CATEGORIES.  Other
+        columns with more are fitted over their max_categories most frequent values.
+    compression : int, optional
+        Number of quantiles kept for each numeric column, defaults to COMPRESSION
+
+    Returns
+    -------
+    simulacrum.ColTypes
+    """
+    sketch = Sketch(max_categories, compression)
+    for chunk in ([data] if isinstance(data, pd.DataFrame) else data):
+        sketch.update(chunk)
+    return sketch.col_types()
+
+
+class Sketch(object):
+    """Running, mergeable statistics of each column of a dataset, as used by fit.
+
+    Each column keeps its null count, running moments, a t-digest style quantile sketch and the
+    counts of its most frequent values, so memory doesn't grow with the number of rows.  Sketches
+    of separate parts of a dataset (e.g. fitted in different processes) can be combined with
+    merge, which gives the same types as fitting the whole dataset in one sketch (the quantiles
+    and frequent value counts are approximate).
+
+    >>> sketches = pool.map(sketch_part, paths)
+    >>> col_types = functools.reduce(Sketch.merge, sketches).col_types()
+    """
+
+    def __init__(self, max_categories=MAX_CATEGORIES, compression=COMPRESSION):
+        self.max_categories = max_categories
+        self.compression = compression
+        self.columns = {}
+
+    def __repr__(self):
+        return 'Sketch({})'.format(', '.join(
+            '{}: {} rows'.format(name, column.count) for name, column in self.columns.items()))
+
+    def update(self, chunk):
+        """Adds the rows of a dataframe to the sketch
+
+        Returns
+        -------
+        Sketch
+            This sketch
+        """
+        for name in chunk.columns:
+            if name not in self.columns:
+                self.columns[name] = _ColumnSketch(self.max_categories, self.compression)
+            self.columns[name].update(chunk[name])
+        return self
+
+    def merge(self, other):
+        """Adds the statistics of another sketch (of the same columns) to this one
+
+        Returns
+        -------
+        Sketch
+            This sketch
+        """
+        for name, column in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(column)
+            else:
+                self.columns[name] = column
+        return self
+
+    def col_types(self):
+        """The fitted type of each column
+
+        Returns
+        -------
+        simulacrum.ColTypes
+        """
+        col_types = ColTypes()
+        for name, column in self.columns.items():
+            type_dict = column.type_dict()
+            col_types.add_coltype(name, type_dict.pop('type'), **type_dict)
+        return col_types
+
+
+class _ColumnSketch(object):
+    """Running statistics of one column.  The kind of column ('numeric', 'datetime' or 'other')
+    is set by the first values it sees."""
+
+    def __init__(self, max_categories, compression):
+        self.max_categories = max_categories
+        self.compression = compression
+        self.kind = None
+        self.tz = None
+        self.count = 0
+        self.nulls = 0
+        # Moments of the numeric (or datetime, in ns) values: count, mean, and the sums of the
+        # 2nd, 3rd and 4th powers of the deviations from the mean
+        self.moments = np.zeros(5)
+        self.min = None
+        self.max = None
+        self.integral = True
+        # Divisor of every datetime value, as a resolution of date_data
+        self.resolution = 'D'
+        self.means = np.array([])
+        self.weights = np.array([])
+        # Counts of the most frequent values, or None once a numeric column has more than
+        # max_categories distinct values
+        self.counts = {}
+        self.overflowed = False
+
+    def update(self, values):
+        kind, tz = _column_kind(values)
+        length = len(values)
+        values = values.dropna()
+        self.count += length
+        self.nulls += length - len(values)
+        if not len(values):
+            return
+        self._set_kind(kind, tz)
+        if kind == 'numeric':
+            numbers = self._update_numbers(values.to_numpy(dtype=np.float64))
+            self.integral = self.integral and bool(np.all(numbers == np.floor(numbers)))
+            if self.counts is not None:
+                self._count_sorted(numbers)
+            return
+        if kind == 'datetime':
+            if tz is not None:
+                values = values.dt.tz_convert(None)
+            numbers = values.to_numpy(dtype='datetime64[ns]').view(np.int64)
+            self._update_numbers(numbers.astype(np.float64))
+            self._update_resolution(numbers)
+            return
+        if kind == 'bool':
+            values = values.astype(bool)
+        if self.counts is not None:
+            counts = values.value_counts()
+            if len(counts) > self.max_categories:
+                # Values that aren't among the chunk's most frequent can't be kept overall
+                counts = counts.iloc[:self.max_categories]
+                self.overflowed = True
+            self._add_counts(counts.to_dict())
+
+    def merge(self, other):
+        self.count += other.count
+        self.nulls += other.nulls
+        if other.kind is None:
+            return
+        self._set_kind(other.kind, other.tz)
+        self.moments = _merge_moments(self.moments, other.moments)
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.integral = self.integral and other.integral
+        if _RESOLUTIONS.index(other.resolution) > _RESOLUTIONS.index(self.resolution):
+            self.resolution = other.resolution
+        self.means, self.weights = _compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]), self.compression)
+        self.overflowed = self.overflowed or other.overflowed
+        if self.counts is None or other.counts is None:
+            self.counts = None
+        else:
+            self._add_counts(other.counts)
+
+    def type_dict(self):
+        """The type dictionary of the fitted type"""
+        type_dict = self._fitted_type()
+        if self.nulls:
+            type_dict['null_rate'] = self.nulls / self.count
+        return type_dict
+
+    def _set_kind(self, kind, tz):
+        if self.kind is None:
+            self.kind, self.tz = kind, tz
+        elif self.kind != kind:
+            raise ValueError('Column has {} and {} values'.format(self.kind, kind))
+
+    def _update_numbers(self, numbers):
+        """Adds numbers to the moments, range and quantile sketch, returning them sorted"""
+        self.moments = _merge_moments(self.moments, _moments(numbers))
+        numbers = np.sort(numbers)
+        self.min = numbers[0] if self.min is None else min(self.min, numbers[0])
+        self.max = numbers[-1] if self.max is None else max(self.max, numbers[-1])
+        means, weights = _compress(numbers, np.ones(len(numbers)), self.compression,
+                                   is_sorted=True)
+        self.means, self.weights = _compress(np.concatenate([self.means, means]),
+                                             np.concatenate([self.weights, weights]),
+                                             self.compression)
+        return numbers
+
+    def _count_sorted(self, numbers):
+        """Counts the distinct values of sorted numbers, without hashing them"""
+        starts = np.flatnonzero(np.concatenate([[True], numbers[1:] != numbers[:-1]]))
+        if len(starts) > self.max_categories:
+            self.overflowed = True
+            self.counts = None
+            return
+        counts = np.diff(np.append(starts, len(numbers)))
+        self._add_counts(dict(zip(numbers[starts].tolist(), counts.tolist())))
+
+    def _update_resolution(self, numbers):
+        for resolution, unit in zip(_RESOLUTIONS, (NS_PER_DAY, 10**9)):
+            if self.resolution == resolution and np.any(numbers % unit):
+                self.resolution = _RESOLUTIONS[_RESOLUTIONS.index(resolution) + 1]
+
+    def _add_counts(self, counts):
+        """Adds value counts, keeping the max_categories most frequent.  Counts of values dropped
+        from a chunk or sketch are lost, so kept counts can be lower than the true counts, but
+        there are always max_categories values to generate, even if every value is distinct."""
+        for value, count in counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.overflowed = self.overflowed or len(self.counts) > self.max_categories
+        if self.overflowed and self.kind == 'numeric':
+            # Too many distinct values to be categorical: stop counting them
+            self.counts = None
+            return
+        if len(self.counts) <= self.max_categories:
+            return
+        self.counts = dict(sorted(self.counts.items(), key=lambda item: item[1],
+                                  reverse=True)[:self.max_categories])
+
+    def _fitted_type(self):
+        if self.kind is None:
+            # Only nulls: the column's null_rate is 1
+            return {'type': 'num'}
+        if self.kind == 'datetime':
+            begin, end = (pd.Timestamp(int(value), tz='UTC' if self.tz else None)
+                          for value in (self.min, self.max))
+            type_dict = {'type': 'date', 'begin': begin, 'end': end,
+                         'resolution': self.resolution}
+            if self.tz is not None:
+                type_dict['tzinfo'] = self.tz
+            return type_dict
+        if self.kind != 'numeric':
+            if self.overflowed:
+                logging.info('Fitting a column with more than %d distinct values as categorical '
+                             'over its most frequent values', self.max_categories)
+            return self._categorical()
+        count, mean, m2, m3, m4 = self.moments
+        sd = np.sqrt(m2 / count)
+        skew = np.sqrt(count) * m3 / m2**1.5 if m2 else 0.0
+        kurtosis = count * m4 / m2**2 - 3 if m2 else 0.0
+        skew_error = max(MOMENT_ERRORS * np.sqrt(6 / count), MIN_TOLERANCE)
+        kurtosis_error = max(MOMENT_ERRORS * np.sqrt(24 / count), 2 * MIN_TOLERANCE)
+        # count is the number of non-null values
+        few_values = self.counts is not None and 2 * len(self.counts) <= count
+        if self.integral:
+            if self.min >= 0 and mean > 0 and abs(sd**2 / mean - 1) < MIN_TOLERANCE:
+                return {'type': 'pois', 'lam': float(mean)}
+            if few_values:
+                return self._categorical()
+            return self._empirical(integer=True)
+        if few_values:
+            return self._categorical()
+        if abs(skew) < skew_error and abs(kurtosis) < kurtosis_error:
+            return {'type': 'norm', 'mean': float(mean), 'sd': float(sd)}
+        if abs(skew) < skew_error and abs(kurtosis + 1.2) < kurtosis_error:
+            return {'type': 'num', 'min': float(self.min), 'max': float(self.max)}
+        if (0 <= self.min < MIN_TOLERANCE * mean and abs(sd / mean - 1) < MIN_TOLERANCE and
+                abs(skew - 2) < 2 * skew_error):
+            return {'type': 'exp', 'lam': float(1 / mean)}
+        return self._empirical()
+
+    def _categorical(self):
+        elements = list(self.counts)
+        weights = [float(self.counts[element]) for element in elements]
+        if self.kind == 'numeric' and self.integral:
+            # Numbers are counted as floats
+            elements = [int(element) for element in elements]
+        return {'type': 'categorical', 'elements': elements, 'weights': weights}
+
+    def _empirical(self, integer=False):
+        """Quantiles at the middle of each centroid, from the minimum to the maximum"""
+        total = self.weights.sum()
+        probs = (np.cumsum(self.weights) - self.weights / 2) / total
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        probs = np.concatenate([[0.0], probs, [1.0]])
+        type_dict = {'type': 'empirical', 'values': values.tolist(), 'probs': probs.tolist()}
+        if integer:
+            type_dict['integer'] = True
+        return type_dict
+
+
+_RESOLUTIONS = ('D', 's', 'ms')
+
+
+def _column_kind(values):
+    """The kind of a column's values, and their timezone"""
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return 'bool', None
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return 'numeric', None
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return 'datetime', getattr(values.dtype, 'tz', None)
+    return 'other', None
+
+
+def _moments(numbers):
+    """count, mean and the sums of the 2nd to 4th powers of the deviations from the mean"""
+    mean = numbers.mean()
+    deviations = numbers - mean
+    squares = deviations * deviations
+    return np.array([len(numbers), mean, squares.sum(), (squares * deviations).sum(),
+                     (squares * squares).sum()])
+
+
+def _merge_moments(left, right):
+    """Combines the moments of two sets of values, with the pairwise formulas of Pebay (2008)"""
+    n_a, mean_a, m2_a, m3_a, m4_a = left
+    n_b, mean_b, m2_b, m3_b, m4_b = right
+    if not n_a:
+        return right.copy()
+    if not n_b:
+        return left.copy()
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta**2 * n_a * n_b / n
+    m3 = (m3_a + m3_b + delta**3 * n_a * n_b * (n_a - n_b) / n**2 +
+          3 * delta * (n_a * m2_b - n_b * m2_a) / n)
+    m4 = (m4_a + m4_b + delta**4 * n_a * n_b * (n_a**2 - n_a * n_b + n_b**2) / n**3 +
+          6 * delta**2 * (n_a**2 * m2_b + n_b**2 * m2_a) / n**2 +
+          4 * delta * (n_a * m3_b - n_b * m3_a) / n)
+    return np.array([n, mean, m2, m3, m4])
+
+
+def _compress(means, weights, compression, is_sorted=False):
+    """Sorts weighted centroids and merges them into at most compression + 1, as a t-digest does:
+    centroids are grouped by the arcsine scale function of their quantile, so the groups are
+    smallest in the tails, where the quantiles need to be most accurate."""
+    if not is_sorted:
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+    if len(means) <= compression:
+        return means, weights
+    cumulative = np.cumsum(weights)
+    quantiles = (cumulative - weights / 2) / cumulative[-1]
+    groups = np.floor(compression * (np.arcsin(2 * quantiles - 1) / np.pi + 0.5))
+    starts = np.flatnonzero(np.concatenate([[True], groups[1:] != groups[:-1]]))
+    merged_weights = np.add.reduceat(weights, starts)
+    return np.add.reduceat(means * weights, starts) / merged_weights, merged_weights
@@ -0,0 +1,253 @@
+"""Functions for creating several related tables, joined by foreign keys"""
+
+import numpy as np
+import pandas as pd
+
+from simulacrum import types as sim_types
+from simulacrum.dataset import plan, _seed_sequence
+
+FOREIGN_KEY = 'foreign_key'
+CHILD_COUNT_DISTS = ('poisson', 'zipf')
+
+
+def create_tables(tables, null_rate=0, seed=None):
+    """Create several tables, where foreign key columns of a table refer to the rows of another.
+
+    Each table is a dict with "coltypes", as for create, and either a "length", or a foreign key
+    column with a "count_dist", in which case every row of the referenced table gets a random
+    number of rows of this table, e.g.
+
+    >>> tables = {
+    ...     'customers': {'length': 1000, 'coltypes': {'name': {'type': 'name'}}},
+    ...     'orders': {'coltypes': {
+    ...         'customer_id': {'type': 'foreign_key', 'references': 'customers',
+    ...                         'count_dist': 'poisson', 'lam': 3},
+    ...         'amount': {'type': 'exp', 'lam': 0.01}}}}
+    >>> customers, orders = create_tables(tables).values()
+
+    Foreign key type dictionaries take:
+
+    - references: the referenced table, whose row numbers (its index) are the keys, or
+      "<table>.<column>" to use the values of one of its columns as the keys.
+    - count_dist, optional: 'poisson' (with "lam", default 1.0) or 'zipf' (with "skew", default
+      2.0, so every referenced row gets at least one) number of rows for each referenced row,
+      which can be capped with "max_count".  The rows of a referenced row are next to each
+      other.  Without count_dist, each row refers to a uniformly random row.
+
+    Foreign key columns come first in their table, and are never null.  Nor are the columns
+    they refer to: null_rate doesn't apply to them, and they can't set their own.
+
+    Parameters
+    ----------
+    tables : dict
+        Table definitions by table name, as above
+    null_rate : float, optional default 0
+        A null rate between 0 and 1 to apply to every column except the foreign keys and the
+        columns they refer to, as for create
+    seed : int or numpy.random.SeedSequence, optional
+        Seed for the random number generators.  If not provided, fresh entropy from the operating
+        system is used.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        The tables by name, in the order they were defined.
+    """
+    generated = {}
+    for name, chunk in create_tables_iter(tables, null_rate=null_rate, chunk_size=None,
+                                          seed=seed):
+        generated[name] = chunk
+    return {name: generated[name] for name in tables}
+
+
+def create_tables_iter(tables, null_rate=0, chunk_size=100000, seed=None):
+    """Create several related tables in chunks, one table after another, so that tables larger
+    than memory can be streamed to disk.
+
+    Takes the same table definitions as create_tables.  Only the referenced columns of a table
+    (and the number of rows each referenced row gets) are kept once its chunks are yielded.
+
+    Parameters
+    ----------
+    tables : dict
+        Table definitions by table name, as for create_tables
+    null_rate : float, optional default 0
+        A null rate between 0 and 1 to apply to every column except the foreign keys and the
+        columns they refer to
+    chunk_size : int, optional
+        Maximum number of rows in each yielded chunk, defaults to 100000.  If None, each table
+        is yielded in one chunk.
+    seed : int or numpy.random.SeedSequence, optional
+        Seed for the random number generators, as for create_tables.  The output depends on
+        chunk_size, as for create_iter.
+
+    Returns
+    -------
+    generator of (str, pandas.DataFrame)
+        Table name and chunk, with the chunks of each table indexed by their row numbers.
+        Referenced tables are yielded before the tables that refer to them.
+    """
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    definitions = {name: _resolve_table(name, table) for name, table in tables.items()}
+    order = _table_order(definitions)
+    return _iter_tables(definitions, order, null_rate, chunk_size, seed)
+
+
+def _iter_tables(definitions, order, null_rate, chunk_size, seed):
+    table_seqs = dict(zip(definitions, _spawn(seed, len(definitions))))
+    # Keys kept for each referenced "<table>.<column>" (None for row numbers), and the length of
+    # each referenced table
+    keys, lengths = {}, {}
+    referenced = {fk['references'] for definition in definitions.values()
+                  for fk in definition['foreign_keys'].values()}
+    for name in order:
+        definition = definitions[name]
+        counts_seq, fk_seq, pool_seq, data_seq = _spawn(table_seqs[name], 4)
+        length, counts_ends, driver = definition['length'], None, definition['driver']
+        if driver is not None:
+            counts = _child_counts(
+                lengths[_table_name(definition['foreign_keys'][driver]['references'])],
+                definition['foreign_keys'][driver], sim_types.get_rng(counts_seq))
+            counts_ends = np.cumsum(counts)
+            length = int(counts_ends[-1]) if len(counts_ends) else 0
+        lengths[name] = length
+        kept = {reference: [] for reference in referenced
+                if _table_name(reference) == name and '.' in reference}
+        table_plan = plan(coltypes=_key_coltypes(name, definition['coltypes'], kept),
+                          null_rate=null_rate, seed=pool_seq)
+        fk_rng = sim_types.get_rng(fk_seq)
+        for chunk in table_plan.generate_iter(length, chunk_size or max(length, 1),
+                                              seed=data_seq):
+            start, stop = chunk.index.start, chunk.index.stop
+            fk_columns = {}
+            for col, fk in definition['foreign_keys'].items():
+                parent_keys = keys.get(fk['references'])
+                parent_length = lengths[_table_name(fk['references'])]
+                if col == driver:
+                    rows = _repeat_rows(counts_ends, start, stop)
+                else:
+                    if parent_length == 0:
+                        raise ValueError('{}.{} refers to the empty table {}'.format(
+                            name, col, fk['references']))
+                    rows = fk_rng.integers(0, parent_length, size=stop - start)
+                values = rows if parent_keys is None else parent_keys.take(rows).array
+                fk_columns[col] = pd.Series(values, index=chunk.index)
+            if fk_columns:
+                chunk = pd.concat([pd.DataFrame(fk_columns, index=chunk.index), chunk], axis=1,
+                                  copy=False)
+            for reference in kept:
+                kept[reference].append(chunk[reference.split('.', 1)[1]])
+            yield name, chunk
+        for reference, values in kept.items():
+            keys[reference] = (pd.concat(values, ignore_index=True) if values else
+                               pd.Series([], dtype=object))
+
+
+def _key_coltypes(name, coltypes, references):
+    """Sets the null rate of the columns that references ("<table>.<column>") refer to to 0, so
+    that the foreign keys copied from them are never null"""
+    coltypes = dict(coltypes)
+    for reference in references:
+        col = reference.split('.', 1)[1]
+        if coltypes[col].get('null_rate'):
+            raise ValueError('{}.{} is referenced by a foreign key, so can\'t have a null_rate'
+                             .format(name, col))
+        coltypes[col] = dict(coltypes[col], null_rate=0)
+    return coltypes
+
+
+def _resolve_table(name, table):
+    """Validates a table definition, and splits out its foreign keys
+
+    Returns
+    -------
+    dict
+        With "length", "coltypes" (the columns that aren't foreign keys), "foreign_keys" and
+        "driver" (the foreign key column that sets the length, or None).
+    """
+    if 'coltypes' not in table:
+        raise ValueError('Table {} has no "coltypes"'.format(name))
+    coltypes, foreign_keys = {}, {}
+    for col, type_dict in table['coltypes'].items():
+        if type_dict.get('type') == FOREIGN_KEY:
+            if 'references' not in type_dict:
+                raise ValueError('Foreign key {}.{} has no "references"'.format(name, col))
+            if type_dict.get('count_dist') not in CHILD_COUNT_DISTS + (None, ):
+                raise ValueError('count_dist must be one of {}'.format(CHILD_COUNT_DISTS))
+            foreign_keys[col] = dict(type_dict)
+        else:
+            coltypes[col] = type_dict
+    drivers = [col for col, fk in foreign_keys.items() if fk.get('count_dist')]
+    if len(drivers) > 1:
+        raise ValueError('Only one foreign key of table {} can have a count_dist'.format(name))
+    if drivers and 'length' in table:
+        raise ValueError('Table {} has a length and a foreign key with a count_dist'.format(name))
+    if not drivers and 'length' not in table:
+        raise ValueError(
+            'Table {} needs a length or a foreign key with a count_dist'.format(name))
+    return {
+        'length': table.get('length'),
+        'coltypes': coltypes,
+        'foreign_keys': foreign_keys,
+        'driver': drivers[0] if drivers else None}
+
+
+def _table_order(definitions):
+    """Orders the tables so that every table comes after the tables it refers to, otherwise
+    keeping them in the order they were defined."""
+    depends = {}
+    for name, definition in definitions.items():
+        depends[name] = set()
+        for col, fk in definition['foreign_keys'].items():
+            parent, _, column = fk['references'].partition('.')
+            if parent not in definitions:
+                raise ValueError('{}.{} refers to undefined table {}'.format(name, col, parent))
+            if column and column not in definitions[parent]['coltypes']:
+                raise ValueError('{}.{} refers to undefined column {}'.format(
+                    name, col, fk['references']))
+            depends[name].add(parent)
+    order, done = [], set()
+    while len(order) < len(definitions):
+        ready = [name for name in definitions
+                 if name not in done and depends[name] <= done]
+        if not ready:
+            raise ValueError('Tables refer to each other in a cycle: {}'.format(
+                ', '.join(name for name in definitions if name not in done)))
+        order.extend(ready)
+        done.update(ready)
+    return order
+
+
+def _child_counts(parent_length, foreign_key, rng):
+    """Draws the number of rows each referenced row gets"""
+    if foreign_key['count_dist'] == 'zipf':
+        counts = rng.zipf(foreign_key.get('skew', 2.0), size=parent_length)
+    else:
+        counts = rng.poisson(foreign_key.get('lam', 1.0), size=parent_length)
+    if foreign_key.get('max_count') is not None:
+        counts = np.minimum(counts, foreign_key['max_count'])
+    return counts
+
+
+def _repeat_rows(counts_ends, start, stop):
+    """Returns the referenced row of each row from start to stop, where referenced row i has rows
+    counts_ends[i - 1] to counts_ends[i].  Only the referenced rows overlapping start to stop are
+    expanded, so the whole column is never built at once."""
+    first = np.searchsorted(counts_ends, start, side='right')
+    last = np.searchsorted(counts_ends, stop - 1, side='right') + 1 if stop > start else first
+    ends = counts_ends[first:last]
+    counts = np.minimum(ends, stop) - np.maximum(
+        np.concatenate([counts_ends[first - 1:first] if first else [0], ends[:-1]]), start)
+    return np.repeat(np.arange(first, last), counts)
+
+
+def _table_name(reference):
+    return reference.split('.', 1)[0]
+
+
+def _spawn(seed, count):
+    """Spawns count seeds from seed, or count Nones to seed from operating system entropy"""
+    if seed is None:
+        return [None] * count
+    return _seed_sequence(seed).spawn(count)
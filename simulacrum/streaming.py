@@ -0,0 +1,281 @@
+"""Emitting generated records at a steady rate from asyncio, e.g. to drive load tests"""
+
+from collections import deque
+import asyncio
+import queue
+import sys
+import threading
+
+import numpy as np
+
+from simulacrum.dataset import plan, _seed_sequence
+
+STREAM_FORMATS = ('jsonl', 'csv')
+# How many of the most recent batch lags the lag percentiles are taken over
+LAG_WINDOW = 10000
+_END = object()
+
+
+def stream(length=None, cols=None, types=None, coltypes=None, null_rate=0, rows_per_sec=None,
+           batch_size=10000, seed=None, sink=None, format='jsonl', prefetch=4):
+    """Generate a dataset as an asynchronous stream of batches, emitted at a target rate.
+
+    Batches are generated ahead of time in a background thread, and up to prefetch of them are
+    queued; generation waits while the queue is full, so a slow consumer or sink holds it back
+    rather than batches piling up in memory.
+
+    >>> async with stream(coltypes=types, rows_per_sec=500000, batch_size=5000) as events:
+    ...     async for batch in events:
+    ...         await send(batch)
+
+    Leaving the "async with" block, even by breaking out of the loop or with an error, stops
+    generating batches and closes the sink.
+
+    Or write the batches to a sink without handling them:
+
+    >>> metrics = await stream(10**7, coltypes=types, rows_per_sec=500000, sink='-').run()
+
+    Parameters
+    ----------
+    length : int, optional
+        How many records to generate in total.  If not provided, the stream doesn't end.
+    cols : list, optional
+        A list of column names
+    types : list of dict, optional
+        A list of "type dictionaries", as for create
+    coltypes : dict, optional
+        A combined version of cols and types, as for create
+    null_rate : float, optional default 0
+        An optional null rate between 0 and 1 to apply to every column, as for create
+    rows_per_sec : float, optional
+        Target rate to emit rows at.  Each batch is emitted when the rows before it are due, and
+        batches that are late are emitted straight away.  If not provided, batches are emitted
+        as fast as they are generated.
+    batch_size : int, optional
+        Rows in each batch, defaults to 10000
+    seed : int or numpy.random.SeedSequence, optional
+        Seed for the random number generators, as for create_iter
+    sink : str or tuple, optional
+        Where to also write each batch: '-' for stdout, a (host, port) tuple to send it to over
+        TCP, or the path of a file to write.
+    format : str, optional
+        How batches are written to the sink, 'jsonl' (JSON lines, the default) or 'csv'
+    prefetch : int, optional
+        How many batches to generate ahead, defaults to 4
+
+    Returns
+    -------
+    Stream
+        Iterate over it with "async for" to get each batch as a dataframe, inside "async with"
+        (or call its aclose method) so that it is closed.
+    """
+    if format not in STREAM_FORMATS:
+        raise ValueError('format must be one of {}'.format(STREAM_FORMATS))
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    if rows_per_sec is not None and rows_per_sec <= 0:
+        raise ValueError('rows_per_sec must be positive')
+    if seed is None:
+        stream_plan, data_seq = plan(cols, types, coltypes, null_rate), None
+    else:
+        pool_seq, data_seq = _seed_sequence(seed).spawn(2)
+        stream_plan = plan(cols, types, coltypes, null_rate, seed=pool_seq)
+    batches = stream_plan.generate_iter(
+        sys.maxsize if length is None else length, batch_size, seed=data_seq)
+    return Stream(batches, rows_per_sec, sink, format, prefetch)
+
+
+class Stream(object):
+    """Asynchronous iterator over generated batches, returned by stream.
+
+    metrics() gives the rows and batches emitted so far, the achieved rate, how late batches
+    were compared to the target rate, and how long was spent waiting for batches to be
+    generated.  It is closed at the end of the batches, at the end of an "async with" block, if
+    writing to the sink fails, or with aclose.
+    """
+
+    def __init__(self, batches, rows_per_sec=None, sink=None, format='jsonl', prefetch=4):
+        self._batches = batches
+        self._rows_per_sec = rows_per_sec
+        self._sink = sink
+        self._format = format
+        self._queue = queue.Queue(maxsize=max(prefetch, 1))
+        self._stop = threading.Event()
+        self._thread = None
+        self._writer = None
+        self._closed = False
+        self._started_at = None
+        self._last_emit = None
+        self._rows = 0
+        self._batch_count = 0
+        self._wait_seconds = 0.0
+        self._lag_total = 0.0
+        self._lags = deque(maxlen=LAG_WINDOW)
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def __anext__(self):
+        if self._closed:
+            raise StopAsyncIteration
+        if self._thread is None:
+            await self._start()
+        loop = asyncio.get_running_loop()
+        waited_from = loop.time()
+        try:
+            item = self._queue.get_nowait()
+        except queue.Empty:
+            item = await loop.run_in_executor(None, self._get)
+        self._wait_seconds += loop.time() - waited_from
+        if item is _END:
+            await self.aclose()
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            await self.aclose()
+            raise item
+        batch, data = item
+        await self._pace(loop)
+        if data is not None:
+            await self._write(data)
+        self._rows += len(batch)
+        self._batch_count += 1
+        self._last_emit = loop.time()
+        return batch
+
+    async def run(self):
+        """Emits every batch (to the sink, if there is one) without returning them.
+
+        Returns
+        -------
+        dict
+            The final metrics()
+        """
+        async with self:
+            async for _ in self:
+                pass
+        return self.metrics()
+
+    async def aclose(self):
+        """Stops generating batches, and closes the sink"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._writer is not None:
+            if isinstance(self._writer, asyncio.StreamWriter):
+                self._writer.close()
+                try:
+                    await self._writer.wait_closed()
+                except OSError:
+                    # e.g. the connection was reset, which writing will already have raised
+                    pass
+            elif self._writer is sys.stdout:
+                self._writer.flush()
+            else:
+                self._writer.close()
+
+    def metrics(self):
+        """Statistics of the stream so far
+
+        Returns
+        -------
+        dict
+            With keys "rows", "batches", "seconds" (from the first batch to the last),
+            "rows_per_sec" (achieved), "lag_mean", "lag_p99" and "lag_max" (how many seconds
+            after the target rate's time batches were emitted, the percentile and max over the
+            last LAG_WINDOW batches) and "wait_seconds" (time spent waiting for batches to be
+            generated).
+        """
+        seconds = 0.0
+        if self._started_at is not None and self._last_emit is not None:
+            seconds = self._last_emit - self._started_at
+        lags = np.array(self._lags) if self._lags else np.zeros(1)
+        return {
+            'rows': self._rows,
+            'batches': self._batch_count,
+            'seconds': seconds,
+            'rows_per_sec': self._rows / seconds if seconds else None,
+            'lag_mean': self._lag_total / self._batch_count if self._batch_count else 0.0,
+            'lag_p99': float(np.percentile(lags, 99)),
+            'lag_max': float(lags.max()),
+            'wait_seconds': self._wait_seconds}
+
+    async def _start(self):
+        if isinstance(self._sink, tuple):
+            _, self._writer = await asyncio.open_connection(*self._sink)
+        elif self._sink == '-':
+            self._writer = sys.stdout
+        elif self._sink is not None:
+            self._writer = open(self._sink, 'w', newline='')
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _produce(self):
+        """Generates batches (and their serialized form, when there's a sink) into the queue,
+        until they run out or the stream is closed."""
+        try:
+            for number, batch in enumerate(self._batches):
+                data = None if self._sink is None else self._serialize(batch, number == 0)
+                if not self._put((batch, data)):
+                    return
+            self._put(_END)
+        except Exception as error:
+            self._put(error)
+
+    def _get(self):
+        """Takes the next item from the queue, or _END once the stream is closed"""
+        while not self._stop.is_set():
+            try:
+                return self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return _END
+
+    def _put(self, item):
+        """Puts item in the queue, waiting for space unless the stream is closed"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _serialize(self, batch, first):
+        if self._format == 'csv':
+            return batch.to_csv(header=first, index=False)
+        data = batch.to_json(orient='records', lines=True, date_format='iso',
+                             default_handler=str)
+        return data if data.endswith('\n') or not data else data + '\n'
+
+    async def _pace(self, loop):
+        """Waits until the batch is due at the target rate, and records how late it is"""
+        now = loop.time()
+        if self._started_at is None:
+            self._started_at = now
+        lag = 0.0
+        if self._rows_per_sec is not None:
+            due = self._started_at + self._rows / self._rows_per_sec
+            if due > now:
+                await asyncio.sleep(due - now)
+            lag = max(loop.time() - due, 0.0)
+        self._lag_total += lag
+        self._lags.append(lag)
+
+    async def _write(self, data):
+        """Writes a serialized batch to the sink, closing the stream if that fails"""
+        try:
+            if isinstance(self._writer, asyncio.StreamWriter):
+                self._writer.write(data.encode('utf-8'))
+                await self._writer.drain()
+            else:
+                self._writer.write(data)
+        except BaseException:
+            await self.aclose()
+            raise
@@ -1,20 +1,203 @@
 """Functions for generating random data."""
 
-from uuid import uuid4
+from collections import OrderedDict
+from uuid import UUID
+import functools
+import itertools
 import logging
 import datetime
 import numpy as np
 import pandas as pd
-from faker import Faker
 
-FAKE = Faker()
 DT_CLASSES = (datetime.datetime, datetime.date)
+POOL_DISTS = ('uniform', 'zipf')
+DATE_RESOLUTIONS = {'s': 10**9, 'ms': 10**6, 'D': 86400 * 10**9}
+HOUR_NS = 3600 * 10**9
+FILL_BLOCK_SIZE = 2**20
+UUID_OUTPUTS = ('uuid', 'str', 'bytes')
+COORDS_METHODS = ('uniform', 'sphere')
+COORDS_LAYOUTS = ('tuple', 'columns')
+MAX_EMPTY_BATCHES = 100
+NULL_METHODS = ('exact', 'bernoulli')
+TEXT_ENGINES = ('faker', 'numpy')
+STRING_BACKENDS = ('python', 'pyarrow')
+# Sentences of the numpy text engine have between these many words, as Faker's do
+SENTENCE_WORDS = (3, 8)
+HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+UUID_HEX_POSITIONS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+# Rounds of the Feistel network which permutes unique integer columns
+FEISTEL_ROUNDS = 4
+# Rows permuted at a time by permute_rows, small enough to stay in cache
+FEISTEL_BLOCK_SIZE = 2**16
+# Attempts a unique Faker column gets for each value, before giving up
+UNIQUE_ATTEMPTS = 10
+# Integer dtypes the compact dtype of a column is chosen from, smallest first
+INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+# Float dtypes the Generator can draw directly
+FLOAT_DTYPES = (np.float32, np.float64)
+# Standard deviations (and multiples of 3) above the mean of the largest Poisson value a compact
+# pois column holds, which is more than 60 standard deviations in the Chernoff tail bound
+POISSON_TAIL_SDS = 12
+# Most bytes of string data in each array of an arrow string column, whose offsets are int32
+MAX_ARROW_CHUNK_BYTES = 2**31 - 1
+# Most categorical samplers (categories and alias tables) kept by _categorical_sampler
+CATEGORICAL_CACHE_SIZE = 32
+# Shared unseeded Faker instances by locale, created the first time they are needed
+_FAKERS = {}
+_CATEGORICAL_SAMPLERS = OrderedDict()
 
-def name_data(length):
-    """Faker names series"""
-    return pd.Series([FAKE.name() for _ in range(length)])
 
-def text_data(length, max_nb_chars=200):
+def __getattr__(name):
+    # FAKE, the shared unseeded Faker instance, is only created if it's used
+    if name == 'FAKE':
+        return get_faker()
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def get_rng(rng=None):
+    """Returns the numpy Generator that a type function draws from.
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        A Generator is used as is, and anything else is used to seed a new one.  If not provided,
+        the new Generator is seeded from fresh operating system entropy, so unseeded values (e.g.
+        uuids) don't repeat after np.random.seed or in processes forked from the same parent.
+
+    Returns
+    -------
+    numpy.random.Generator
+    """
+    return np.random.default_rng(rng)
+
+
+def get_faker(rng=None, locale=None):
+    """Returns the Faker instance that a type function calls.
+
+    Faker (and its providers for the locale) is only imported and loaded the first time an
+    instance is needed, so columns that don't use Faker never pay for it.
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        If provided, a new Faker instance seeded from it, so that Faker data is repeatable even
+        when other threads (e.g. stream's) generate at the same time.  Otherwise the shared,
+        unseeded instance for the locale.
+    locale : str, optional
+        Faker locale, e.g. 'fr_FR'.  Defaults to Faker's default, 'en_US'.
+
+    Returns
+    -------
+    faker.Faker
+    """
+    from faker import Faker
+    if rng is not None:
+        # Instances are cheap once the locale's providers are loaded
+        fake = Faker(locale)
+        fake.seed_instance(int(get_rng(rng).integers(2**63)))
+        return fake
+    fake = _FAKERS.get(locale)
+    if fake is None:
+        fake = _FAKERS[locale] = Faker(locale)
+    return fake
+
+
+def string_series(values, string_backend='python'):
+    """Makes a series of strings, as Python str objects or in an arrow string array.
+
+    Parameters
+    ----------
+    values : list or numpy.ndarray
+        The strings
+    string_backend : str, optional
+        'python' (default) for an object series, or 'pyarrow' for a "string[pyarrow]" series,
+        which needs pyarrow.  Values that aren't all strings (e.g. from Faker providers of
+        numbers or dates) get the dtype pandas infers for them, whatever the backend.
+
+    Returns
+    -------
+    pandas.Series
+    """
+    if string_backend not in STRING_BACKENDS:
+        raise ValueError('string_backend must be one of {}'.format(STRING_BACKENDS))
+    if not all(isinstance(value, str) for value in values):
+        return pd.Series(values)
+    if string_backend == 'python':
+        return pd.Series(values, dtype=object)
+    pa = _import_pyarrow()
+    array = pa.array(values, type=pa.string())
+    return pd.Series(pd.arrays.ArrowStringArray(pa.chunked_array([array], pa.string())))
+
+
+def _arrow_string_series(chunks):
+    """Makes a "string[pyarrow]" series from (utf-8 bytes, offsets) chunks without creating any
+    Python strings.  offsets has one more entry than the chunk has strings.  Chunks with more
+    than MAX_ARROW_CHUNK_BYTES of data are split into several arrays, so their offsets fit."""
+    pa = _import_pyarrow()
+    arrays = []
+    for data, offsets in chunks:
+        data = pa.py_buffer(data)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        start = 0
+        while start < len(offsets) - 1:
+            stop = int(np.searchsorted(offsets, offsets[start] + MAX_ARROW_CHUNK_BYTES,
+                                       side='right')) - 1
+            stop = min(max(stop, start + 1), len(offsets) - 1)
+            begin = int(offsets[start])
+            arrays.append(pa.StringArray.from_buffers(
+                stop - start, pa.py_buffer((offsets[start:stop + 1] - begin).astype(np.int32)),
+                data.slice(begin, int(offsets[stop]) - begin)))
+            start = stop
+    return pd.Series(pd.arrays.ArrowStringArray(pa.chunked_array(arrays, pa.string())))
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError('pyarrow is required for arrow columns')
+    return pa
+
+
+def name_data(length, pool_size=None, pool_dist='uniform', pool_skew=1.0, locale=None,
+              string_backend='python', unique=False, seen=None, rng=None):
+    """Faker names series
+
+    Parameters
+    ----------
+    length : int
+        Length of the returned Series
+    pool_size : int, optional
+        If given, only generate this many names and sample the rows from them.  The
+        result is a categorical series - see pooled_data.
+    pool_dist : str, optional
+        Frequency of the pooled values, 'uniform' (default) or 'zipf'
+    pool_skew : float, optional
+        Exponent of the zipf frequencies, defaults to 1.0
+    locale : str, optional
+        Faker locale to generate names for, e.g. 'fr_FR'
+    string_backend : str, optional
+        'python' (default) or 'pyarrow' for a "string[pyarrow]" series, see string_series
+    unique : bool, optional
+        If True, no two rows are the same - see unique_values
+    seen : set, optional
+        With unique, values which mustn't be generated (e.g. those of earlier chunks), and which
+        the generated values are added to
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    """
+    if pool_size and unique:
+        raise ValueError('unique columns can\'t have a pool_size')
+    if pool_size:
+        return pooled_data(length, name_data, pool_size, pool_dist, pool_skew, rng=rng,
+                           locale=locale)
+    fake = get_faker(rng, locale)
+    if unique:
+        return string_series(unique_values(fake.name, length, seen), string_backend)
+    return string_series([fake.name() for _ in range(length)], string_backend)
+
+def text_data(length, max_nb_chars=200, engine='faker', words=None, locale=None,
+              string_backend='python', rng=None):
     """Faker text series
 
     Parameters
@@ -23,14 +206,175 @@ def text_data(length, max_nb_chars=200):
         Length of the returned Series
     max_nb_chars : int, optional
         Maximum number of characters in the text data, defaults to 200
+    engine : str, optional
+        'faker' (default) calls Faker's text for each row.  'numpy' draws the words of every row
+        at once and joins them with numpy, which is much faster for long columns: rows are
+        sentences of random words from Faker's lorem word list (or words), filling up to
+        max_nb_chars.
+    words : list of str, optional
+        Words to build the text from with the numpy engine, instead of Faker's word list
+    locale : str, optional
+        Faker locale whose word list is used
+    string_backend : str, optional
+        'python' (default) or 'pyarrow' for a "string[pyarrow]" series, see string_series.  The
+        numpy engine builds arrow strings straight from its buffers.
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    """
+    if engine not in TEXT_ENGINES:
+        raise ValueError('engine must be one of {}'.format(TEXT_ENGINES))
+    if engine == 'numpy':
+        words = tuple(words or get_faker(locale=locale).get_words_list())
+        return _numpy_text(length, max_nb_chars, words, string_backend, rng)
+    if words is not None:
+        raise ValueError('words can only be used with the numpy engine')
+    fake = get_faker(rng, locale)
+    return string_series([fake.text(max_nb_chars) for _ in range(length)], string_backend)
+
+
+@functools.lru_cache(maxsize=8)
+def _text_tokens(words, max_nb_chars):
+    """Encodes each word that fits in max_nb_chars as a token for every way it can appear in a
+    sentence: lower case or capitalized, followed by " ", ". " or ".".
+
+    Returns
+    -------
+    tuple
+        The words kept, the length in characters of each word, the utf-8 bytes of all the
+        tokens, the offset and length in bytes of each token, and whether all the words are
+        ascii.  Token (word, capitalized, ending) is number
+        word + len(words) * (capitalized + 2 * ending).
+    """
+    words = [word for word in words if len(word) + 1 <= max_nb_chars]
+    if not words:
+        raise ValueError('No words fit in {} characters'.format(max_nb_chars))
+    tokens = [(word[:1].upper() + word[1:] if capitalized else word) + ending
+              for ending in (' ', '. ', '.') for capitalized in (False, True) for word in words]
+    encoded = [token.encode('utf-8') for token in tokens]
+    lengths = np.array([len(token) for token in encoded], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    word_chars = np.array([len(word) for word in words], dtype=np.int64)
+    return words, word_chars, data, offsets, lengths, all(word.isascii() for word in words)
+
+
+def _numpy_text(length, max_nb_chars, words, string_backend, rng):
+    """Generates text_data's numpy engine rows, in blocks of about FILL_BLOCK_SIZE words."""
+    if string_backend not in STRING_BACKENDS:
+        raise ValueError('string_backend must be one of {}'.format(STRING_BACKENDS))
+    rng = get_rng(rng)
+    words, word_lengths, data, token_offsets, token_lengths, ascii_only = _text_tokens(
+        words, max_nb_chars)
+    vocab_size = len(words)
+    # Draw enough words per row to fill max_nb_chars on average, with some to spare.  Rows whose
+    # words are unusually long just end a little short of max_nb_chars.  Rows are fitted by
+    # characters, and only the gather uses the tokens' lengths in bytes.
+    row_words = int(np.ceil(max_nb_chars / (word_lengths.mean() + 1) * 1.25)) + 1
+    block_rows = max(FILL_BLOCK_SIZE // row_words, 1)
+    results = []
+    for start in range(0, length, block_rows):
+        rows = min(block_rows, length - start)
+        word_ids = rng.integers(0, vocab_size, size=(rows, row_words))
+        # Mark the last word of each sentence, drawing sentence lengths for the whole block
+        ends = np.zeros((rows, row_words), dtype=bool)
+        sentence_lengths = rng.integers(SENTENCE_WORDS[0], SENTENCE_WORDS[1] + 1,
+                                        size=(rows, row_words // SENTENCE_WORDS[0] + 1))
+        row_ids, end_positions = np.nonzero(np.cumsum(sentence_lengths, axis=1) <= row_words)
+        ends[row_ids, np.cumsum(sentence_lengths, axis=1)[row_ids, end_positions] - 1] = True
+        capitalized = np.ones((rows, row_words), dtype=bool)
+        capitalized[:, 1:] = ends[:, :-1]
+        # Keep as many words as fit in max_nb_chars, with the last one ending in ".".  Every
+        # word fits on its own, so every row keeps at least one.
+        chars = np.cumsum(word_lengths[word_ids] + 1 + ends, axis=1) - ends
+        kept = (chars <= max_nb_chars).sum(axis=1)
+        keep = np.arange(row_words) < kept[:, np.newaxis]
+        last = np.arange(row_words) == (kept - 1)[:, np.newaxis]
+        endings = np.where(last, 2, ends.astype(np.int64))
+        token_ids = (word_ids + vocab_size * (capitalized + 2 * endings))[keep]
+        results.append(_join_tokens(token_ids, kept, data, token_offsets, token_lengths))
+    if string_backend == 'pyarrow':
+        return _arrow_string_series(results)
+    return pd.Series(np.concatenate([_split_strings(buffer, offsets, ascii_only)
+                                     for buffer, offsets in results])
+                     if results else np.array([], dtype=object))
+
+
+def _join_tokens(token_ids, row_tokens, data, token_offsets, token_lengths):
+    """Gathers the bytes of each token into one buffer.
+
+    Parameters
+    ----------
+    token_ids : numpy.ndarray
+        The tokens of every row, one row after the other
+    row_tokens : numpy.ndarray
+        How many tokens are in each row
+
+    Returns
+    -------
+    tuple of (bytes, numpy.ndarray)
+        The buffer, and the offset of each row in it followed by the buffer's length
     """
-    return pd.Series([FAKE.text(max_nb_chars) for _ in range(length)])
+    lengths = token_lengths[token_ids]
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    # Blocks are small enough for 32 bit offsets, which halves the work of the gather
+    source = np.repeat((token_offsets[token_ids] - starts).astype(np.int32), lengths)
+    source += np.arange(len(source), dtype=np.int32)
+    row_ends = np.concatenate([[0], ends])[np.cumsum(row_tokens)]
+    return data[source].tobytes(), np.concatenate([[0], row_ends])
+
+
+def _split_strings(buffer, offsets, ascii_only):
+    """Splits a buffer of utf-8 text into an object array of strings at offsets"""
+    row_starts, row_ends = offsets[:-1], offsets[1:]
+    values = np.empty(len(row_starts), dtype=object)
+    if ascii_only:
+        text = buffer.decode('ascii')
+        values[:] = [text[row_start:row_end]
+                     for row_start, row_end in zip(row_starts.tolist(), row_ends.tolist())]
+    else:
+        values[:] = [buffer[row_start:row_end].decode('utf-8')
+                     for row_start, row_end in zip(row_starts.tolist(), row_ends.tolist())]
+    return values
 
-def address_data(length):
-    """Faker address series"""
-    return pd.Series([FAKE.address() for _ in range(length)])
+def address_data(length, pool_size=None, pool_dist='uniform', pool_skew=1.0, locale=None,
+                 string_backend='python', unique=False, seen=None, rng=None):
+    """Faker address series
 
-def num_data(length, min=0, max=1):
+    Parameters
+    ----------
+    length : int
+        Length of the returned Series
+    pool_size : int, optional
+        If given, only generate this many addresses and sample the rows from them.  The
+        result is a categorical series - see pooled_data.
+    pool_dist : str, optional
+        Frequency of the pooled values, 'uniform' (default) or 'zipf'
+    pool_skew : float, optional
+        Exponent of the zipf frequencies, defaults to 1.0
+    locale : str, optional
+        Faker locale to generate addresses for, e.g. 'fr_FR'
+    string_backend : str, optional
+        'python' (default) or 'pyarrow' for a "string[pyarrow]" series, see string_series
+    unique : bool, optional
+        If True, no two rows are the same - see unique_values
+    seen : set, optional
+        With unique, values which mustn't be generated (e.g. those of earlier chunks), and which
+        the generated values are added to
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    """
+    if pool_size and unique:
+        raise ValueError('unique columns can\'t have a pool_size')
+    if pool_size:
+        return pooled_data(length, address_data, pool_size, pool_dist, pool_skew, rng=rng,
+                           locale=locale)
+    fake = get_faker(rng, locale)
+    if unique:
+        return string_series(unique_values(fake.address, length, seen), string_backend)
+    return string_series([fake.address() for _ in range(length)], string_backend)
+
+def num_data(length, min=0, max=1, dtype=None, rng=None, out=None):
     """Uniform distribution
 
     Parameters
@@ -41,10 +385,25 @@ def num_data(length, min=0, max=1):
         Minimum value, defaults to 0
     max : numeric, optional
         Maximum value, defaults to 1
+    dtype : str or numpy.dtype, optional
+        'float32' to draw float32 values directly, or 'float64' (the default)
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    out : numpy.ndarray, optional
+        Array of length values to fill in place, e.g. a numpy.memmap - see fill_data
     """
-    return pd.Series(np.random.uniform(min, max, length))
+    rng = get_rng(rng)
+    if _is_float32(dtype, out):
+        def draw(size):
+            values = rng.random(size, dtype=np.float32)
+            values *= max - min
+            values += min
+            return values
+        return numeric_data(length, draw, np.float32, out)
+    return numeric_data(length, lambda size: rng.uniform(min, max, size), None, out)
 
-def num_int(length, min=0, max=100):
+def num_int(length, min=0, max=100, unique=False, key=None, row_offset=0, dtype=None, rng=None,
+            out=None):
     """Random integers
 
     Parameters
@@ -55,10 +414,117 @@ def num_int(length, min=0, max=100):
         Minimum value, defaults to 0
     max : int, optional
         Maximum value, defaults to 100
+    unique : bool, optional
+        If True, no two rows are the same.  Rather than drawing values, row numbers are mapped to
+        values by a random permutation of min to max (see permute_rows), which takes no memory
+        however large the range is.
+    key : int, optional
+        With unique, the key of the permutation.  Chunks of a column generated with the same key
+        (and their row_offset) have no values in common.  Drawn from rng if not provided.
+    row_offset : int, optional
+        With unique, the row number of the first row, defaults to 0
+    dtype : str or numpy.dtype, optional
+        Integer dtype of the values, e.g. 'int16', which must hold min to max.  Defaults
+        to int64.
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    out : numpy.ndarray, optional
+        Array of length values to fill in place, e.g. a numpy.memmap - see fill_data
+    """
+    rng = get_rng(rng)
+    if dtype is not None:
+        dtype = int_dtype_for(dtype, min, max)
+    if unique:
+        if key is None:
+            key = int(rng.integers(2**63))
+        size = max - min + 1
+        if row_offset + (length if out is None else len(out)) > size:
+            raise ValueError('A unique column of more than {} rows can\'t be generated between '
+                             '{} and {}'.format(size, min, max))
+        # fill_data draws blocks of FILL_BLOCK_SIZE rows in order
+        starts = itertools.count(row_offset, FILL_BLOCK_SIZE)
+        draw = lambda count: _unique_ints(next(starts), count, min, size, key)
+        return numeric_data(length, draw, dtype, out)
+    dtype = np.int64 if dtype is None else dtype
+    return numeric_data(length, lambda size: rng.integers(
+        min, max, size, dtype=dtype, endpoint=True), None, out)
+
+def _unique_ints(start, count, min, size, key):
+    """The values between min and min + size - 1 of rows start to start + count"""
+    values = permute_rows(np.arange(start, start + count, dtype=np.uint64), size, key)
+    # Wraps around like int64 arithmetic, so ranges of up to 2**64 values don't overflow
+    values += np.uint64(min % 2**64)
+    return values.view(np.int64)
+
+def permute_rows(rows, size, key):
+    """Maps row numbers below size to values below size, so that different rows always get
+    different values.
+
+    A keyed Feistel network of FEISTEL_ROUNDS rounds permutes the numbers of as many bits as
+    size - 1 has, and values that are size or more are permuted again ("cycle walking") until
+    they're below it, which takes fewer than 2 rounds on average.  Each row is mapped on its own,
+    so any rows of a column can be generated separately, in any order.
+
+    Parameters
+    ----------
+    rows : numpy.ndarray of numpy.uint64
+        Row numbers, below size
+    size : int
+        Number of values, at most 2**64
+    key : int
+        Key of the permutation
+
+    Returns
+    -------
+    numpy.ndarray of numpy.uint64
     """
-    return pd.Series(np.random.random_integers(min, max, length))
+    bits = max((size - 1).bit_length(), 2)
+    state = np.random.SeedSequence(key).generate_state(2 * FEISTEL_ROUNDS, np.uint64)
+    # Each round xors the high bits with a multiplicative hash of the low bits (the xor key and
+    # odd multiplier of the round) and rotates them, which is a permutation of the bits values
+    round_keys = list(zip(state[:FEISTEL_ROUNDS], state[FEISTEL_ROUNDS:] | np.uint64(1)))
+    values = rows.astype(np.uint64)
+    # Frees rows, if the caller doesn't keep them
+    del rows
+    _feistel(values, bits, round_keys)
+    if size == 2**64:
+        return values
+    limit = np.uint64(size)
+    pending = np.flatnonzero(values >= limit)
+    walking = values[pending]
+    while len(pending):
+        _feistel(walking, bits, round_keys)
+        # Values still out of range are overwritten when they are permuted again
+        values[pending] = walking
+        still = np.flatnonzero(walking >= limit)
+        pending, walking = pending[still], walking[still]
+    return values
 
-def norm_data(length, mean=0, sd=1):
+def _feistel(values, bits, round_keys):
+    """Applies the rounds of permute_rows to values in place, in blocks that fit in cache"""
+    low_bits = bits // 2
+    low_mask = np.uint64((1 << low_bits) - 1)
+    mask = np.uint64((1 << bits) - 1)
+    low, high = np.uint64(low_bits), np.uint64(bits - low_bits)
+    # The hash is the top high bits of the product
+    top = np.uint64(64 - bits + low_bits)
+    hashed = np.empty(min(len(values), FEISTEL_BLOCK_SIZE), dtype=np.uint64)
+    for start in range(0, len(values), FEISTEL_BLOCK_SIZE):
+        block = values[start:start + FEISTEL_BLOCK_SIZE]
+        hashes = hashed[:len(block)]
+        for xor, multiplier in round_keys:
+            np.bitwise_and(block, low_mask, out=hashes)
+            hashes ^= xor
+            hashes *= multiplier
+            hashes >>= top
+            hashes <<= low
+            block ^= hashes
+            np.right_shift(block, low, out=hashes)
+            block <<= high
+            block |= hashes
+            block &= mask
+
+def norm_data(length, mean=0, sd=1, dtype=None, rng=None, out=None):
     """Normal distribution data
 
     Parameters
@@ -69,15 +535,36 @@ def norm_data(length, mean=0, sd=1):
         Mean of the normal distribution, defaults to 0
     sd : numeric, optional
         Standard deviation of the distribution, defaults to 1
+    dtype : str or numpy.dtype, optional
+        'float32' to draw float32 values directly, or 'float64' (the default)
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    out : numpy.ndarray, optional
+        Array of length values to fill in place, e.g. a numpy.memmap - see fill_data
     """
-    return pd.Series(np.random.normal(mean, sd, length))
+    rng = get_rng(rng)
+    if _is_float32(dtype, out):
+        def draw(size):
+            values = rng.standard_normal(size, dtype=np.float32)
+            values *= sd
+            values += mean
+            return values
+        return numeric_data(length, draw, np.float32, out)
+    return numeric_data(length, lambda size: rng.normal(mean, sd, size), None, out)
 
-def exp_data(length, lam=1.0):
+def exp_data(length, lam=1.0, dtype=None, rng=None, out=None):
     """Exponential distribution data"""
     scale = 1.0 / lam
-    return pd.Series(np.random.exponential(scale, length))
+    rng = get_rng(rng)
+    if _is_float32(dtype, out):
+        def draw(size):
+            values = rng.standard_exponential(size, dtype=np.float32)
+            values *= scale
+            return values
+        return numeric_data(length, draw, np.float32, out)
+    return numeric_data(length, lambda size: rng.exponential(scale, size), None, out)
 
-def binom_data(length, n=100, p=0.1):
+def binom_data(length, n=100, p=0.1, dtype=None, rng=None, out=None):
     """Binomial distribution data
 
     Parameters
@@ -88,10 +575,20 @@ def binom_data(length, n=100, p=0.1):
         Optional number of experiments, defaults to 100
     p : float, optional
         Probability of a successful experiment, defaults to 0.1
+    dtype : str or numpy.dtype, optional
+        Integer dtype of the values, which must hold 0 to n.  Defaults to int64.  The values
+        are drawn a block at a time and cast into an array of dtype.
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    out : numpy.ndarray, optional
+        Array of length values to fill in place, e.g. a numpy.memmap - see fill_data
     """
-    return pd.Series(np.random.binomial(n, p, length))
+    rng = get_rng(rng)
+    if dtype is not None:
+        dtype = int_dtype_for(dtype, 0, n)
+    return numeric_data(length, lambda size: rng.binomial(n, p, size), dtype, out)
 
-def poisson_data(length, lam=1.0):
+def poisson_data(length, lam=1.0, dtype=None, rng=None, out=None):
     """Poisson distribution data
 
     Parameters
@@ -100,13 +597,114 @@ def poisson_data(length, lam=1.0):
         Length of the returned Series
     lam : float, optional
         Expectation of interval
+    dtype : str or numpy.dtype, optional
+        Integer dtype of the values, defaults to int64.  A ValueError is raised if a value doesn't
+        fit in it - see poisson_max for a dtype that practically always holds them.
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    out : numpy.ndarray, optional
+        Array of length values to fill in place, e.g. a numpy.memmap - see fill_data
+    """
+    rng = get_rng(rng)
+    if dtype is None:
+        return numeric_data(length, lambda size: rng.poisson(lam, size), None, out)
+    dtype = int_dtype_for(dtype, 0, 0)
+    largest = np.iinfo(dtype).max
+
+    def draw(size):
+        values = rng.poisson(lam, size)
+        if size and values.max() > largest:
+            raise ValueError('Poisson values up to {} don\'t fit in {}'.format(
+                values.max(), dtype.name))
+        return values
+    return numeric_data(length, draw, dtype, out)
+
+def numeric_data(length, draw, dtype=None, out=None):
+    """Draws the values of a numeric column, into out or a new array of dtype if given.
+
+    Parameters
+    ----------
+    length : int
+        Number of values, if out isn't given
+    draw : function
+        Called with a number of values, and returns an array of that many random values
+    dtype : numpy.dtype, optional
+        If given, the values are drawn a block at a time into an array of this dtype, so values
+        drawn as another dtype are never all held at once.  Otherwise the values are drawn at
+        once, as the dtype draw returns.
+    out : numpy.ndarray, optional
+        Array of values to fill in place - see fill_data
+
+    Returns
+    -------
+    pandas.Series
+    """
+    if out is None and dtype is None:
+        return pd.Series(draw(length))
+    if out is None:
+        out = np.empty(length, dtype=dtype)
+    return fill_data(out, draw)
+
+def int_dtype(min, max):
+    """The smallest signed integer dtype which holds the values min to max"""
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= min and max <= info.max:
+            return np.dtype(dtype)
+    raise ValueError('Values between {} and {} don\'t fit in an int64'.format(min, max))
+
+def int_dtype_for(dtype, min, max):
+    """Checks that an integer dtype holds the values min to max, and returns it as a numpy dtype"""
+    dtype = np.dtype(dtype)
+    if dtype.kind not in 'iu':
+        raise ValueError('{} isn\'t an integer dtype'.format(dtype.name))
+    info = np.iinfo(dtype)
+    if min < info.min or max > info.max:
+        raise ValueError('Values between {} and {} don\'t fit in {}'.format(min, max, dtype.name))
+    return dtype
+
+def poisson_max(lam):
+    """The largest Poisson value of mean lam that a compact column holds (see POISSON_TAIL_SDS),
+    which is practically never exceeded"""
+    return int(np.ceil(lam + POISSON_TAIL_SDS * (np.sqrt(lam) + 3)))
+
+def _is_float32(dtype, out):
+    """Whether a float column draws float32 values, for its dtype or out array"""
+    if dtype is None:
+        return out is not None and out.dtype == np.float32
+    dtype = np.dtype(dtype)
+    if dtype not in FLOAT_DTYPES:
+        raise ValueError('Floats are drawn as float32 or float64, not {}'.format(dtype.name))
+    return dtype == np.float32
+
+def fill_data(out, draw):
+    """Fills an existing array in place, a block of values at a time, so that filling e.g. a
+    numpy.memmap never allocates a second full-length array.
+
+    Parameters
+    ----------
+    out : numpy.ndarray
+        The array to fill
+    draw : function
+        Called with a number of values, and returns an array of that many random values
+
+    Returns
+    -------
+    pandas.Series
+        A series wrapping out, without copying it.
     """
-    return pd.Series(np.random.poisson(lam, length))
+    for start in range(0, len(out), FILL_BLOCK_SIZE):
+        stop = min(start + FILL_BLOCK_SIZE, len(out))
+        out[start:stop] = draw(stop - start)
+    return pd.Series(out, copy=False)
 
-def date_data(length, begin=None, end=None, tzinfo=None):
+def date_data(length, begin=None, end=None, tzinfo=None, resolution='s', rng=None):
     """Dates between a start and end.  If no start and end are provided,
     default to one year ago and today.
 
+    Dates are drawn as integer offsets from begin in a single vectorized
+    call, so the result is always a datetime64[ns] series.
+
     Parameters
     ----------
     begin : datetime.datetime, datetime.date or str, optional
@@ -116,8 +714,16 @@ def date_data(length, begin=None, end=None, tzinfo=None):
         Ending datetime - will attempt to parse as yyyy-mm-dd is string.  If
         not provided will default to today's date.
     tzinfo : timezone, instance of datetime.tzinfo subclass
-        Optional timezone
+        Optional timezone.  Naive begin/end values are taken to be in this
+        timezone, and the returned series is tz-aware.
+    resolution : str, optional
+        Granularity of the generated dates, one of 's' (seconds, the default),
+        'ms' (milliseconds) or 'D' (whole days after begin).
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
     """
+    if resolution not in DATE_RESOLUTIONS:
+        raise ValueError('resolution must be one of {}'.format(sorted(DATE_RESOLUTIONS)))
     if begin is None and end is None:
         datetime_end = datetime.datetime.now()
         datetime_start = datetime_end - datetime.timedelta(365)
@@ -131,11 +737,122 @@ def date_data(length, begin=None, end=None, tzinfo=None):
         except:
             logging.error('Bad date format, expected yyyy-mm-dd!')
             raise ValueError('Could not parse dates')
-    return pd.Series(
-        [FAKE.date_time_between_dates(
-            datetime_start, datetime_end) for _ in range(length)])
+    start_ns = _epoch_ns(datetime_start, tzinfo)
+    end_ns = _epoch_ns(datetime_end, tzinfo)
+    if end_ns < start_ns:
+        raise ValueError('end must not be before begin')
+    unit = DATE_RESOLUTIONS[resolution]
+    steps = max((end_ns - start_ns) // unit, 1)
+    offsets = get_rng(rng).integers(0, steps, size=length, dtype=np.int64)
+    offsets *= unit
+    offsets += start_ns
+    if tzinfo is None:
+        return pd.Series(offsets.view('datetime64[ns]'))
+    return pd.Series(pd.DatetimeIndex(offsets.view('datetime64[ns]'), tz='UTC').tz_convert(tzinfo))
+
+def _epoch_ns(value, tzinfo=None):
+    """Nanoseconds since the epoch (UTC) for a date or datetime.  Naive values
+    are localized to tzinfo when one is given."""
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is None and tzinfo is not None:
+        stamp = stamp.tz_localize(tzinfo)
+    return stamp.value
+
+def timeseries_data(length, begin=None, mean_gap='1min', daily=None, weekly=None, entities=None,
+                    entity_weights=None, row_offset=0, rng=None):
+    """Sorted event times from a Poisson process, optionally with a daily and weekly pattern.
+
+    The events are drawn in one vectorized pass, without sorting: the gaps between events are
+    exponential in "operational time", in which the process has a constant rate, and their
+    cumulative sums are mapped back to real time through the cumulative rate.  Events of rows
+    row_offset to row_offset + length are those between length operational time units from
+    row_offset, so chunks generated by create_iter follow on from each other.
+
+    Parameters
+    ----------
+    length : int
+        Number of events
+    begin : datetime.datetime, datetime.date or str, optional
+        Time of the first possible event (naive, in local time).  Defaults to midnight today.
+    mean_gap : str or datetime.timedelta, optional
+        Average time between events, anything pandas.Timedelta can read.  Defaults to '1min'.
+    daily : list of float, optional
+        24 relative rates, one for each hour of the day
+    weekly : list of float, optional
+        7 relative rates, one for each day of the week starting on Monday
+    entities : int or list, optional
+        If given, each event also belongs to an entity: the event streams of the entities are
+        interleaved, with each event's entity drawn at random (or with entity_weights).  An int
+        gives entities numbered from 0, otherwise the entities are the list's values.
+    entity_weights : list of float, optional
+        Relative event rates of the entities, defaults to equal rates
+    row_offset : int, optional
+        Row number of the first event in the whole dataset.  create fills this in.
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+
+    Returns
+    -------
+    pandas.Series or pandas.DataFrame
+        The datetime64[ns] event times, or with entities a dataframe with columns "time" and
+        "entity".
+    """
+    rng = get_rng(rng)
+    begin = pd.Timestamp(datetime.date.today() if begin is None else begin)
+    if begin.tzinfo is not None:
+        raise ValueError('begin must be a naive (local) time')
+    gap_ns = pd.Timedelta(mean_gap).value
+    if gap_ns <= 0:
+        raise ValueError('mean_gap must be positive')
+    rates = np.outer(_hourly_rates(weekly, 7), _hourly_rates(daily, 24)).ravel()
+    # Expected events in each hour of the week, and their cumulative sums
+    hourly_events = rates / rates.mean() * (HOUR_NS / gap_ns)
+    cumulative = np.concatenate([[0], np.cumsum(hourly_events)])
+    week_start = begin.normalize() - pd.Timedelta(days=begin.dayofweek)
+    begin_hours = (begin - week_start).value / HOUR_NS
+    begin_hour = int(begin_hours)
+    begin_events = (cumulative[begin_hour] +
+                    (begin_hours - begin_hour) * hourly_events[begin_hour])
+
+    gaps = rng.standard_exponential(length + 1)
+    events = np.cumsum(gaps, out=gaps)[:length]
+    events *= length / gaps[length] if length else 1
+    events += begin_events + row_offset
+    times = np.empty(length, dtype=np.int64)
+    week_events = cumulative[-1]
+    for start in range(0, length, FILL_BLOCK_SIZE):
+        block = events[start:start + FILL_BLOCK_SIZE]
+        weeks = np.floor(block / week_events)
+        block = block - weeks * week_events
+        hours = np.clip(np.searchsorted(cumulative, block, side='right') - 1, 0, 167)
+        hour_events = hourly_events[hours]
+        fraction = np.divide(block - cumulative[hours], hour_events,
+                             out=np.zeros_like(block), where=hour_events > 0)
+        times[start:start + FILL_BLOCK_SIZE] = (
+            (weeks.astype(np.int64) * 168 + hours) * HOUR_NS + week_start.value +
+            np.rint(fraction * HOUR_NS).astype(np.int64))
+    results = pd.Series(times.view('datetime64[ns]'))
+    if entities is None:
+        return results
+    elements = np.arange(entities) if isinstance(entities, (int, np.integer)) else entities
+    entity = categorical_data(length, elements=elements, weights=entity_weights, rng=rng)
+    if isinstance(entities, (int, np.integer)):
+        entity = entity.cat.codes.astype(np.int64)
+    return pd.DataFrame({'time': results, 'entity': entity})
+
 
-def coords_data(length, lat_min=-90, lat_max=90, lon_min=-180, lon_max=180):
+def _hourly_rates(rates, size):
+    """Validates daily or weekly relative rates, defaulting to all 1"""
+    if rates is None:
+        return np.ones(size)
+    rates = np.asarray(rates, dtype=float)
+    if rates.shape != (size, ) or (rates < 0).any() or not rates.sum() > 0:
+        raise ValueError('Expected {} non-negative rates, not all 0'.format(size))
+    return rates
+
+
+def coords_data(length, lat_min=-90, lat_max=90, lon_min=-180, lon_max=180, method='uniform',
+                polygon=None, layout='tuple', rng=None):
     """Randomly-selected geographic coordinates
 
     Parameters
@@ -150,6 +867,17 @@ def coords_data(length, lat_min=-90, lat_max=90, lon_min=-180, lon_max=180):
         Minimum longitude
     lon_max : numeric, optional
         Maximum longitude
+    method : str, optional
+        'uniform' (default) draws latitude and longitude uniformly, 'sphere' draws points
+        uniformly over the surface of the earth, so there are fewer near the poles
+    polygon : list of tuple, optional
+        (lat, lon) vertices of a polygon to draw the points inside of, by rejection sampling
+        within its bounding box
+    layout : str, optional
+        'tuple' (default) for a series of (lat, lon) tuples, or 'columns' for a dataframe of
+        float "lat" and "lon" columns - create names these "<column>_lat" and "<column>_lon"
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
     """
     if lat_min < -90 or lat_max > 90 or lat_min > lat_max:
         raise ValueError(
@@ -157,32 +885,156 @@ def coords_data(length, lat_min=-90, lat_max=90, lon_min=-180, lon_max=180):
     if lon_min < -180 or lon_max > 180 or lon_min > lon_max:
         raise ValueError(
             'lon ranges unacceptable; not in [-180, 180] or lon_min > lon_max')
-    return pd.Series(list(zip(np.random.uniform(lat_min, lat_max, length),
-                         np.random.uniform(lat_min, lat_max, length))))
+    if method not in COORDS_METHODS:
+        raise ValueError('method must be one of {}'.format(COORDS_METHODS))
+    if layout not in COORDS_LAYOUTS:
+        raise ValueError('layout must be one of {}'.format(COORDS_LAYOUTS))
+    rng = get_rng(rng)
+    if polygon is None:
+        lat, lon = _draw_coords(length, lat_min, lat_max, lon_min, lon_max, method, rng)
+    else:
+        lat, lon = _draw_coords_in_polygon(
+            length, np.asarray(polygon, dtype=float), lat_min, lat_max, lon_min, lon_max,
+            method, rng)
+    if layout == 'columns':
+        return pd.DataFrame({'lat': lat, 'lon': lon})
+    return pd.Series(list(zip(lat, lon)))
+
+def _draw_coords(length, lat_min, lat_max, lon_min, lon_max, method, rng):
+    """Arrays of latitudes and longitudes within the bounds"""
+    if method == 'sphere':
+        sin_lat = rng.uniform(np.sin(np.radians(lat_min)), np.sin(np.radians(lat_max)), length)
+        lat = np.degrees(np.arcsin(sin_lat))
+    else:
+        lat = rng.uniform(lat_min, lat_max, length)
+    return lat, rng.uniform(lon_min, lon_max, length)
+
+def _draw_coords_in_polygon(length, polygon, lat_min, lat_max, lon_min, lon_max, method, rng):
+    """Arrays of latitudes and longitudes inside a polygon, drawn in batches from its bounding
+    box until there are enough"""
+    lat_min = max(lat_min, polygon[:, 0].min())
+    lat_max = min(lat_max, polygon[:, 0].max())
+    lon_min = max(lon_min, polygon[:, 1].min())
+    lon_max = min(lon_max, polygon[:, 1].max())
+    if lat_min > lat_max or lon_min > lon_max:
+        raise ValueError('polygon is outside of the lat and lon ranges')
+    if length == 0:
+        return np.empty(0), np.empty(0)
+    lats, lons = [], []
+    found = 0
+    empty_batches = 0
+    while found < length:
+        lat, lon = _draw_coords(
+            max(2 * (length - found), 1024), lat_min, lat_max, lon_min, lon_max, method, rng)
+        inside = _in_polygon(lat, lon, polygon)
+        lats.append(lat[inside])
+        lons.append(lon[inside])
+        found += inside.sum()
+        empty_batches = 0 if inside.any() else empty_batches + 1
+        if empty_batches == MAX_EMPTY_BATCHES:
+            raise ValueError('Could not draw any points inside the polygon')
+    return np.concatenate(lats)[:length], np.concatenate(lons)[:length]
+
+def _in_polygon(lat, lon, polygon):
+    """Boolean array of whether each point is inside the polygon, by ray casting"""
+    inside = np.zeros(len(lat), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for (lat_1, lon_1), (lat_2, lon_2) in zip(polygon, np.roll(polygon, -1, axis=0)):
+            crosses = (lat_1 > lat) != (lat_2 > lat)
+            crosses &= lon < (lon_2 - lon_1) * (lat - lat_1) / (lat_2 - lat_1) + lon_1
+            inside ^= crosses
+    return inside
 
-def uuid_data(length):
-    """Generate a column of random uuids.
+def uuid_data(length, output='uuid', string_backend='python', rng=None):
+    """Generate a column of random (version 4) uuids.
+
+    All the random bytes are drawn in one call, and the version and variant bits are set on the
+    whole array at once.
 
     Parameters
     ----------
     length : int
         Length of the series
+    output : str, optional
+        'uuid' (default) for uuid.UUID objects, 'str' for canonical 36 character strings, or
+        'bytes' for a compact fixed_size_binary[16] arrow column, which needs pyarrow.
+    string_backend : str, optional
+        For 'str' output, 'python' (default) or 'pyarrow' for a "string[pyarrow]" series, built
+        straight from the formatted characters
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
 
     Returns
     -------
     pandas.Series
         The column of uuids.
     """
-    return pd.Series(list(map(lambda _: uuid4(), range(length))))
+    if output not in UUID_OUTPUTS:
+        raise ValueError('output must be one of {}'.format(UUID_OUTPUTS))
+    raw = get_rng(rng).integers(0, 256, size=(length, 16), dtype=np.uint8)
+    raw[:, 6] &= 0x0F
+    raw[:, 6] |= 0x40
+    raw[:, 8] &= 0x3F
+    raw[:, 8] |= 0x80
+    if string_backend not in STRING_BACKENDS:
+        raise ValueError('string_backend must be one of {}'.format(STRING_BACKENDS))
+    if output == 'str' and string_backend == 'pyarrow':
+        return _arrow_string_series([(_uuid_chars(raw).tobytes(),
+                                      np.arange(0, 36 * (length + 1), 36))])
+    if output == 'str':
+        return pd.Series(_uuid_strings(raw), dtype=object)
+    if output == 'bytes':
+        pa = _import_pyarrow()
+        array = pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(16), length, [None, pa.py_buffer(raw.tobytes())])
+        return pd.Series(pd.arrays.ArrowExtensionArray(array))
+    data = raw.tobytes()
+    return pd.Series([UUID(bytes=data[i:i + 16]) for i in range(0, 16 * length, 16)],
+                     dtype=object)
+
+
+def _uuid_strings(raw):
+    """Formats an (n, 16) array of uuid bytes as an array of canonical uuid strings"""
+    return _uuid_chars(raw).view('S36').ravel().astype('U36')
+
 
+def _uuid_chars(raw):
+    """Formats an (n, 16) array of uuid bytes as an (n, 36) array of canonical uuid characters"""
+    chars = np.full((len(raw), 36), ord('-'), dtype=np.uint8)
+    chars[:, UUID_HEX_POSITIONS[0::2]] = HEX_DIGITS[raw >> 4]
+    chars[:, UUID_HEX_POSITIONS[1::2]] = HEX_DIGITS[raw & 0x0F]
+    return chars
 
-def faker_data(length, **kwargs):
+
+def faker_data(length, pool_size=None, pool_dist='uniform', pool_skew=1.0, locale=None,
+               string_backend='python', unique=False, seen=None, rng=None, **kwargs):
     """Generate a column based on any faker data type.
 
     Parameters
     ----------
     length : int
         Length of the series to return
+    pool_size : int, optional
+        If given, only call the provider this many times and sample the rows from the results.
+        The provider must return hashable values; the result is a categorical series - see
+        pooled_data.
+    pool_dist : str, optional
+        Frequency of the pooled values, 'uniform' (default) or 'zipf'
+    pool_skew : float, optional
+        Exponent of the zipf frequencies, defaults to 1.0
+    locale : str, optional
+        Faker locale to call the provider for, e.g. 'fr_FR'
+    string_backend : str, optional
+        'python' (default) or 'pyarrow' for a "string[pyarrow]" series when the provider returns
+        strings, see string_series
+    unique : bool, optional
+        If True, no two rows are the same - see unique_values.  The provider must return
+        hashable values.
+    seen : set, optional
+        With unique, values which mustn't be generated (e.g. those of earlier chunks), and which
+        the generated values are added to
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
     kwargs : dict
         A configuration for the faker data. Must contain at least provider and related args as
         dict.
@@ -191,18 +1043,104 @@ def faker_data(length, **kwargs):
     -------
     pandas.Series
     """
+    if pool_size and unique:
+        raise ValueError('unique columns can\'t have a pool_size')
+    if pool_size:
+        return pooled_data(length, faker_data, pool_size, pool_dist, pool_skew, rng=rng,
+                           locale=locale, **kwargs)
     try:
         provider = kwargs["provider"]
         del kwargs["provider"]
-        func = getattr(FAKE, provider)
+        func = getattr(get_faker(rng, locale), provider)
     except KeyError:
         raise KeyError("You have to define the Faker provider.")
     except AttributeError:
         raise AttributeError("Faker().{}() is not a valid Faker provider.".format(provider))
-    return pd.Series(map(lambda _: func(**kwargs), range(length)))
+    if unique:
+        return string_series(unique_values(lambda: func(**kwargs), length, seen), string_backend)
+    return string_series([func(**kwargs) for _ in range(length)], string_backend)
+
+
+def unique_values(draw, length, seen=None):
+    """Calls draw until it has returned length values that are all different.
+
+    Repeated values are drawn again, up to UNIQUE_ATTEMPTS times the length in all, so the cost
+    stays linear in length until the values run out.
+
+    Parameters
+    ----------
+    draw : function
+        Returns a random, hashable value
+    length : int
+        How many values to return
+    seen : set, optional
+        Values which mustn't be returned.  The returned values are added to it.
+
+    Returns
+    -------
+    list
+
+    Raises
+    ------
+    ValueError
+        If length different values weren't found, e.g. because draw has fewer distinct values.
+    """
+    seen = set() if seen is None else seen
+    values = []
+    attempts = 0
+    max_attempts = UNIQUE_ATTEMPTS * length
+    while len(values) < length:
+        if attempts >= max_attempts:
+            raise ValueError(
+                'Only found {} unique values out of {} in {} attempts ({} values seen in all): '
+                'there may not be enough distinct values'.format(
+                    len(values), length, attempts, len(seen)))
+        value = draw()
+        attempts += 1
+        if value not in seen:
+            seen.add(value)
+            values.append(value)
+    return values
+
+
+def empirical_data(length, values, probs=None, integer=False, rng=None):
+    """Values drawn from an empirical distribution, given as quantiles
+
+    Each row is drawn by inverse transform sampling: a uniform probability is mapped to a value by
+    interpolating linearly between the quantiles.
+
+    Parameters
+    ----------
+    length : int
+        Length of the series
+    values : list of float
+        Quantiles of the distribution, in increasing order, from its minimum to its maximum
+    probs : list of float, optional
+        Cumulative probability of each value, increasing from 0 to 1.  Defaults to evenly spaced
+        probabilities.
+    integer : bool, optional
+        If True, values are rounded to integers
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        raise ValueError('values must not be empty')
+    probs = (np.linspace(0, 1, len(values)) if probs is None else
+             np.asarray(probs, dtype=float))
+    if len(probs) != len(values):
+        raise ValueError('probs and values must be the same length')
+    if np.any(np.diff(values) < 0) or np.any(np.diff(probs) < 0):
+        raise ValueError('values and probs must be in increasing order')
+    if len(values) > 1 and (probs[0] != 0 or probs[-1] != 1):
+        raise ValueError('probs must go from 0 to 1')
+    results = np.interp(get_rng(rng).random(length), probs, values)
+    if integer:
+        return pd.Series(np.rint(results).astype(np.int64))
+    return pd.Series(results)
 
 
-def categorical_data(length, elements=[1,2,3], weights=None):
+def categorical_data(length, elements=[1,2,3], weights=None, rng=None):
     """Generate a categorical field based on a list of values and optional weights
 
     Parameters
@@ -214,18 +1152,216 @@ def categorical_data(length, elements=[1,2,3], weights=None):
     weights : list, optional
         Optional list of numeric weights.  Must be the same length as values.  If not provided,
         equal weights will be given to all categories.
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+
+    Returns
+    -------
+    pandas.Series
+        Randomly selected categorical variables.  The categories are always all of the
+        elements, even the ones which weren't selected.
+
+    Notes
+    -----
+    Rows are drawn as category codes, with an alias table for weighted elements, so each row
+    takes the same time however many elements there are.  The categories and alias table are
+    cached for the last CATEGORICAL_CACHE_SIZE (elements, weights) pairs, so generating the same
+    column again (such as each chunk of create_iter) doesn't rebuild them.
+    """
+    dtype, element_codes, prob, alias = _categorical_sampler(elements, weights)
+    rng = get_rng(rng)
+    codes = rng.integers(0, len(element_codes), size=length)
+    if prob is not None:
+        codes = np.where(rng.random(length) < prob[codes], codes, alias[codes])
+    return pd.Series(pd.Categorical.from_codes(element_codes[codes], dtype=dtype))
+
+
+def _categorical_sampler(elements, weights=None):
+    """Returns the categorical dtype, the category code of each element, and the alias table
+    (or None for equal weights) for sampling elements with weights, from a cache.  Null
+    elements aren't categories, and have code -1.
+
+    Elements are identified by their bytes, which for object arrays are pointers to the
+    objects.  The cache keeps a reference to the elements, so the objects can't be replaced by
+    others at the same address while they're cached.
+    """
+    elements = np.asarray(elements)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != elements.shape:
+            raise ValueError('weights must be the same length as elements')
+    key = (elements.dtype.str, elements.tobytes(),
+           None if weights is None else weights.tobytes())
+    if key in _CATEGORICAL_SAMPLERS:
+        _CATEGORICAL_SAMPLERS.move_to_end(key)
+        return _CATEGORICAL_SAMPLERS[key][1:]
+    categories = pd.unique(elements)
+    categories = categories[~pd.isnull(categories)]
+    if len(categories) == len(elements):
+        element_codes = np.arange(len(elements))
+    else:
+        element_codes = pd.Index(categories).get_indexer(elements)
+    dtype = pd.CategoricalDtype(categories)
+    prob, alias = (None, None) if weights is None else _alias_table(weights)
+    _CATEGORICAL_SAMPLERS[key] = (elements, dtype, element_codes, prob, alias)
+    if len(_CATEGORICAL_SAMPLERS) > CATEGORICAL_CACHE_SIZE:
+        _CATEGORICAL_SAMPLERS.popitem(last=False)
+    return dtype, element_codes, prob, alias
+
+
+def _alias_table(weights):
+    """Builds an alias table (Walker/Vose) for sampling index i with probability proportional to
+    weights[i]: draw i uniformly, and keep it with probability prob[i], otherwise take alias[i].
+
+    Rather than pairing up one small and one large entry at a time, each round gives every small
+    entry (prob < 1) to the large entry whose excess covers the end of its deficit, using
+    cumulative sums, so the whole table takes a few vectorized rounds.
+    """
+    if (weights < 0).any() or not weights.sum() > 0:
+        raise ValueError('weights must be non-negative and sum to more than 0')
+    prob = weights * (len(weights) / weights.sum())
+    alias = np.arange(len(weights))
+    small = np.flatnonzero(prob < 1)
+    large = np.flatnonzero(prob >= 1)
+    while small.size and large.size:
+        deficit_ends = np.cumsum(1 - prob[small])
+        excess_ends = np.cumsum(prob[large] - 1)
+        owner = np.minimum(np.searchsorted(excess_ends, deficit_ends, side='right'),
+                           large.size - 1)
+        alias[small] = large[owner]
+        # Each large entry keeps what is left after covering the deficits given to it.  That is
+        # always more than 0, but may now be less than 1, making it small for the next round.
+        absorbed = np.bincount(owner, weights=1 - prob[small], minlength=large.size)
+        prob[large] -= absorbed
+        small, large = large[prob[large] < 1], large[prob[large] >= 1]
+    # Whatever is left is within rounding error of 1
+    prob[small] = 1
+    prob[large] = 1
+    return prob, alias
+
+
+def expr_data(length, expr, columns=None, rng=None):
+    """Evaluate an arithmetic or boolean expression over other columns, e.g. "price * qty + noise"
+
+    The expression is evaluated with pandas.eval over whole columns at once, so it supports the
+    same operators and functions (such as sqrt, log and abs).  In create, the columns it names
+    are generated first, and it is evaluated chunk by chunk in create_iter.
+
+    Parameters
+    ----------
+    length : int
+        Length of the series
+    expr : str
+        The expression.  Names in it refer to other columns of the dataset.
+    columns : dict, optional
+        The columns the expression can refer to, by name.  create fills this in.
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Not used, expressions are deterministic
+
+    Returns
+    -------
+    pandas.Series
+        The result of the expression.  Nulls in the columns it uses are NaN.
+    """
+    resolvers = {name: _expr_operand(values) for name, values in (columns or {}).items()}
+    results = pd.eval(expr, resolvers=(resolvers, ), local_dict={}, global_dict={})
+    if np.ndim(results) == 0:
+        return pd.Series(np.full(length, results))
+    if any(results is values for values in resolvers.values()):
+        results = results.copy()
+    if len(results) != length:
+        raise ValueError('expr gave {} values, expected {}'.format(len(results), length))
+    return pd.Series(results)
+
+
+def _expr_operand(values):
+    """Converts pandas nullable integer and boolean columns, which pandas.eval can't use, to
+    floats with NaN for nulls."""
+    if isinstance(values.dtype, pd.api.extensions.ExtensionDtype) and (
+            pd.api.types.is_numeric_dtype(values.dtype) or
+            pd.api.types.is_bool_dtype(values.dtype)):
+        return values.astype('float64')
+    return values
+
+
+def pool_elements(type_function, pool_size, pool_dist='uniform', pool_skew=1.0, rng=None,
+                  **kwargs):
+    """Build a pool of distinct values, and the weights to sample them with.
+
+    Parameters
+    ----------
+    type_function : function
+        A function which returns a Pandas series, called once with pool_size as the length
+    pool_size : int
+        Number of values to generate.  Duplicates are dropped, so the pool may be smaller.
+    pool_dist : str, optional
+        'uniform' (default) gives every value the same weight, 'zipf' weights the k-th value
+        by 1 / k ** pool_skew
+    pool_skew : float, optional
+        Exponent of the zipf weights, defaults to 1.0
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    kwargs : dict
+        Passed through to type_function
+
+    Returns
+    -------
+    dict
+        With keys "elements" and "weights", suitable for categorical_data
+    """
+    if pool_dist not in POOL_DISTS:
+        raise ValueError('pool_dist must be one of {}'.format(POOL_DISTS))
+    if pool_size < 1:
+        raise ValueError('pool_size must be at least 1')
+    values = type_function(pool_size, rng=rng, **kwargs)
+    try:
+        elements = pd.unique(values)
+    except TypeError:
+        raise TypeError('Pooled values must be hashable')
+    weights = None
+    if pool_dist == 'zipf':
+        weights = np.arange(1, len(elements) + 1, dtype=float) ** -pool_skew
+        weights /= weights.sum()
+    return {'elements': elements, 'weights': weights}
+
+
+def pooled_data(length, type_function, pool_size, pool_dist='uniform', pool_skew=1.0, rng=None,
+                **kwargs):
+    """Generate a column by sampling from a small pool of generated values, so that
+    type_function only runs pool_size times rather than once per row.
+
+    Parameters
+    ----------
+    length : int
+        Length of the series
+    type_function : function
+        A function which returns a Pandas series, used to build the pool
+    pool_size : int
+        Number of values in the pool
+    pool_dist : str, optional
+        Frequency of the pooled values, 'uniform' (default) or 'zipf'
+    pool_skew : float, optional
+        Exponent of the zipf frequencies, defaults to 1.0
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    kwargs : dict
+        Passed through to type_function
 
     Returns
     -------
     pandas.Series
-        Randomly selected categorical variables.
+        A categorical series whose categories are the pool.
     """
-    return pd.Series(np.random.choice(elements, size=length, p=weights), dtype='category')
+    rng = get_rng(rng)
+    pool = pool_elements(type_function, pool_size, pool_dist, pool_skew, rng=rng, **kwargs)
+    codes = rng.choice(len(pool['elements']), size=length, p=pool['weights'])
+    return pd.Series(pd.Categorical.from_codes(codes, categories=pool['elements']))
 
 
-def null_mask(length, type_function, null_rate=0, **kwargs):
-    """Masks out a random subset of series values with Numpy nulls (np.nan).  The number of null
-    values will be int(null_rate * length)
+def null_mask(length, type_function, null_rate=0, rng=None, null_method='exact', **kwargs):
+    """Masks out a random subset of series values with nulls.  The number of null values will be
+    int(null_rate * length), or random with null_method='bernoulli'.  Integer and boolean
+    columns become pandas nullable ("Int64", "boolean") columns rather than floats.
 
     Parameters
     ----------
@@ -233,10 +1369,92 @@ def null_mask(length, type_function, null_rate=0, **kwargs):
         A function which returns a Pandas series
     null_rate : float, optional
         Optional null rate between 0 and 1 inclusive.
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+    null_method : str, optional
+        'exact' (default) or 'bernoulli' - see draw_null_mask
     """
     if not 0 <= null_rate <= 1:
         raise ValueError('null_rate must be between 0 and 1')
-    results = type_function(length, **kwargs)
-    sample_index = results.sample(int(null_rate * length)).index
-    results.loc[results.index.isin(sample_index)] = np.nan
+    rng = get_rng(rng)
+    results = type_function(length, rng=rng, **kwargs)
+    return apply_null_mask(results, draw_null_mask(
+        length, null_rate, method=null_method, rng=rng))
+
+
+def draw_null_mask(length, null_rate, null_count=None, method='exact', rng=None):
+    """Draws a boolean array of which values to set to null.
+
+    Parameters
+    ----------
+    length : int
+        Length of the array
+    null_rate : float
+        Null rate between 0 and 1 inclusive
+    null_count : int, optional
+        For the 'exact' method, how many values to set to null.  Defaults to
+        int(null_rate * length).
+    method : str, optional
+        'exact' (default) picks exactly null_count positions without replacement, 'bernoulli'
+        nulls each value independently with probability null_rate
+    rng : numpy.random.Generator, int or numpy.random.SeedSequence, optional
+        Source of randomness, see get_rng
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array, True where the value should be null.
+    """
+    if method not in NULL_METHODS:
+        raise ValueError('null_method must be one of {}'.format(NULL_METHODS))
+    if method == 'bernoulli':
+        if null_rate == 0:
+            return np.zeros(length, dtype=bool)
+        return get_rng(rng).random(length) < null_rate
+    if null_count is None:
+        null_count = int(null_rate * length)
+    mask = np.zeros(length, dtype=bool)
+    if null_count:
+        mask[get_rng(rng).choice(length, null_count, replace=False)] = True
+    return mask
+
+
+def apply_null_mask(results, mask):
+    """Sets values of a series to null where mask is True, in place where the dtype can hold
+    nulls.  Integer and boolean columns are wrapped, without copying, in the pandas nullable
+    "Int64" and "boolean" masked arrays rather than being cast to float.
+
+    Parameters
+    ----------
+    results : pandas.Series or pandas.DataFrame
+        The series to mask.  For a dataframe, whole rows are masked.
+    mask : numpy.ndarray
+        Boolean array, True where the value should be null
+
+    Returns
+    -------
+    pandas.Series or pandas.DataFrame
+        The masked series, which is results itself unless its dtype changed.
+    """
+    if isinstance(results, pd.DataFrame):
+        for col in results:
+            results[col] = apply_null_mask(results[col], mask)
+        return results
+    if not mask.any():
+        return results
+    if not isinstance(results.dtype, np.dtype):
+        results.array[mask] = None
+        return results
+    values = results.to_numpy(copy=False)
+    if values.dtype.kind in 'iu':
+        return pd.Series(pd.arrays.IntegerArray(values, mask), index=results.index,
+                         name=results.name)
+    if values.dtype.kind == 'b':
+        return pd.Series(pd.arrays.BooleanArray(values, mask), index=results.index,
+                         name=results.name)
+    if values.dtype.kind in 'mM':
+        values.view(np.int64)[mask] = np.iinfo(np.int64).min
+    else:
+        values[mask] = np.nan
     return results
+
@@ -0,0 +1,127 @@
+"""Functions for writing generated datasets straight to disk"""
+
+from uuid import UUID
+import logging
+import os
+import time
+
+from simulacrum.dataset import create_iter
+
+WRITE_FORMATS = ('parquet', 'csv')
+
+
+def write(path, length=100, cols=None, types=None, coltypes=None, null_rate=0,
+          format='parquet', row_group_size=100000, seed=None, on_column=None,
+          string_backend='python', row_offset=None, compact=False):
+    """Generate a dataset and write it to a local file as it is generated, one row group at a
+    time, so the full dataset is never held in memory.
+
+    Takes the same column definitions as create.  Parquet output needs pyarrow installed;
+    categorical columns are written as dictionary-encoded columns, and uuids as strings.
+
+    Parameters
+    ----------
+    path : str
+        File to write to.  Any existing file is replaced.
+    length : int, optional
+        How many records (rows) to write
+    cols : list, optional
+        A list of column names
+    types : list of dict, optional
+        A list of "type dictionaries", as for create
+    coltypes : dict, optional
+        A combined version of cols and types, as for create
+    null_rate : float, optional default 0
+        An optional null rate between 0 and 1 to apply to the entire dataset, as for create
+    format : str, optional
+        'parquet' (default) or 'csv'
+    row_group_size : int, optional
+        Number of rows generated and written at a time, defaults to 100000.  For parquet this
+        is the size of each row group.
+    seed : int or numpy.random.SeedSequence, optional
+        Seed for the random number generators, as for create_iter
+    on_column : function, optional
+        Called with a dict of timings and memory use for each column of each row group, as for
+        create
+    string_backend : str, optional
+        'python' (default) or 'pyarrow', as for create.  With 'pyarrow', string columns are
+        written to parquet without being converted from Python strings.
+    row_offset : int, optional
+        If given, write rows row_offset to row_offset + length of a row-addressable dataset, as
+        for create, e.g. so several machines can each write one shard of a dataset.
+    compact : bool, optional
+        If True, numeric columns get the smallest dtype that holds their values, as for create
+
+    Returns
+    -------
+    dict
+        Summary of the write, with keys "path", "rows", "bytes", "seconds" and "rows_per_sec".
+    """
+    if format not in WRITE_FORMATS:
+        raise ValueError('format must be one of {}'.format(WRITE_FORMATS))
+    chunks = create_iter(length=length, cols=cols, types=types, coltypes=coltypes,
+                         null_rate=null_rate, chunk_size=row_group_size, seed=seed,
+                         on_column=on_column, string_backend=string_backend,
+                         row_offset=row_offset, compact=compact)
+    started = time.perf_counter()
+    if format == 'parquet':
+        rows = _write_parquet(path, chunks)
+    else:
+        rows = _write_csv(path, chunks)
+    seconds = time.perf_counter() - started
+    stats = {
+        'path': path,
+        'rows': rows,
+        'bytes': os.path.getsize(path),
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds else float('inf')}
+    logging.info('Wrote %d rows (%d bytes) to %s at %.0f rows/s',
+                 rows, stats['bytes'], path, stats['rows_per_sec'])
+    return stats
+
+
+def _write_parquet(path, chunks):
+    """Writes each chunk as a parquet row group.  The schema is taken from the first chunk."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError('pyarrow is required to write parquet files')
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            chunk = _arrow_compatible(chunk)
+            schema = None if writer is None else writer.schema
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table, row_group_size=len(chunk))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        # No rows were generated: still leave a valid, empty file behind
+        pq.write_table(pa.table({}), path)
+    return rows
+
+
+def _write_csv(path, chunks):
+    """Appends each chunk to a csv file, with a header row before the first."""
+    rows = 0
+    with open(path, 'w', newline='') as csv_file:
+        for chunk in chunks:
+            chunk.to_csv(csv_file, header=(rows == 0), index=False)
+            rows += len(chunk)
+    return rows
+
+
+def _arrow_compatible(chunk):
+    """Converts columns that arrow can't store (uuids) to strings."""
+    for col in chunk.columns:
+        if chunk[col].dtype == object:
+            first = chunk[col].first_valid_index()
+            if first is not None and isinstance(chunk[col][first], UUID):
+                chunk[col] = chunk[col].map(str, na_action='ignore')
+    return chunk
@@ -2,8 +2,11 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import numpy as np
+import pandas as pd
 
-from simulacrum.dataset import create, validate_type_dict, default_coltypes, TYPE_FUNCTIONS, help_type
+from simulacrum.coltypes import ColTypes
+from simulacrum.dataset import create, create_iter, plan, validate_type_dict, default_coltypes, TYPE_FUNCTIONS, REQUIRED_PARAM_TYPES, ROW_BLOCK_SIZE, PER_ROW_BLOCK_SIZE, help_type, register_type, unregister_type
 
 def test_validate_type_dict():
     for value in ('num','int','norm','exp','bin','pois','txt','name','addr',
@@ -21,12 +24,12 @@ def test_default_coltypes():
     coltypes = default_coltypes()
     for type_dict in coltypes.values():
         validate_type_dict(type_dict)
-    assert len(coltypes) == len(TYPE_FUNCTIONS) - 1
+    assert len(coltypes) == len(TYPE_FUNCTIONS) - len(REQUIRED_PARAM_TYPES)
 
 def test_blank_create():
     test_df = create()
     assert len(test_df) == 100
-    assert len(test_df.columns) == len(TYPE_FUNCTIONS) - 1
+    assert len(test_df.columns) == len(TYPE_FUNCTIONS) - len(REQUIRED_PARAM_TYPES)
 
 def test_cols_types_create():
     test_df = create(length=10, cols=['int'], types=[{'type': 'int'}])
@@ -64,4 +67,382 @@ def test_create_passthrough_bad_params():
 
 def test_help_type():
     #Just call it to make sure it's working
-    help_type()
\ No newline at end of file
+    help_type()
+
+def test_create_iter():
+    chunks = list(create_iter(length=1050, coltypes={
+        'int': {'type': 'int'},
+        'cat': {'type': 'categorical', 'elements': ['a', 'b', 'c'], 'weights': [0.98, 0.01, 0.01]},
+        'name': {'type': 'name', 'pool_size': 20}}, chunk_size=100))
+    assert len(chunks) == 11
+    assert max(len(chunk) for chunk in chunks) == 100
+    test_df = pd.concat(chunks)
+    assert len(test_df) == 1050
+    assert list(test_df.index) == list(range(1050))
+    assert isinstance(test_df['cat'].dtype, pd.CategoricalDtype)
+    assert list(test_df['cat'].cat.categories) == ['a', 'b', 'c']
+    assert isinstance(test_df['name'].dtype, pd.CategoricalDtype)
+    assert len(test_df['name'].cat.categories) <= 20
+
+def test_create_iter_null_rate():
+    coltypes = {'num': {'type': 'num'}, 'norm': {'type': 'norm', 'null_rate': 0.5}}
+    test_df = pd.concat(create_iter(length=1000, coltypes=coltypes, null_rate=0.013,
+                                    chunk_size=7))
+    assert test_df['num'].isnull().sum() == 13
+    assert test_df['norm'].isnull().sum() == 500
+    assert coltypes['norm'] == {'type': 'norm', 'null_rate': 0.5}
+    with pytest.raises(ValueError):
+        list(create_iter(length=10, coltypes=coltypes, chunk_size=0))
+    with pytest.raises(ValueError):
+        list(create_iter(length=10, coltypes=coltypes, null_rate=2))
+
+SEEDED_COLTYPES = {
+    'num': {'type': 'num'},
+    'int': {'type': 'int', 'null_rate': 0.1},
+    'name': {'type': 'name'},
+    'addr': {'type': 'addr', 'pool_size': 10},
+    'uuid': {'type': 'uuid'},
+    'date': {'type': 'date', 'begin': '2017-01-01', 'end': '2017-12-31'}}
+
+def test_create_seed():
+    test_df = create(length=101, coltypes=SEEDED_COLTYPES, seed=7)
+    assert len(test_df) == 101
+    assert test_df['int'].isnull().sum() == 10
+    pd.testing.assert_frame_equal(test_df, create(length=101, coltypes=SEEDED_COLTYPES, seed=7))
+    assert not test_df.equals(create(length=101, coltypes=SEEDED_COLTYPES, seed=8))
+
+def test_create_workers():
+    test_df = create(length=1001, coltypes=SEEDED_COLTYPES, seed=7, workers=3)
+    assert len(test_df) == 1001
+    assert list(test_df.index) == list(range(1001))
+    assert test_df['int'].isnull().sum() == 100
+    assert isinstance(test_df['addr'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        test_df, create(length=1001, coltypes=SEEDED_COLTYPES, seed=7, workers=3))
+    assert len(create(length=0, coltypes=SEEDED_COLTYPES, workers=2)) == 0
+    with pytest.raises(ValueError):
+        create(length=10, coltypes=SEEDED_COLTYPES, workers=0)
+
+def test_create_iter_seed():
+    first = pd.concat(create_iter(length=250, coltypes=SEEDED_COLTYPES, chunk_size=100, seed=3))
+    second = pd.concat(create_iter(length=250, coltypes=SEEDED_COLTYPES, chunk_size=100, seed=3))
+    pd.testing.assert_frame_equal(first, second)
+
+def test_create_memmap(tmp_path):
+    coltypes = {
+        'num': {'type': 'num', 'null_rate': 0.1},
+        'int': {'type': 'int'},
+        'pois': {'type': 'pois', 'null_rate': 0.2},
+        'name': {'type': 'name'}}
+    for seed in (None, 5):
+        test_df = create(length=100, coltypes=coltypes, seed=seed, memmap_dir=str(tmp_path))
+        assert len(test_df) == 100
+        assert test_df['num'].isnull().sum() == 10
+        assert test_df['pois'].isnull().sum() == 20
+        assert test_df['int'].dtype == np.dtype('int')
+        assert test_df['pois'].dtype == pd.Int64Dtype()
+        assert isinstance(test_df['pois'].array._data.base, np.memmap)
+        for col in ('num', 'int'):
+            assert isinstance(test_df[col].values, np.memmap)
+        for col in ('num', 'int', 'pois'):
+            mapped = np.load(str(tmp_path / '{}.npy'.format(col)), mmap_mode='r')
+            not_null = test_df[col].notnull().values
+            np.testing.assert_array_equal(mapped[not_null], test_df[col][not_null].values)
+        assert not (tmp_path / 'name.npy').exists()
+        mask = np.load(str(tmp_path / 'pois.mask.npy'))
+        np.testing.assert_array_equal(mask, test_df['pois'].isnull().values)
+        assert not (tmp_path / 'int.mask.npy').exists()
+        assert np.isnan(np.load(str(tmp_path / 'num.npy'))).sum() == 10
+    create(length=100, coltypes={'pois': {'type': 'pois'}}, memmap_dir=str(tmp_path))
+    assert not (tmp_path / 'pois.mask.npy').exists()
+    with pytest.raises(ValueError):
+        create(length=10, coltypes=coltypes, workers=2, memmap_dir=str(tmp_path))
+
+def test_create_expanded_columns():
+    coltypes = {'loc': {'type': 'coords', 'layout': 'columns', 'null_rate': 0.1}}
+    for seed in (None, 1):
+        test_df = create(length=100, coltypes=coltypes, seed=seed)
+        assert list(test_df.columns) == ['loc_lat', 'loc_lon']
+        assert (test_df['loc_lat'].isnull() == test_df['loc_lon'].isnull()).all()
+        assert test_df['loc_lat'].isnull().sum() == 10
+
+def test_create_null_method():
+    coltypes = {
+        'int': {'type': 'int'},
+        'num': {'type': 'num', 'null_method': 'exact', 'null_rate': 0.3}}
+    test_df = create(length=10000, coltypes=coltypes, null_rate=0.1, null_method='bernoulli')
+    assert test_df['int'].dtype == pd.Int64Dtype()
+    assert 800 < test_df['int'].isnull().sum() < 1200
+    assert test_df['num'].isnull().sum() == 3000
+    test_df = pd.concat(create_iter(length=10000, coltypes=coltypes, chunk_size=1000,
+                                    null_rate=0.1, null_method='bernoulli'))
+    assert 800 < test_df['int'].isnull().sum() < 1200
+    assert test_df['num'].isnull().sum() == 3000
+    with pytest.raises(ValueError):
+        create(length=10, coltypes=coltypes, null_method='all')
+
+def test_plan():
+    coltypes = {
+        'int': {'type': 'int', 'null_rate': 0.1},
+        'cat': {'type': 'categorical', 'elements': ['a', 'b'], 'weights': [0.5, 0.5]},
+        'name': {'type': 'name', 'pool_size': 5},
+        'loc': {'type': 'coords', 'layout': 'columns'}}
+    test_plan = plan(coltypes=coltypes, seed=1)
+    coltypes['int']['min'] = 1000
+    assert test_plan.columns == ('int', 'cat', 'name', 'loc')
+    assert list(test_plan.dtypes.index) == ['int', 'cat', 'name', 'loc_lat', 'loc_lon']
+    assert test_plan.dtypes['int'] == pd.Int64Dtype()
+    test_df = test_plan.generate(100, seed=2)
+    assert list(test_df.dtypes) == list(test_plan.dtypes)
+    assert test_df['int'].max() <= 100
+    assert test_df['int'].isnull().sum() == 10
+    pd.testing.assert_frame_equal(test_df, test_plan.generate(100, seed=2))
+    names = set(test_df['name'].cat.categories)
+    assert set(test_plan.generate(50)['name'].cat.categories) == names
+    chunks = list(test_plan.generate_iter(100, chunk_size=30, seed=2))
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+    with pytest.raises(ValueError):
+        plan(coltypes={'bad': {'type': 'bad'}})
+
+def test_create_expr():
+    coltypes = {
+        'total': {'type': 'expr', 'expr': 'price * qty + noise'},
+        'price': {'type': 'num', 'min': 1, 'max': 10},
+        'qty': {'type': 'pois', 'lam': 3, 'null_rate': 0.1},
+        'noise': {'type': 'norm', 'sd': 0.1},
+        'big': {'type': 'expr', 'expr': '(total > 10) & (abs(loc_lat) < 45)'},
+        'loc': {'type': 'coords', 'layout': 'columns'}}
+    test_df = create(length=100, coltypes=coltypes, seed=1)
+    assert list(test_df.columns) == ['total', 'price', 'qty', 'noise', 'big', 'loc_lat', 'loc_lon']
+    expected = test_df['price'] * test_df['qty'].astype(float) + test_df['noise']
+    pd.testing.assert_series_equal(test_df['total'], expected, check_names=False)
+    assert test_df['total'].isnull().sum() == 10
+    assert test_df['big'].dtype == bool
+    assert (test_df['big'] == ((test_df['total'] > 10) & (test_df['loc_lat'].abs() < 45))).all()
+    chunks = pd.concat(create_iter(length=100, coltypes=coltypes, chunk_size=30))
+    assert np.allclose(chunks['total'], chunks['price'] * chunks['qty'].astype(float) +
+                       chunks['noise'], equal_nan=True)
+    assert list(plan(coltypes=coltypes).dtypes) == list(test_df.dtypes)
+
+def test_create_expr_bad():
+    for coltypes in (
+            {'a': {'type': 'expr', 'expr': 'b + 1'}, 'b': {'type': 'expr', 'expr': 'a + 1'}},
+            {'a': {'type': 'expr', 'expr': 'a + 1'}},
+            {'a': {'type': 'expr', 'expr': 'missing * 2'}},
+            {'a': {'type': 'expr', 'expr': 'b +'}, 'b': {'type': 'num'}},
+            {'a': {'type': 'expr'}},
+            {'a': {'type': 'expr', 'expr': 'b_lat'}, 'b': {'type': 'coords'}},
+            {'a': {'type': 'expr', 'expr': 'b_time'}, 'b': {'type': 'timeseries'}}):
+        with pytest.raises(ValueError):
+            create(length=10, coltypes=coltypes)
+
+def test_create_expr_prefixed_names():
+    coltypes = {'total': {'type': 'expr', 'expr': 'total_raw * 2'}, 'total_raw': {'type': 'num'}}
+    test_df = create(length=10, coltypes=coltypes, seed=1)
+    assert (test_df['total'] == test_df['total_raw'] * 2).all()
+    coltypes = {'x': {'type': 'expr', 'expr': 'y * 2'}, 'y': {'type': 'expr', 'expr': 'x_raw + 1'},
+                'x_raw': {'type': 'num'}}
+    test_df = create(length=10, coltypes=coltypes, seed=1)
+    assert (test_df['x'] == (test_df['x_raw'] + 1) * 2).all()
+    coltypes = {'gap': {'type': 'expr', 'expr': 'event_time.diff()'},
+                'event': {'type': 'timeseries', 'begin': '2024-01-01', 'entities': 3}}
+    assert list(create(length=10, coltypes=coltypes, seed=1).columns) == [
+        'gap', 'event_time', 'event_entity']
+
+def test_create_timeseries():
+    coltypes = {'event': {'type': 'timeseries', 'begin': '2024-01-01', 'mean_gap': '1s',
+                          'entities': 10}}
+    chunks = pd.concat(create_iter(length=1000, coltypes=coltypes, chunk_size=300, seed=1))
+    assert list(chunks.columns) == ['event_time', 'event_entity']
+    assert chunks['event_time'].is_monotonic_increasing
+    assert chunks['event_time'].iloc[-1] < pd.Timestamp('2024-01-01 00:20')
+    test_df = create(length=1000, coltypes=coltypes, workers=2, seed=1)
+    assert test_df['event_time'].is_monotonic_increasing
+
+def test_create_string_backend():
+    pytest.importorskip('pyarrow')
+    coltypes = {'id': {'type': 'uuid', 'output': 'str'},
+                'text': {'type': 'txt', 'engine': 'numpy', 'max_nb_chars': 50},
+                'name': {'type': 'name', 'pool_size': 5},
+                'address': {'type': 'addr', 'string_backend': 'python'}}
+    test_df = create(length=100, coltypes=coltypes, null_rate=0.1, seed=1,
+                     string_backend='pyarrow')
+    assert test_df['id'].dtype == pd.StringDtype('pyarrow')
+    assert test_df['text'].dtype == pd.StringDtype('pyarrow')
+    assert test_df['name'].dtype == 'category'
+    assert test_df['address'].dtype == np.dtype('O')
+    assert test_df['text'].isnull().sum() == 10
+    python_df = create(length=100, coltypes=coltypes, null_rate=0.1, seed=1)
+    assert (test_df['id'].fillna('') == python_df['id'].fillna('')).all()
+    chunks = pd.concat(create_iter(length=100, coltypes=coltypes, chunk_size=30,
+                                   string_backend='pyarrow'))
+    assert chunks['text'].dtype == pd.StringDtype('pyarrow')
+    with pytest.raises(ValueError):
+        create(length=10, coltypes=coltypes, string_backend='arrow')
+
+def test_create_unique():
+    coltypes = {'id': {'type': 'int', 'min': 1, 'max': 10**6, 'unique': True},
+                'email': {'type': 'faker', 'provider': 'email', 'unique': True,
+                          'null_rate': 0.1}}
+    chunks = pd.concat(create_iter(length=3000, coltypes=coltypes, chunk_size=700, seed=1))
+    assert chunks['id'].is_unique
+    assert chunks['email'].dropna().is_unique
+    id_only = {'id': coltypes['id']}
+    test_df = create(length=3000, coltypes=id_only, workers=3, seed=1)
+    assert test_df['id'].is_unique
+    assert (test_df['id'] == create(length=3000, coltypes=id_only, seed=1)['id']).all()
+    with pytest.raises(ValueError):
+        create(length=10, coltypes=coltypes, workers=2)
+    with pytest.raises(ValueError):
+        create(length=10, coltypes={'name': {'type': 'name', 'unique': True, 'pool_size': 5}})
+
+def test_create_row_offset():
+    coltypes = {'value': {'type': 'norm', 'null_rate': 0.2},
+                'id': {'type': 'int', 'max': 10**9, 'unique': True},
+                'double': {'type': 'expr', 'expr': 'value * 2'},
+                'segment': {'type': 'categorical', 'elements': ['a', 'b']}}
+    length = ROW_BLOCK_SIZE * 2 + 100
+    full = create(length=length, coltypes=coltypes, seed=3, row_offset=0)
+    assert full.index.equals(pd.RangeIndex(0, length))
+    bounds = (0, 1000, ROW_BLOCK_SIZE + 7, length)
+    shards = [create(length=stop - start, coltypes=coltypes, seed=3, row_offset=start)
+              for start, stop in zip(bounds[:-1], bounds[1:])]
+    assert pd.concat(shards).equals(full)
+    chunks = pd.concat(create_iter(length=length - 50, coltypes=coltypes, chunk_size=30000,
+                                   seed=3, row_offset=50))
+    assert chunks.equals(full.iloc[50:])
+    test_df = create(length=length, coltypes=coltypes, seed=3, row_offset=0, workers=2)
+    assert test_df.equals(full)
+    assert len(create(length=0, coltypes=coltypes, seed=3, row_offset=10)) == 0
+    assert len(create(length=0, coltypes=coltypes, seed=3, row_offset=10, workers=2)) == 0
+    # Unique ints are generated for just the rows asked for, so a range can end inside a block
+    id_coltypes = {'id': {'type': 'int', 'min': 0, 'max': 10**6 - 1, 'unique': True}}
+    last = create(length=1000, coltypes=id_coltypes, seed=1, row_offset=10**6 - 1000)
+    assert last['id'].is_unique and last['id'].between(0, 10**6 - 1).all()
+    assert last.iloc[:10].equals(create(length=10, coltypes=id_coltypes, seed=1,
+                                        row_offset=10**6 - 1000))
+    small = create(length=1000, coltypes={'id': {'type': 'int', 'min': 0, 'max': 999,
+                                                 'unique': True}}, seed=1, row_offset=0)
+    assert sorted(small['id']) == list(range(1000))
+    with pytest.raises(ValueError):
+        create(length=2, coltypes=id_coltypes, seed=1, row_offset=10**6 - 1)
+    # Faker columns that aren't pooled are generated in smaller blocks
+    faker_coltypes = {'name': {'type': 'name', 'null_rate': 0.1}, 'value': {'type': 'num'}}
+    records = []
+    faker_full = create(length=1000, coltypes=faker_coltypes, seed=3, row_offset=0)
+    shard = create(length=10, coltypes=faker_coltypes, seed=3, row_offset=PER_ROW_BLOCK_SIZE - 5,
+                   on_column=records.append)
+    assert shard.equals(faker_full.iloc[PER_ROW_BLOCK_SIZE - 5:PER_ROW_BLOCK_SIZE + 5])
+    assert [record['length'] for record in records] == [10, 10]
+    # Each column's values depend on its name, not its position
+    coltypes['name'] = {'type': 'name', 'pool_size': 10}
+    reordered = dict([('extra', {'type': 'num'})] + list(coltypes.items())[::-1])
+    shard = create(length=100, coltypes=coltypes, seed=3, row_offset=ROW_BLOCK_SIZE)
+    moved = create(length=100, coltypes=reordered, seed=3, row_offset=ROW_BLOCK_SIZE)
+    assert moved[shard.columns].equals(shard)
+    assert shard[full.columns].equals(full.iloc[ROW_BLOCK_SIZE:ROW_BLOCK_SIZE + 100])
+    with pytest.raises(ValueError):
+        create(length=10, coltypes=coltypes, row_offset=0)
+    with pytest.raises(ValueError):
+        create(length=10, coltypes={'name': {'type': 'name', 'unique': True}}, seed=1,
+               row_offset=0)
+
+def test_create_reuses_coltypes():
+    coltypes = {'int': {'type': 'int', 'null_rate': 0.5}}
+    create(length=10, coltypes=coltypes)
+    test_df = create(length=10, coltypes=coltypes)
+    assert test_df['int'].isnull().sum() == 5
+    assert coltypes == {'int': {'type': 'int', 'null_rate': 0.5}}
+
+def test_coltypes_compile():
+    col_types = ColTypes()
+    col_types.add_coltype('ids', 'uuid')
+    col_types.add_coltype('salaries', 'norm', mean=50000, sd=1000)
+    test_df = col_types.compile(null_rate=0.2).generate(10)
+    assert list(test_df.columns) == ['ids', 'salaries']
+    assert test_df['salaries'].isnull().sum() == 2
+
+def zero_inflated(out, rng, lam=1.0, zero_rate=0.5):
+    """Poisson counts with extra zeros"""
+    out[:] = rng.poisson(lam, len(out))
+    out[rng.random(len(out)) < zero_rate] = 0
+
+def coin(rng, p=0.5):
+    return 'heads' if rng.random() < p else 'tails'
+
+def test_register_type(tmp_path, capsys):
+    register_type('zip', zero_inflated, dtype='int64')
+    register_type('coin', coin, dtype=object, vectorized=False)
+    try:
+        with pytest.raises(ValueError):
+            register_type('zip', zero_inflated)
+        with pytest.raises(ValueError):
+            register_type('norm', zero_inflated)
+        assert 'zip' not in default_coltypes()
+        help_type('zip')
+        assert 'Function: {}.zero_inflated'.format(__name__) in capsys.readouterr().out
+        help_type('norm')
+        assert 'Function: simulacrum.types.norm_data' in capsys.readouterr().out
+        coltypes = {'claims': {'type': 'zip', 'lam': 3, 'zero_rate': 0.8, 'null_rate': 0.1},
+                    'toss': {'type': 'coin', 'p': 0.25}}
+        test_df = create(length=10000, coltypes=coltypes, seed=1)
+        assert test_df['claims'].dtype == 'Int64'
+        assert test_df['claims'].isna().sum() == 1000
+        assert 0.7 < (test_df['claims'] == 0).mean() < 0.9
+        assert test_df['toss'].dtype == object
+        assert 0.2 < (test_df['toss'] == 'heads').mean() < 0.3
+        assert test_df.equals(create(length=10000, coltypes=coltypes, seed=1))
+        mapped = create(length=100, coltypes={'claims': {'type': 'zip'}}, seed=1,
+                        memmap_dir=str(tmp_path))
+        assert np.array_equal(mapped['claims'], np.load(str(tmp_path / 'claims.npy')))
+    finally:
+        unregister_type('zip')
+        unregister_type('coin')
+    assert 'zip' not in TYPE_FUNCTIONS
+    with pytest.raises(ValueError):
+        unregister_type('norm')
+
+def test_register_type_supports_chunks():
+    register_type('ranked', lambda out, rng: out.__setitem__(slice(None), np.arange(len(out))),
+                  dtype='int64', supports_chunks=False)
+    try:
+        coltypes = {'rank': {'type': 'ranked'}}
+        assert list(create(length=5, coltypes=coltypes)['rank']) == [0, 1, 2, 3, 4]
+        assert len(list(create_iter(length=5, coltypes=coltypes, chunk_size=5))) == 1
+        with pytest.raises(ValueError):
+            list(create_iter(length=5, coltypes=coltypes, chunk_size=2))
+        with pytest.raises(ValueError):
+            create(length=5, coltypes=coltypes, workers=2)
+        with pytest.raises(ValueError):
+            create(length=5, coltypes=coltypes, seed=1, row_offset=0)
+    finally:
+        unregister_type('ranked')
+
+def test_create_compact(tmp_path):
+    coltypes = {'small': {'type': 'int', 'min': -10, 'max': 10},
+                'wide': {'type': 'int', 'max': 10**6, 'null_rate': 0.1},
+                'trials': {'type': 'bin', 'n': 1000},
+                'counts': {'type': 'pois', 'lam': 3},
+                'ratio': {'type': 'num'},
+                'score': {'type': 'norm', 'mean': 50, 'sd': 10},
+                'wait': {'type': 'exp'},
+                'exact': {'type': 'norm', 'dtype': 'float64'},
+                'name': {'type': 'name', 'pool_size': 10}}
+    test_df = create(length=1000, coltypes=coltypes, seed=1, compact=True)
+    assert test_df.dtypes.astype(str).to_dict() == {
+        'small': 'int8', 'wide': 'Int32', 'trials': 'int16', 'counts': 'int8',
+        'ratio': 'float32', 'score': 'float32', 'wait': 'float32', 'exact': 'float64',
+        'name': 'category'}
+    assert 40 < test_df['score'].mean() < 60
+    assert test_df['wide'].isna().sum() == 100
+    default = create(length=1000, coltypes=coltypes, seed=1)
+    assert default['small'].dtype == np.int64
+    assert default['ratio'].dtype == np.float64
+    assert test_df.equals(create(length=1000, coltypes=coltypes, seed=1, compact=True))
+    assert plan(coltypes=coltypes, compact=True).dtypes['counts'] == np.int8
+    mapped = create(length=100, coltypes={'small': {'type': 'int', 'max': 10}}, seed=1,
+                    compact=True, memmap_dir=str(tmp_path))
+    assert np.load(str(tmp_path / 'small.npy')).dtype == np.int8
+    assert mapped['small'].dtype == np.int8
+    shard = create(length=10, coltypes=coltypes, seed=1, compact=True, row_offset=5)
+    assert shard.dtypes.equals(test_df.dtypes)
@@ -0,0 +1,127 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from simulacrum.fitting import fit, Sketch
+
+LENGTH = 100000
+
+
+def _sample_frame(seed=0, length=LENGTH):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'score': rng.normal(50, 10, length),
+        'amount': rng.exponential(3, length),
+        'ratio': rng.uniform(2, 5, length),
+        'quantity': rng.poisson(4, length),
+        'price': rng.lognormal(0, 1, length),
+        'segment': rng.choice(['a', 'b', 'c'], length, p=[0.5, 0.3, 0.2]),
+        'created': pd.Timestamp('2024-01-01') + pd.to_timedelta(
+            rng.integers(0, 86400 * 30, length), unit='s')})
+    frame.loc[rng.random(length) < 0.1, 'score'] = np.nan
+    return frame
+
+
+def test_fit():
+    coltypes = fit(_sample_frame()).get_coltypes()
+    assert {name: coltype['type'] for name, coltype in coltypes.items()} == {
+        'score': 'norm', 'amount': 'exp', 'ratio': 'num', 'quantity': 'pois',
+        'price': 'empirical', 'segment': 'categorical', 'created': 'date'}
+    assert coltypes['score']['mean'] == pytest.approx(50, rel=0.01)
+    assert coltypes['score']['sd'] == pytest.approx(10, rel=0.02)
+    assert coltypes['score']['null_rate'] == pytest.approx(0.1, abs=0.01)
+    assert coltypes['amount']['lam'] == pytest.approx(1 / 3, rel=0.02)
+    assert coltypes['quantity']['lam'] == pytest.approx(4, rel=0.01)
+    assert 'null_rate' not in coltypes['amount']
+    weights = dict(zip(coltypes['segment']['elements'], coltypes['segment']['weights']))
+    assert weights['a'] / LENGTH == pytest.approx(0.5, abs=0.01)
+    assert coltypes['created']['begin'] >= pd.Timestamp('2024-01-01')
+    assert coltypes['created']['resolution'] == 's'
+
+
+def test_fit_generate():
+    frame = _sample_frame()
+    generated = fit(frame).compile().generate(LENGTH, seed=1)
+    assert list(generated.columns) == list(frame.columns)
+    for col in ('score', 'amount', 'price', 'quantity'):
+        assert generated[col].quantile(0.5) == pytest.approx(frame[col].quantile(0.5), rel=0.05)
+    assert generated['score'].isnull().mean() == pytest.approx(0.1, abs=0.01)
+    assert generated['created'].min() >= frame['created'].min()
+
+
+def test_fit_chunks_merge():
+    frame = _sample_frame()
+    chunks = [frame.iloc[start:start + 30000] for start in range(0, LENGTH, 30000)]
+    whole = fit(frame).get_coltypes()
+    chunked = fit(iter(chunks)).get_coltypes()
+    merged = functools.reduce(
+        Sketch.merge, [Sketch().update(chunk) for chunk in chunks]).col_types().get_coltypes()
+    for coltypes in (chunked, merged):
+        assert coltypes.keys() == whole.keys()
+        for col in ('score', 'amount', 'quantity'):
+            for key, value in whole[col].items():
+                assert coltypes[col][key] == pytest.approx(value)
+        assert coltypes['segment'] == whole['segment']
+
+
+def test_fit_heavy_hitters():
+    rng = np.random.default_rng(2)
+    names = pd.Series(['name{}'.format(i) for i in rng.zipf(1.5, LENGTH)])
+    coltypes = fit(pd.DataFrame({'name': names}), max_categories=20).get_coltypes()
+    counts = dict(zip(coltypes['name']['elements'], coltypes['name']['weights']))
+    assert len(counts) <= 20
+    true_counts = names.value_counts()
+    assert set(true_counts.index[:5]) <= set(counts)
+    assert counts['name1'] == pytest.approx(true_counts['name1'], rel=0.05)
+
+
+def test_fit_nulls_categorical():
+    rng = np.random.default_rng(3)
+    values = rng.integers(0, 40, 1000).astype(float)
+    values[rng.permutation(1000)[:550]] = np.nan
+    coltypes = fit(pd.DataFrame({'code': values})).get_coltypes()
+    assert coltypes['code']['type'] == 'categorical'
+    assert coltypes['code']['null_rate'] == pytest.approx(0.55)
+
+
+def test_fit_integer_categorical():
+    rng = np.random.default_rng(4)
+    frame = pd.DataFrame({'level': rng.integers(0, 6, 1000), 'flag': rng.integers(0, 2, 1000)})
+    col_types = fit(frame)
+    for name, coltype in col_types.get_coltypes().items():
+        assert coltype['type'] == 'categorical'
+        assert all(isinstance(element, int) for element in coltype['elements'])
+    generated = col_types.compile().generate(100, seed=1)
+    for name in frame:
+        assert generated[name].cat.categories.dtype == np.int64
+
+
+def test_fit_distinct_strings():
+    frame = pd.DataFrame({'id': ['id{}'.format(i) for i in range(5000)]})
+    chunks = [frame.iloc[start:start + 1000] for start in range(0, 5000, 1000)]
+    for col_types in (fit(frame, max_categories=50), fit(iter(chunks), max_categories=50)):
+        coltypes = col_types.get_coltypes()
+        assert coltypes['id']['type'] == 'categorical'
+        assert len(coltypes['id']['elements']) == 50
+        generated = col_types.compile().generate(1000, seed=1)
+        assert generated['id'].isin(frame['id']).all()
+
+
+def test_fit_small_columns():
+    frame = pd.DataFrame({'empty': [None] * 10, 'constant': [1.5] * 10,
+                          'flag': [True, False] * 5, 'day': pd.date_range('2024-01-01', periods=10),
+                          'stamp': pd.date_range('2024-01-01', periods=10, freq='h', tz='UTC')})
+    coltypes = fit(frame).get_coltypes()
+    assert coltypes['empty'] == {'type': 'num', 'null_rate': 1.0}
+    assert coltypes['constant'] == {'type': 'categorical', 'elements': [1.5],
+                                    'weights': [10.0]}
+    assert sorted(coltypes['flag']['elements']) == [False, True]
+    assert coltypes['day']['resolution'] == 'D'
+    assert str(coltypes['stamp']['tzinfo']) == 'UTC'
+    generated = fit(frame).compile().generate(10)
+    assert generated['empty'].isnull().all()
+    assert str(generated['stamp'].dt.tz) == 'UTC'
+    with pytest.raises(ValueError):
+        Sketch().update(pd.DataFrame({'x': [1.0]})).update(pd.DataFrame({'x': ['a']}))
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+# Most time importing simulacrum and generating a numeric column may add to importing numpy and
+# pandas, in microseconds
+IMPORT_BUDGET_US = 100000
+NUMERIC_ONLY = """
+import numpy, pandas
+import simulacrum, simulacrum.dataset
+simulacrum.create(10, coltypes={'x': {'type': 'norm'}, 'n': {'type': 'int'}})
+"""
+
+def import_times(code):
+    """Runs code with -X importtime, returning {module: self time in us} for the modules imported
+    after numpy and pandas"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], check=True,
+                            stderr=subprocess.PIPE, universal_newlines=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, module = line[len('import time:'):].split('|')
+        module = module.strip()
+        if module in ('pandas', 'numpy'):
+            times = {}
+        else:
+            times[module] = int(self_us)
+    return times
+
+def test_import_lazy():
+    modules = subprocess.run(
+        [sys.executable, '-c', 'import sys, simulacrum; print(" ".join(sys.modules))'],
+        check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+    assert 'simulacrum' in modules
+    for module in ('pandas', 'faker', 'asyncio'):
+        assert module not in modules
+
+def test_import_budget():
+    times = import_times(NUMERIC_ONLY)
+    assert 'simulacrum.types' in times
+    for module in ('faker', 'asyncio', 'concurrent.futures.process'):
+        assert module not in times
+    assert sum(times.values()) < IMPORT_BUDGET_US
@@ -0,0 +1,38 @@
+from simulacrum.dataset import create, create_iter
+from simulacrum.profiling import ColumnStats, PROFILE_FIELDS
+
+COLTYPES = {
+    'name': {'type': 'name'},
+    'num': {'type': 'num', 'null_rate': 0.5},
+    'loc': {'type': 'coords', 'layout': 'columns'}}
+
+def test_on_column():
+    records = []
+    create(length=100, coltypes=COLTYPES, on_column=records.append)
+    assert [record['column'] for record in records] == ['name', 'num', 'loc']
+    assert [record['type'] for record in records] == ['name', 'num', 'coords']
+    for record in records:
+        assert set(record) == set(PROFILE_FIELDS)
+        assert record['length'] == 100
+        assert record['wall_seconds'] >= record['type_seconds'] >= 0
+        assert record['null_seconds'] >= 0
+        assert record['bytes'] > 0
+
+def test_column_stats():
+    stats = ColumnStats()
+    list(create_iter(length=250, coltypes=COLTYPES, chunk_size=100, on_column=stats))
+    assert len(stats.records) == 9
+    summary = stats.summary()
+    assert list(summary.index)[0] == 'name'
+    assert (summary['rows'] == 250).all()
+    assert abs(summary['share'].sum() - 1) < 1e-9
+    report = stats.report(top=2)
+    assert len(report.splitlines()) == 3
+    assert 'name' in report.splitlines()[1]
+
+def test_column_stats_workers():
+    stats = ColumnStats()
+    test_df = create(length=100, coltypes=COLTYPES, seed=1, workers=2, on_column=stats)
+    assert len(test_df) == 100
+    assert len(stats.records) == 6
+    assert stats.summary()['rows'].sum() == 300
@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from simulacrum.relational import create_tables, create_tables_iter
+
+TABLES = {
+    'orders': {'coltypes': {
+        'amount': {'type': 'exp', 'lam': 0.01},
+        'customer_id': {'type': 'foreign_key', 'references': 'customers.id',
+                        'count_dist': 'poisson', 'lam': 3},
+        'product_id': {'type': 'foreign_key', 'references': 'products'}}},
+    'customers': {'length': 50, 'coltypes': {
+        'id': {'type': 'uuid', 'output': 'str'},
+        'name': {'type': 'name'}}},
+    'products': {'length': 10, 'coltypes': {'price': {'type': 'num'}}}}
+
+def test_create_tables():
+    tables = create_tables(TABLES, seed=1)
+    assert list(tables) == ['orders', 'customers', 'products']
+    customers, orders = tables['customers'], tables['orders']
+    assert len(customers) == 50
+    assert len(tables['products']) == 10
+    assert list(orders.columns) == ['customer_id', 'product_id', 'amount']
+    assert orders['customer_id'].isin(customers['id']).all()
+    assert orders['product_id'].between(0, 9).all()
+    # Each customer's orders are next to each other, in customer order
+    first_rows = orders.drop_duplicates('customer_id')['customer_id']
+    assert list(first_rows) == [key for key in customers['id'] if key in set(first_rows)]
+    assert orders['customer_id'].nunique() == len(first_rows)
+    for name, table in create_tables(TABLES, seed=1).items():
+        pd.testing.assert_frame_equal(table, tables[name])
+
+def test_create_tables_iter():
+    chunks = list(create_tables_iter(TABLES, chunk_size=7, seed=2))
+    names = [name for name, _ in chunks]
+    assert names.index('orders') > names.index('customers')
+    tables = {name: pd.concat([chunk for table, chunk in chunks if table == name])
+              for name in TABLES}
+    assert all(len(chunk) <= 7 for _, chunk in chunks)
+    assert tables['orders']['customer_id'].isin(tables['customers']['id']).all()
+    customer_rows = dict(zip(tables['customers']['id'], range(50)))
+    assert tables['orders']['customer_id'].map(customer_rows).is_monotonic_increasing
+
+def test_create_tables_counts():
+    tables = {
+        'parents': {'length': 1000, 'coltypes': {}},
+        'children': {'coltypes': {'parent': {'type': 'foreign_key', 'references': 'parents',
+                                             'count_dist': 'zipf', 'skew': 2.0,
+                                             'max_count': 5}}}}
+    children = create_tables(tables, seed=3)['children']
+    counts = children['parent'].value_counts()
+    assert len(counts) == 1000
+    assert counts.max() <= 5
+    assert np.array_equal(children['parent'], np.sort(children['parent']))
+
+def test_create_tables_null_rate():
+    tables = create_tables(TABLES, null_rate=0.2, seed=4)
+    assert tables['customers']['id'].notnull().all()
+    assert tables['customers']['name'].isnull().sum() == 10
+    assert tables['orders']['customer_id'].notnull().all()
+    assert tables['orders']['customer_id'].isin(tables['customers']['id']).all()
+    nulled = dict(TABLES, customers={'length': 50, 'coltypes': {
+        'id': {'type': 'uuid', 'output': 'str', 'null_rate': 0.1}}})
+    with pytest.raises(ValueError):
+        create_tables(nulled)
+
+def test_create_tables_bad():
+    for tables in (
+            {'a': {'coltypes': {}}},
+            {'a': {'length': 1, 'coltypes': {
+                'b': {'type': 'foreign_key', 'references': 'missing'}}}},
+            {'a': {'length': 1, 'coltypes': {
+                'b': {'type': 'foreign_key', 'references': 'a.missing'}}}},
+            {'a': {'coltypes': {'b': {'type': 'foreign_key', 'references': 'b',
+                                      'count_dist': 'poisson'}}},
+             'b': {'coltypes': {'a': {'type': 'foreign_key', 'references': 'a',
+                                      'count_dist': 'poisson'}}}},
+            {'a': {'length': 1, 'coltypes': {}},
+             'b': {'length': 1, 'coltypes': {'a': {'type': 'foreign_key', 'references': 'a',
+                                                   'count_dist': 'normal'}}}}):
+        with pytest.raises(ValueError):
+            create_tables(tables)
@@ -0,0 +1,117 @@
+import asyncio
+import io
+import json
+
+import pytest
+import pandas as pd
+
+from simulacrum.streaming import stream
+
+COLTYPES = {
+    'id': {'type': 'uuid'},
+    'x': {'type': 'norm'},
+    'when': {'type': 'date', 'begin': '2020-01-01', 'end': '2020-12-31'}}
+
+def collect(test_stream):
+    async def run():
+        return [batch async for batch in test_stream]
+    return asyncio.run(run())
+
+def test_stream():
+    batches = collect(stream(250, coltypes=COLTYPES, batch_size=100, seed=1))
+    assert [len(batch) for batch in batches] == [100, 100, 50]
+    assert list(batches[0].columns) == ['id', 'x', 'when']
+    pd.testing.assert_frame_equal(
+        pd.concat(batches), pd.concat(collect(stream(250, coltypes=COLTYPES, batch_size=100,
+                                                     seed=1))))
+
+def test_stream_rate():
+    test_stream = stream(1000, coltypes={'x': {'type': 'num'}}, rows_per_sec=10000,
+                         batch_size=100)
+    metrics = asyncio.run(test_stream.run())
+    assert metrics['rows'] == 1000
+    assert metrics['batches'] == 10
+    # The last batch is due 0.09 seconds after the first
+    assert metrics['seconds'] >= 0.09
+    assert metrics['rows_per_sec'] < 12000
+    assert 0 <= metrics['lag_mean'] <= metrics['lag_max']
+
+def test_stream_unbounded():
+    async def run():
+        test_stream = stream(coltypes={'x': {'type': 'num'}}, batch_size=10, prefetch=2)
+        count = 0
+        async for _ in test_stream:
+            count += 1
+            if count == 5:
+                break
+        await test_stream.aclose()
+        return test_stream.metrics()
+    assert asyncio.run(run())['rows'] == 50
+
+def test_stream_context(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+
+    async def run():
+        async with stream(coltypes={'x': {'type': 'num'}}, batch_size=10, prefetch=2,
+                          sink=path) as test_stream:
+            async for _ in test_stream:
+                break
+        return test_stream
+    test_stream = asyncio.run(run())
+    test_stream._thread.join(timeout=5)
+    assert not test_stream._thread.is_alive()
+    assert test_stream._writer.closed
+    with open(path) as lines:
+        assert len(lines.readlines()) == 10
+
+def test_stream_write_error(tmp_path):
+    async def run():
+        test_stream = stream(coltypes={'x': {'type': 'num'}}, batch_size=10, prefetch=2,
+                             sink=str(tmp_path / 'out.jsonl'))
+        await test_stream.__anext__()
+        # Writing the next batch fails
+        test_stream._writer.close()
+        with pytest.raises(ValueError):
+            await test_stream.__anext__()
+        return test_stream
+    test_stream = asyncio.run(run())
+    test_stream._thread.join(timeout=5)
+    assert not test_stream._thread.is_alive()
+
+def test_stream_file_sink(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+    asyncio.run(stream(30, coltypes=COLTYPES, batch_size=7, sink=path).run())
+    with open(path) as lines:
+        records = [json.loads(line) for line in lines]
+    assert len(records) == 30
+    assert set(records[0]) == {'id', 'x', 'when'}
+    path = str(tmp_path / 'out.csv')
+    asyncio.run(stream(30, coltypes=COLTYPES, batch_size=7, sink=path, format='csv').run())
+    assert len(pd.read_csv(path)) == 30
+
+def test_stream_socket_sink():
+    received = io.BytesIO()
+
+    async def handle(reader, writer):
+        received.write(await reader.read())
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        await stream(20, coltypes={'x': {'type': 'int'}}, batch_size=5,
+                     sink=('127.0.0.1', port)).run()
+        await asyncio.sleep(0.1)
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+    assert len(received.getvalue().splitlines()) == 20
+
+def test_stream_bad():
+    with pytest.raises(ValueError):
+        stream(10, coltypes=COLTYPES, format='xml')
+    with pytest.raises(ValueError):
+        stream(10, coltypes=COLTYPES, rows_per_sec=0)
+    with pytest.raises(ValueError):
+        collect(stream(10, coltypes={'x': {'type': 'date', 'begin': 'bad', 'end': 'bad'}}))
@@ -1,6 +1,6 @@
 import datetime
 import pytest
-from uuid import UUID
+from uuid import UUID, RFC_4122
 from functools import reduce
 import numpy as np
 import pandas as pd
@@ -12,12 +12,238 @@ def _default_test(listToCheck, typeToWait, length):
     return len(listToCheck) == length\
         and reduce(lambda p, n: p and type(n) == typeToWait, listToCheck, True)
 
+def test_get_rng():
+    rng = np.random.default_rng(1)
+    assert types.get_rng(rng) is rng
+    assert types.get_rng(5).integers(1000) == types.get_rng(5).integers(1000)
+    # Unseeded generators don't depend on the global numpy random state
+    np.random.seed(10)
+    first = types.uuid_data(10)
+    np.random.seed(10)
+    assert not set(first) & set(types.uuid_data(10))
+
+def test_categorical_data_weights():
+    weights = np.arange(1, 201, dtype=float) ** -1.1
+    results = types.categorical_data(200000, elements=np.arange(200), weights=weights, rng=1)
+    assert list(results.cat.categories) == list(range(200))
+    expected = weights / weights.sum()
+    observed = results.value_counts(normalize=True, sort=False).sort_index().values
+    assert np.abs(observed - expected).max() < 0.005
+    assert (results.cat.codes == types.categorical_data(
+        200000, elements=np.arange(200), weights=weights, rng=1).cat.codes).all()
+    results = types.categorical_data(1000, elements=['a', 'b', 'a'], weights=[0.2, 0, 0.2])
+    assert list(results.cat.categories) == ['a', 'b']
+    assert (results == 'a').all()
+    for weights in ([1, 2], [-1, 1, 1], [0, 0, 0]):
+        with pytest.raises(ValueError):
+            types.categorical_data(10, elements=[1, 2, 3], weights=weights)
+
+def test_categorical_data_null_elements():
+    results = types.categorical_data(1000, elements=['a', None, 'b'], rng=1)
+    assert list(results.cat.categories) == ['a', 'b']
+    assert 0 < results.isnull().sum() < 1000
+    results = types.categorical_data(1000, elements=['a', None, 'b'], weights=[0, 1, 1], rng=1)
+    assert list(results.cat.categories) == ['a', 'b']
+    assert set(results.dropna()) == {'b'}
+    assert 0 < results.isnull().sum() < 1000
+    results = types.categorical_data(100, elements=[1, np.nan], weights=[0, 1])
+    assert results.isnull().all()
+
+def test_alias_table():
+    weights = np.random.default_rng(0).random(1000) ** 4
+    prob, alias = types._alias_table(weights)
+    assert ((0 <= prob) & (prob <= 1)).all()
+    sampled = prob / 1000 + np.bincount(alias, weights=(1 - prob) / 1000, minlength=1000)
+    assert np.allclose(sampled, weights / weights.sum())
+
+def test_categorical_sampler_cache():
+    for i in range(types.CATEGORICAL_CACHE_SIZE + 5):
+        types.categorical_data(10, elements=[i, i + 1], weights=[0.5, 0.5])
+    assert len(types._CATEGORICAL_SAMPLERS) == types.CATEGORICAL_CACHE_SIZE
+
+def test_timeseries_data():
+    results = types.timeseries_data(1000, begin='2024-01-03 10:30', mean_gap='1h', rng=1)
+    assert results.dtype == np.dtype('datetime64[ns]')
+    assert results.is_monotonic_increasing
+    assert results.iloc[0] >= pd.Timestamp('2024-01-03 10:30')
+    assert pd.Timedelta('45min') < results.diff().mean() < pd.Timedelta('75min')
+    daily = [0] * 9 + [1] * 8 + [0] * 7
+    results = types.timeseries_data(10000, begin='2024-01-01', daily=daily,
+                                    weekly=[1, 1, 1, 1, 1, 0, 0], rng=1)
+    assert results.is_monotonic_increasing
+    assert results.dt.hour.between(9, 16).all()
+    assert (results.dt.dayofweek < 5).all()
+    first = types.timeseries_data(100, begin='2024-01-01', rng=1)
+    second = types.timeseries_data(100, begin='2024-01-01', row_offset=100, rng=2)
+    assert first.iloc[-1] <= second.iloc[0]
+    with pytest.raises(ValueError):
+        types.timeseries_data(10, daily=[1, 2, 3])
+    with pytest.raises(ValueError):
+        types.timeseries_data(10, mean_gap='-1s')
+
+def test_timeseries_data_entities():
+    results = types.timeseries_data(1000, begin='2024-01-01', entities=3,
+                                    entity_weights=[0.5, 0.5, 0], rng=1)
+    assert list(results.columns) == ['time', 'entity']
+    assert results['time'].is_monotonic_increasing
+    assert set(results['entity']) == {0, 1}
+    results = types.timeseries_data(10, begin='2024-01-01', entities=['a', 'b'], rng=1)
+    assert list(results['entity'].cat.categories) == ['a', 'b']
+
+def test_expr_data():
+    columns = {
+        'a': pd.Series([1, None, 3], dtype='Int64'),
+        'b': pd.Series([0.5, 1.0, 2.0]),
+        'c': pd.Series(pd.Categorical(['x', 'y', 'x']))}
+    results = types.expr_data(3, 'a * b + 1', columns=columns)
+    assert np.allclose(results, [1.5, np.nan, 7.0], equal_nan=True)
+    assert types.expr_data(3, 'c == "x"', columns=columns).tolist() == [True, False, True]
+    assert types.expr_data(3, '2 + 1').tolist() == [3, 3, 3]
+    results = types.expr_data(3, 'b', columns=columns)
+    results[0] = 100
+    assert columns['b'][0] == 0.5
+
+@pytest.mark.parametrize('function',
+    [types.num_data,
+    types.num_int,
+    types.coords_data,
+    types.name_data,
+    types.text_data,
+    types.uuid_data,
+    types.categorical_data
+    ])
+def test_seeded_data(function):
+    pd.testing.assert_series_equal(function(20, rng=3), function(20, rng=3))
+
+@pytest.mark.parametrize('function, dtype',
+    [(types.num_data, float),
+    (types.num_int, int),
+    (types.norm_data, float),
+    (types.exp_data, float),
+    (types.binom_data, int),
+    (types.poisson_data, int)
+    ])
+def test_numeric_out(function, dtype, monkeypatch):
+    monkeypatch.setattr(types, 'FILL_BLOCK_SIZE', 7)
+    out = np.zeros(100, dtype=dtype)
+    results = function(100, rng=1, out=out)
+    assert results.values is out
+    pd.testing.assert_series_equal(results, function(100, rng=1), check_dtype=False)
+
 def test_uuid_data():
     """Test uuid data."""
     uuids_list = types.uuid_data(30)
     assert _default_test(uuids_list, UUID, 30)\
         and len(set(uuids_list)) == len(uuids_list)
 
+def _unseeded_uuids(_):
+    return list(types.uuid_data(10, output='str'))
+
+def test_uuid_data_forked():
+    multiprocessing = pytest.importorskip('multiprocessing')
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        pytest.skip('needs fork')
+    with multiprocessing.get_context('fork').Pool(2) as pool:
+        first, second = pool.map(_unseeded_uuids, range(2), chunksize=1)
+    assert not set(first) & set(second)
+
+def test_uuid_data_outputs():
+    uuids_list = types.uuid_data(300, rng=2)
+    uuid_strings = types.uuid_data(300, output='str', rng=2)
+    assert _default_test(uuid_strings, str, 300)
+    assert list(uuid_strings) == [str(item) for item in uuids_list]
+    for item in uuids_list:
+        assert item.version == 4
+        assert item.variant == RFC_4122
+    with pytest.raises(ValueError):
+        types.uuid_data(10, output='int')
+
+def test_uuid_data_bytes():
+    pytest.importorskip('pyarrow')
+    uuid_bytes = types.uuid_data(300, output='bytes', rng=2)
+    assert len(uuid_bytes) == 300
+    assert [UUID(bytes=item) for item in uuid_bytes] == list(types.uuid_data(300, rng=2))
+    results = types.null_mask(100, types.uuid_data, 0.25, output='bytes')
+    assert sum(results.isnull()) == 25
+
+def test_arrow_string_chunks(monkeypatch):
+    pytest.importorskip('pyarrow')
+    expected = list(types.uuid_data(100, output='str', rng=3))
+    # Columns with more string data than an arrow array's int32 offsets can address are split
+    monkeypatch.setattr(types, 'MAX_ARROW_CHUNK_BYTES', 36 * 7 + 5)
+    uuids = types.uuid_data(100, output='str', string_backend='pyarrow', rng=3)
+    assert uuids.array._data.num_chunks == 15
+    assert list(uuids) == expected
+    text = types.text_data(500, engine='numpy', string_backend='pyarrow', rng=1)
+    assert list(text) == list(types.text_data(500, engine='numpy', rng=1))
+    assert text.array._data.num_chunks > 1
+
+def test_string_backend_pyarrow():
+    pytest.importorskip('pyarrow')
+    uuids = types.uuid_data(300, output='str', string_backend='pyarrow', rng=2)
+    assert uuids.dtype == pd.StringDtype('pyarrow')
+    assert list(uuids) == list(types.uuid_data(300, output='str', rng=2))
+    text = types.text_data(1000, engine='numpy', string_backend='pyarrow', rng=1)
+    assert text.dtype == pd.StringDtype('pyarrow')
+    assert list(text) == list(types.text_data(1000, engine='numpy', rng=1))
+    names = types.name_data(10, string_backend='pyarrow', rng=1)
+    assert names.dtype == pd.StringDtype('pyarrow')
+    assert list(names) == list(types.name_data(10, rng=1))
+    for string_backend in types.STRING_BACKENDS:
+        numbers = types.faker_data(10, provider='pyint', string_backend=string_backend)
+        assert numbers.dtype == np.int64
+        times = types.faker_data(10, provider='date_time', string_backend=string_backend)
+        assert times.dtype == np.dtype('datetime64[ns]')
+    results = types.null_mask(100, types.address_data, 0.25, string_backend='pyarrow')
+    assert results.dtype == pd.StringDtype('pyarrow')
+    assert sum(results.isnull()) == 25
+    with pytest.raises(ValueError):
+        types.uuid_data(10, output='str', string_backend='arrow')
+
+def test_empirical_data():
+    values = types.empirical_data(10000, [0, 1, 10], [0, 0.5, 1], rng=1)
+    assert len(values) == 10000
+    assert values.min() >= 0 and values.max() <= 10
+    assert (values < 1).mean() == pytest.approx(0.5, abs=0.02)
+    integers = types.empirical_data(100, [0, 10], integer=True)
+    assert integers.dtype == np.dtype('int64')
+    with pytest.raises(ValueError):
+        types.empirical_data(10, [2, 1])
+    with pytest.raises(ValueError):
+        types.empirical_data(10, [1, 2], [0.5, 1])
+
+def test_num_int_unique():
+    ints = types.num_int(1000, min=5, max=1004, unique=True, rng=1)
+    assert sorted(ints) == list(range(5, 1005))
+    first = types.num_int(500, 0, 10**12, unique=True, key=3)
+    second = types.num_int(500, 0, 10**12, unique=True, key=3, row_offset=500)
+    assert not set(first) & set(second)
+    pd.testing.assert_series_equal(first, types.num_int(500, 0, 10**12, unique=True, key=3))
+    wide = types.num_int(10000, -2**63, 2**63 - 1, unique=True, rng=1)
+    assert wide.is_unique and wide.dtype == np.dtype('int64')
+    out = np.empty(1000, dtype=np.int64)
+    types.num_int(1000, 0, 999, unique=True, key=1, out=out)
+    assert sorted(out) == list(range(1000))
+    with pytest.raises(ValueError):
+        types.num_int(11, 0, 9, unique=True)
+
+def test_permute_rows():
+    for size in (1, 2, 3, 10, 1000, 2**16 + 5):
+        values = types.permute_rows(np.arange(size, dtype=np.uint64), size, 7)
+        assert sorted(values.tolist()) == list(range(size))
+
+def test_faker_unique():
+    names = types.name_data(1000, unique=True, rng=1)
+    assert names.is_unique
+    seen = set(names)
+    more = types.name_data(1000, unique=True, seen=seen, rng=2)
+    assert not set(more) & set(names)
+    assert len(seen) == 2000
+    with pytest.raises(ValueError):
+        types.faker_data(10, provider='random_element', elements=('a', 'b', 'c'), unique=True)
+    with pytest.raises(ValueError):
+        types.name_data(10, pool_size=5, unique=True)
+
 def test_faker_data_ipv6():
     """Test faker data."""
     ipv6_list = types.faker_data(**{
@@ -52,6 +278,49 @@ def test_text_data():
     with pytest.raises(TypeError):
         text = types.text_data(10, bad_param=100)
 
+def test_get_faker():
+    assert types.get_faker() is types.get_faker()
+    assert types.get_faker() is types.FAKE
+    assert types.get_faker(1) is not types.get_faker()
+    assert types.get_faker(1).name() == types.get_faker(1).name()
+    french = types.get_faker(locale='fr_FR')
+    assert french is types.get_faker(locale='fr_FR')
+    assert french is not types.get_faker()
+    assert len(types.name_data(5, locale='fr_FR', rng=1)) == 5
+
+def test_get_faker_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    expected = [list(types.name_data(200, rng=seed)) for seed in range(8)]
+    # Seeded columns generated at the same time in different threads don't share a Faker
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda seed: list(types.name_data(200, rng=seed)), range(8)))
+    assert results == expected
+
+def test_text_data_numpy():
+    text = types.text_data(1000, engine='numpy', rng=1)
+    assert len(text) == 1000
+    assert text.dtype == np.dtype('O')
+    lengths = text.str.len()
+    assert lengths.max() <= 200
+    assert lengths.mean() > 150
+    assert text.str.match(r'^[A-Z][a-zA-Z .]*\.$').all()
+    pd.testing.assert_series_equal(text, types.text_data(1000, engine='numpy', rng=1))
+    assert types.text_data(100, 10, engine='numpy').str.len().max() <= 10
+    text = types.text_data(10, 30, engine='numpy', words=['héllo', 'wörld'])
+    assert set(' '.join(text).lower().replace('.', '').split()) == {'héllo', 'wörld'}
+    text = types.text_data(3, 6, engine='numpy', words=['héllo'])
+    assert list(text) == ['Héllo.'] * 3
+    for backend in ('python', 'pyarrow'):
+        text = types.text_data(1000, 12, engine='numpy', words=['привет', 'мир', 'да'],
+                               string_backend=backend, rng=1)
+        lengths = text.str.len()
+        assert lengths.max() <= 12 and lengths.min() > 0
+    assert len(types.text_data(0, engine='numpy')) == 0
+    with pytest.raises(ValueError):
+        types.text_data(10, engine='bad')
+    with pytest.raises(ValueError):
+        types.text_data(10, 3, engine='numpy', words=['long'])
+
 def test_address_data():
     addresses = types.address_data(10)
     assert len(addresses) == 10
@@ -77,6 +346,41 @@ def test_num_int():
     assert nums.min() >= 0
     assert nums.dtype == np.dtype('int')
 
+def test_numeric_dtype():
+    for function, params in ((types.num_data, {'min': -5, 'max': 5}), (types.norm_data, {}),
+                             (types.exp_data, {})):
+        nums = function(1000, dtype='float32', rng=1, **params)
+        assert nums.dtype == np.float32
+        assert nums.std() > 0.5
+        with pytest.raises(ValueError):
+            function(10, dtype='float16', **params)
+    nums = types.num_data(1000, min=-5, max=5, dtype='float32', rng=1)
+    assert -5 <= nums.min() and nums.max() <= 5
+    out = np.zeros(1000, dtype=np.float32)
+    assert types.norm_data(1000, rng=1, out=out).to_numpy() is out
+    nums = types.num_int(1000, min=-100, max=100, dtype='int8', rng=1)
+    assert nums.dtype == np.int8
+    assert -100 <= nums.min() and nums.max() <= 100
+    # The other integer types draw int64 values a block at a time, and cast them
+    for function, params, dtype in ((types.num_int, {'max': 1000, 'unique': True}, 'int16'),
+                                    (types.binom_data, {'n': 200}, 'uint8'),
+                                    (types.poisson_data, {'lam': 1000}, 'int16')):
+        nums = function(1000, dtype=dtype, rng=1, **params)
+        assert nums.dtype == dtype
+        assert nums.to_numpy().astype(np.int64).tolist() == function(
+            1000, dtype='int64', rng=1, **params).tolist()
+    for function, params in ((types.num_int, {'max': 1000}), (types.binom_data, {'n': 200}),
+                             (types.poisson_data, {'lam': 1000})):
+        with pytest.raises(ValueError):
+            function(1000, dtype='int8', **params)
+    with pytest.raises(ValueError):
+        types.num_int(10, dtype='float32')
+    assert types.int_dtype(0, 127) == np.int8
+    assert types.int_dtype(-129, 0) == np.int16
+    assert types.int_dtype(0, 2**40) == np.int64
+    assert types.poisson_max(1) > 30
+    assert types.poisson_max(10**6) < 2 * 10**6
+
 def test_norm_data():
     nums = types.norm_data(1000, mean=0, sd=100)
     assert len(nums) == 1000
@@ -135,6 +439,28 @@ def test_date_data_between_text():
     assert dates.max() < datetime.datetime(2017, 6, 1)
     assert dates.dtype == np.dtype('<M8[ns]')
 
+def test_date_data_resolution():
+    dates = types.date_data(
+        length=1000, begin='2017-01-01', end='2017-05-31', resolution='D')
+    assert (dates == dates.dt.normalize()).all()
+    assert dates.min() >= datetime.datetime(2017, 1, 1)
+    assert dates.max() < datetime.datetime(2017, 5, 31)
+    dates = types.date_data(
+        length=1000, begin='2017-01-01', end='2017-01-02', resolution='ms')
+    assert (dates.dt.microsecond % 1000 == 0).all()
+    assert len(dates.unique()) > 1
+    assert dates.dtype == np.dtype('<M8[ns]')
+    with pytest.raises(ValueError):
+        types.date_data(length=10, resolution='fortnight')
+
+def test_date_data_tzinfo():
+    tz = datetime.timezone(datetime.timedelta(hours=-5))
+    dates = types.date_data(
+        length=1000, begin='2017-01-01', end='2017-05-31', tzinfo=tz)
+    assert isinstance(dates.dtype, pd.DatetimeTZDtype)
+    assert dates.min() >= pd.Timestamp('2017-01-01', tz=tz)
+    assert dates.max() < pd.Timestamp('2017-05-31', tz=tz)
+
 def test_date_data_bad_calls():
     with pytest.raises(ValueError):
         dates = types.date_data(length=10, begin='217-01-01', end='217-05-31')
@@ -146,6 +472,8 @@ def test_date_data_bad_calls():
         dates = types.date_data(length=1000, end='2017-01-01')
     with pytest.raises(ValueError):
         dates = types.date_data(length=1000, end=datetime.date(2000, 1, 1))
+    with pytest.raises(ValueError):
+        dates = types.date_data(length=10, begin='2017-05-31', end='2017-01-01')
 
 
 def test_coords_data():
@@ -163,6 +491,43 @@ def test_coords_data():
     with pytest.raises(ValueError):
         coords = types.coords_data(10, lon_max=181)
 
+def test_coords_data_columns():
+    coords = types.coords_data(1000, lat_min=10, lat_max=20, lon_min=100, lon_max=150,
+                               layout='columns')
+    assert list(coords.columns) == ['lat', 'lon']
+    assert (coords.dtypes == np.dtype('float')).all()
+    assert coords['lat'].between(10, 20).all()
+    assert coords['lon'].between(100, 150).all()
+    assert coords['lon'].max() > 20
+    with pytest.raises(ValueError):
+        types.coords_data(10, layout='struct')
+
+def test_coords_data_sphere():
+    coords = types.coords_data(10000, method='sphere', layout='columns', rng=1)
+    assert coords['lat'].between(-90, 90).all()
+    assert (coords['lat'].abs() > 60).mean() < 0.2
+    with pytest.raises(ValueError):
+        types.coords_data(10, method='gaussian')
+
+def test_coords_data_polygon():
+    triangle = [(0, 0), (10, 0), (0, 10)]
+    coords = types.coords_data(1000, polygon=triangle, layout='columns', rng=1)
+    assert len(coords) == 1000
+    assert (coords['lat'] >= 0).all() and (coords['lon'] >= 0).all()
+    assert (coords['lat'] + coords['lon'] <= 10).all()
+    coords = types.coords_data(10, polygon=triangle)
+    for item in coords:
+        assert isinstance(item, tuple)
+    coords = types.coords_data(0, polygon=triangle, layout='columns')
+    assert len(coords) == 0
+    assert (coords.dtypes == np.float64).all()
+    assert len(types.coords_data(0, polygon=triangle)) == 0
+    assert len(dataset.create(0, coltypes={'c': {'type': 'coords', 'polygon': triangle}})) == 0
+    with pytest.raises(ValueError):
+        types.coords_data(10, polygon=[(0, 0), (0, 10), (0, 20)])
+    with pytest.raises(ValueError):
+        types.coords_data(10, lat_min=50, polygon=triangle)
+
 def test_faker_bad_form():
     """Test faker data."""
     with pytest.raises(KeyError):
@@ -183,18 +548,55 @@ def test_categorical_data():
 
 @pytest.mark.parametrize('function',
     [types.num_data,
-    types.num_int,
     types.norm_data,
-    types.exp_data,
+    types.exp_data
+    ])
+def test_null_mask_numeric(function):
+    results = types.null_mask(100, function, 0.25)
+    assert sum(results.isnull()) == 25
+    assert results.dtype == np.dtype('float')
+    results = types.null_mask(100, function, 0)
+    assert sum(results.isnull()) == 0
+
+@pytest.mark.parametrize('function',
+    [types.num_int,
     types.binom_data,
     types.poisson_data
     ])
-def test_null_mask_numeric(function):
+def test_null_mask_integer(function):
     results = types.null_mask(100, function, 0.25)
     assert sum(results.isnull()) == 25
-    assert results.dtype == np.dtype('float') #They will be floated
+    assert results.dtype == pd.Int64Dtype() #They stay integers
     results = types.null_mask(100, function, 0)
     assert sum(results.isnull()) == 0
+    assert results.dtype == np.dtype('int')
+
+def test_null_mask_bernoulli():
+    results = types.null_mask(10000, types.num_data, 0.25, null_method='bernoulli', rng=1)
+    assert 2000 < sum(results.isnull()) < 3000
+    results = types.null_mask(100, types.num_data, 0, null_method='bernoulli')
+    assert sum(results.isnull()) == 0
+    with pytest.raises(ValueError):
+        types.null_mask(100, types.num_data, 0.25, null_method='some')
+
+def test_apply_null_mask_in_place():
+    mask = np.zeros(10, dtype=bool)
+    mask[[1, 5]] = True
+    values = np.arange(10, dtype=float)
+    results = types.apply_null_mask(pd.Series(values, copy=False), mask)
+    assert np.isnan(values[[1, 5]]).all()
+    assert results.values is values
+    ints = np.arange(10)
+    results = types.apply_null_mask(pd.Series(ints, copy=False), mask)
+    assert results.dtype == pd.Int64Dtype()
+    assert np.shares_memory(results.array._data, ints)
+    results = types.apply_null_mask(pd.Series(ints % 2 == 0), mask)
+    assert results.dtype == pd.BooleanDtype()
+    assert list(results.isnull()) == list(mask)
+    for dtype in ('string', 'Float64', 'Int64', 'boolean'):
+        results = types.apply_null_mask(pd.Series(ints % 2 == 0).astype(dtype), mask)
+        assert results.dtype == pd.Series([], dtype=dtype).dtype
+        assert list(results.isnull()) == list(mask)
 
 @pytest.mark.parametrize('function',
     [types.text_data,
@@ -217,6 +619,39 @@ def test_null_mask_date():
     results = types.null_mask(100, types.date_data, 0)
     assert sum(results.isnull()) == 0
 
+@pytest.mark.parametrize('function', [types.name_data, types.address_data])
+def test_pooled_faker_data(function):
+    results = function(1000, pool_size=10)
+    assert len(results) == 1000
+    assert isinstance(results.dtype, pd.core.dtypes.dtypes.CategoricalDtype)
+    assert len(results.cat.categories) <= 10
+    assert results.isnull().sum() == 0
+
+def test_pooled_faker_provider():
+    results = types.faker_data(500, provider='random_element', elements=('a', 'b', 'c'),
+                               pool_size=50)
+    assert len(results) == 500
+    assert set(results.cat.categories) <= set(['a', 'b', 'c'])
+    with pytest.raises(TypeError):
+        types.faker_data(10, provider='pydict', pool_size=5)
+
+def test_pool_elements_zipf():
+    pool = types.pool_elements(types.num_data, 100, pool_dist='zipf', pool_skew=2)
+    assert len(pool['elements']) == 100
+    assert np.isclose(pool['weights'].sum(), 1)
+    assert (np.diff(pool['weights']) < 0).all()
+    assert types.pool_elements(types.num_data, 5)['weights'] is None
+    with pytest.raises(ValueError):
+        types.pool_elements(types.num_data, 5, pool_dist='normal')
+    results = types.name_data(10000, pool_size=100, pool_dist='zipf')
+    counts = results.value_counts()
+    assert counts.iloc[0] > 5 * counts.iloc[-1]
+
+def test_null_mask_pooled():
+    results = types.null_mask(100, types.name_data, 0.25, pool_size=10)
+    assert sum(results.isnull()) == 25
+    assert isinstance(results.dtype, pd.core.dtypes.dtypes.CategoricalDtype)
+
 def test_null_mask_categorical():
     results = types.null_mask(100, types.categorical_data, 0.25, elements=[1,2,3])
     assert sum(results.isnull()) == 25
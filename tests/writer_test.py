@@ -0,0 +1,35 @@
+import pytest
+import pandas as pd
+
+from simulacrum.dataset import default_coltypes
+from simulacrum.writer import write
+
+def test_write_csv(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    stats = write(path, length=250, coltypes={'int': {'type': 'int'}, 'name': {'type': 'name'}},
+                  format='csv', row_group_size=100)
+    assert stats['rows'] == 250
+    assert stats['bytes'] > 0
+    assert stats['rows_per_sec'] > 0
+    test_df = pd.read_csv(path)
+    assert len(test_df) == 250
+    assert list(test_df.columns) == ['int', 'name']
+
+def test_write_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = str(tmp_path / 'data.parquet')
+    coltypes = default_coltypes()
+    coltypes['categorical']['elements'] = ['a', 'b', 'c']
+    stats = write(path, length=250, coltypes=coltypes, null_rate=0.1, row_group_size=100)
+    assert stats['rows'] == 250
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_rows == 250
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert set(table.column_names) == set(coltypes)
+    assert str(table.schema.field('categorical').type).startswith('dictionary')
+    assert table.column('uuid').null_count == 25
+
+def test_write_bad_format(tmp_path):
+    with pytest.raises(ValueError):
+        write(str(tmp_path / 'data.json'), format='json')